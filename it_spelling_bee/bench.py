@@ -0,0 +1,441 @@
+"""Benchmark suite over seeded synthetic lexicons.
+
+Lexicons of Italian-like words (weighted CV syllables, Zipf-distributed
+frequencies) are generated offline from a seed, so timings at 10k to 5M
+words are reproducible without wordfreq or a Hunspell dictionary. They are
+written once per size and seed under --work-dir and reused.
+
+Benchmarks (each reported per lexicon size, as "name@size"):
+
+    load_jsonl          open a JSONL lexicon (parse and index)         s
+    load_sqlite         open a SQLite lexicon and read every row       s
+    iter_by_required    exhaust iter_by_required for five letters,
+                        on a fresh SQLite lexicon                      s
+    generate_loose      generate_board with the default Settings       s/board
+    generate_tight      generate_board with narrow Settings ranges     s/board
+    score_word          score_word over the lexicon                    calls/s
+    engine_guess        Engine.guess, valid and invalid words          guesses/s
+    build               lexicon/build.py build() into SQLite + .bin    s
+    startup             `itbee` to its first prompt, warm caches       s
+
+`build` needs wordfreq's `top_n_list` and `zipf_frequency`; while it runs
+they are answered from the synthetic word list, so it measures the build
+pipeline rather than wordfreq.
+
+`startup` runs the CLI in a subprocess whose home directory (under
+--work-dir) holds the SQLite lexicon as the user lexicon. One untimed run
+warms the lexicon snapshot and board cache; the timed runs exit at the
+first prompt, as stdin is empty. It is over budget above
+`STARTUP_BUDGET` seconds.
+
+Results are written as JSON:
+
+    {"version", "created", "python", "machine", "seed", "sizes",
+     "metrics": {"name@size": {"value", "unit", "better": "lower" | "higher"}}}
+
+With --compare BASELINE, metrics present in both runs are compared and the
+exit status is 1 if any got worse by more than --threshold (a fraction).
+
+--memory-report adds, per size, the retained bytes of each lexicon and
+board structure (see `memory.py`) as "memory.<structure>@size" metrics,
+and exits 1 if any, or `startup`, is over its budget in
+`memory.MEMORY_BUDGETS`. It runs
+after the timings, which tracemalloc would slow down; `--only ""` runs it
+alone.
+
+Usage:
+    python -m it_spelling_bee.bench --sizes 10k,100k --out bench.json
+    python -m it_spelling_bee.bench --sizes 10k,100k --compare bench.json --threshold 0.25
+    python -m it_spelling_bee.bench --results new.json --compare bench.json
+    python -m it_spelling_bee.bench --sizes 100k,1M --only "" --memory-report
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import Settings
+from .engine import Engine
+from .generator import generate_board
+from .letters import mask_of
+from .lexicon import build as build_module
+from .lexicon.binary import write_binary
+from .lexicon.store import Lexicon
+from .memory import check_budgets, format_report, memory_report
+from .scoring import score_word
+from .typing import WordEntry
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = "10k,100k"
+DEFAULT_THRESHOLD = 0.25
+
+# Onsets and vowels with rough Italian weights; doubled consonants between syllables
+ONSETS = {
+    "": 6, "b": 2, "c": 5, "d": 4, "f": 2, "g": 2, "l": 5, "m": 4, "n": 5, "p": 3, "r": 6, "s": 6, "t": 7,
+    "v": 2, "z": 1, "br": 1, "cr": 1, "tr": 2, "pr": 1, "st": 2, "sc": 1, "gl": 1, "gn": 1, "ch": 1, "qu": 1,
+}
+VOWELS = {"a": 12, "e": 12, "i": 11, "o": 10, "u": 3}
+DOUBLES = frozenset("tlsnrcpzm")
+SYLLABLE_COUNTS = {2: 3, 3: 5, 4: 3, 5: 1}
+
+TIGHT = dict(min_valid_words=40, max_valid_words=60, min_total_points=200, max_total_points=300)
+LETTERS = "aeiorstnlc"
+
+# Warm time-to-first-prompt of the CLI, in seconds
+STARTUP_BUDGET = 0.100
+
+
+def parse_size(text: str) -> int:
+    """'10k' -> 10000, '5M' -> 5000000."""
+    text = text.strip().lower()
+    scale = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def format_size(n: int) -> str:
+    if n % 1000000 == 0:
+        return f"{n // 1000000}M"
+    if n % 1000 == 0:
+        return f"{n // 1000}k"
+    return str(n)
+
+
+def synthetic_words(n: int, seed: int = 0) -> List[Tuple[str, float]]:
+    """`n` distinct Italian-like words with zipf values, most frequent first.
+
+    The same `n` and `seed` always give the same list, and a smaller `n`
+    gives a prefix of a larger one's words.
+    """
+    rng = random.Random(seed)
+    syllables = [onset + vowel for onset in ONSETS for vowel in VOWELS]
+    syllable_weights = [ONSETS[s[:-1]] * VOWELS[s[-1]] for s in syllables]
+    counts, count_weights = list(SYLLABLE_COUNTS), list(SYLLABLE_COUNTS.values())
+    seen = set()
+    out: List[Tuple[str, float]] = []
+    while len(out) < n:
+        parts = rng.choices(syllables, syllable_weights, k=rng.choices(counts, count_weights)[0])
+        if parts[1][0] in DOUBLES and rng.random() < 0.2:
+            parts[1] = parts[1][0] + parts[1]
+        word = "".join(parts)
+        if len(word) < 4 or word in seen:
+            continue
+        seen.add(word)
+        # Zipf's law: frequency ~ 1/rank, i.e. zipf falls by one per decade of rank
+        zipf = max(1.0, round(7.5 - math.log10(len(out) + 1) + rng.uniform(-0.3, 0.3), 2))
+        out.append((word, zipf))
+    return out
+
+
+def write_synthetic(path: Path, words: Sequence[Tuple[str, float]]):
+    """Write words as a .jsonl, .sqlite (build.py's schema) or .bin lexicon."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".jsonl":
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf8") as fh:
+            for text, zipf in words:
+                fh.write(json.dumps({"clean_form": text, "zipf": zipf, "mask": mask_of(text)}) + "\n")
+        tmp.replace(path)
+    elif path.suffix == ".sqlite":
+        rows = ((text, zipf, mask_of(text), "synthetic") for text, zipf in words)
+        build_module._write_db(path, rows, [("build_ts_utc", "synthetic")])
+    elif path.suffix == ".bin":
+        write_binary(path, (WordEntry(text=text, zipf=zipf, mask=mask_of(text)) for text, zipf in words))
+    else:
+        raise ValueError(f"unsupported lexicon format: {path.suffix}")
+
+
+def synthetic_lexicon(work_dir: Path, n: int, seed: int, suffix: str) -> Path:
+    """Path of the synthetic lexicon for (n, seed) in the given format, written on first use."""
+    path = work_dir / f"synthetic-{format_size(n)}-{seed}{suffix}"
+    if not path.exists():
+        write_synthetic(path, synthetic_words(n, seed))
+    return path
+
+
+@contextlib.contextmanager
+def synthetic_wordfreq(words: Sequence[Tuple[str, float]]) -> Iterator[None]:
+    """Answer `import wordfreq` from `words` for the duration of the block."""
+    zipfs = dict(words)
+    module = types.ModuleType("wordfreq")
+    module.top_n_list = lambda lang, limit: [w for w, _ in words[:limit]]
+    module.zipf_frequency = lambda word, lang: zipfs.get(word, 0.0)
+    previous = sys.modules.get("wordfreq")
+    sys.modules["wordfreq"] = module
+    try:
+        yield
+    finally:
+        if previous is None:
+            sys.modules.pop("wordfreq", None)
+        else:
+            sys.modules["wordfreq"] = previous
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Shortest wall time of `repeat` calls to `fn`."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict:
+    return {"value": value, "unit": unit, "better": better}
+
+
+class Context:
+    """Synthetic inputs shared by the benchmarks of one lexicon size."""
+
+    def __init__(self, work_dir: Path, n: int, seed: int, repeat: int):
+        self.work_dir = work_dir
+        self.n = n
+        self.seed = seed
+        self.repeat = repeat
+        self._words: Optional[List[Tuple[str, float]]] = None
+        self._lexicon: Optional[Lexicon] = None
+
+    @property
+    def words(self) -> List[Tuple[str, float]]:
+        if self._words is None:
+            self._words = synthetic_words(self.n, self.seed)
+        return self._words
+
+    def path(self, suffix: str) -> Path:
+        return synthetic_lexicon(self.work_dir, self.n, self.seed, suffix)
+
+    @property
+    def lexicon(self) -> Lexicon:
+        """An in-memory (JSONL) lexicon, loaded once."""
+        if self._lexicon is None:
+            self._lexicon = Lexicon(self.path(".jsonl"))
+        return self._lexicon
+
+
+def bench_load_jsonl(ctx: Context) -> Dict:
+    path = ctx.path(".jsonl")
+    return metric(best_of(lambda: Lexicon(path), ctx.repeat), "s")
+
+
+def bench_load_sqlite(ctx: Context) -> Dict:
+    path = ctx.path(".sqlite")
+    return metric(best_of(lambda: list(Lexicon(path).iter_all()), ctx.repeat), "s")
+
+
+def bench_iter_by_required(ctx: Context) -> Dict:
+    path = ctx.path(".sqlite")
+
+    def run():
+        lex = Lexicon(path)
+        for letter in "aeiou":
+            for _ in lex.iter_by_required(letter):
+                pass
+    return metric(best_of(run, ctx.repeat), "s")
+
+
+def _bench_generate(ctx: Context, settings: Settings, boards: int = 5) -> Dict:
+    lex = ctx.lexicon
+
+    def run():
+        for seed in range(boards):
+            generate_board(lex, settings, random.Random(seed))
+    return metric(best_of(run, ctx.repeat) / boards, "s/board")
+
+
+def bench_generate_loose(ctx: Context) -> Dict:
+    return _bench_generate(ctx, Settings())
+
+
+def bench_generate_tight(ctx: Context) -> Dict:
+    return _bench_generate(ctx, replace(Settings(), **TIGHT))
+
+
+def bench_score_word(ctx: Context) -> Dict:
+    settings = Settings()
+    entries = list(ctx.lexicon.iter_all())[:100000]
+    board_mask = mask_of(LETTERS[:7])
+
+    def run():
+        for entry in entries:
+            score_word(entry, board_mask, settings)
+    return metric(len(entries) / best_of(run, ctx.repeat), "calls/s", "higher")
+
+
+def bench_engine_guess(ctx: Context) -> Dict:
+    board = generate_board(ctx.lexicon, Settings(), random.Random(ctx.seed))
+    valid = [w.text for w in board.words] or ["cane"]
+    invalid = [w for w, _ in ctx.words[:len(valid) * 3]]
+    guesses = (valid + invalid) * max(1, 20000 // (len(valid) + len(invalid)))
+
+    def run():
+        engine = Engine(board)
+        for word in guesses:
+            engine.guess(word)
+    return metric(len(guesses) / best_of(run, ctx.repeat), "guesses/s", "higher")
+
+
+def bench_build(ctx: Context) -> Dict:
+    words = ctx.words
+    out_dir = Path(tempfile.mkdtemp(dir=ctx.work_dir))
+    dict_path = out_dir / "synthetic.dic"
+    # Every other word is in the dictionary, so build() filters half the tokens
+    dict_path.write_text(f"{len(words) // 2}\n" + "".join(f"{w}/S\n" for w, _ in words[::2]), encoding="utf8")
+    out = out_dir / "lexicon.sqlite"
+
+    def run():
+        with synthetic_wordfreq(words), contextlib.redirect_stdout(None):
+            build_module.build(out, dict_path, None, None, limit=len(words), min_len=4,
+                               binary_path=out.with_suffix(".bin"), workers=1)
+    try:
+        return metric(best_of(run, ctx.repeat), "s")
+    finally:
+        for path in out_dir.iterdir():
+            path.unlink()
+        out_dir.rmdir()
+
+
+def bench_startup(ctx: Context) -> Dict:
+    home = ctx.work_dir / f"home-{format_size(ctx.n)}-{ctx.seed}"
+    data_path = home / ".it_spelling_bee"
+    if not (data_path / "lexicon.sqlite").exists():
+        data_path.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(ctx.path(".sqlite"), data_path / "lexicon.sqlite")
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env = {**os.environ, "HOME": str(home), "PYTHONPATH": os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))}
+    code = f"from it_spelling_bee.cli import run; run(['--seed', '{ctx.seed}', '--no-color'])"
+
+    def run():
+        subprocess.run([sys.executable, "-c", code], env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, check=True)
+    run()
+    return metric(best_of(run, ctx.repeat), "s")
+
+
+BENCHMARKS: Dict[str, Callable[[Context], Dict]] = {
+    "load_jsonl": bench_load_jsonl,
+    "load_sqlite": bench_load_sqlite,
+    "iter_by_required": bench_iter_by_required,
+    "generate_loose": bench_generate_loose,
+    "generate_tight": bench_generate_tight,
+    "score_word": bench_score_word,
+    "engine_guess": bench_engine_guess,
+    "build": bench_build,
+    "startup": bench_startup,
+}
+
+
+def run_suite(sizes: Sequence[int], names: Sequence[str], work_dir: Path, seed: int = 0, repeat: int = 3,
+              log: Callable[[str], None] = print, memory: bool = False) -> Dict:
+    """Run the named benchmarks at every size; returns the results document.
+
+    With `memory`, also the memory report per size; structures over budget,
+    and a `startup` over `STARTUP_BUDGET`, are listed under "over_budget".
+    """
+    metrics: Dict[str, Dict] = {}
+    over_budget: List[str] = []
+    for n in sizes:
+        ctx = Context(work_dir, n, seed, repeat)
+        for name in names:
+            key = f"{name}@{format_size(n)}"
+            metrics[key] = BENCHMARKS[name](ctx)
+            log(f"{key:<28}{metrics[key]['value']:>14.6g} {metrics[key]['unit']}")
+            if name == "startup" and metrics[key]["value"] > STARTUP_BUDGET:
+                over_budget.append(f"{format_size(n)} startup: {metrics[key]['value'] * 1000:.0f} ms over budget {STARTUP_BUDGET * 1000:.0f}")
+        if memory:
+            report = memory_report(ctx.path(".jsonl"), ctx.path(".sqlite"))
+            log(f"\nmemory@{format_size(n)}\n{format_report(report)}\n")
+            for structure, row in report["structures"].items():
+                metrics[f"memory.{structure}@{format_size(n)}"] = metric(row["bytes_per"], f"B/{row['per']}")
+            over_budget += [f"{format_size(n)} {message}" for message in check_budgets(report)]
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "sizes": list(sizes),
+        "metrics": metrics,
+    }
+    if memory or over_budget:
+        results["over_budget"] = over_budget
+    return results
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """Metrics present in both runs, with their relative change and whether it is a regression.
+
+    `change` is positive when the metric got worse: the fractional increase
+    of a lower-is-better value, or the fractional decrease of a
+    higher-is-better one.
+    """
+    rows = []
+    for key, cur in current["metrics"].items():
+        base = baseline["metrics"].get(key)
+        if base is None or not base["value"]:
+            continue
+        ratio = cur["value"] / base["value"]
+        change = ratio - 1 if cur.get("better", "lower") == "lower" else 1 - ratio
+        rows.append({"metric": key, "baseline": base["value"], "current": cur["value"], "unit": cur["unit"],
+                     "change": change, "regressed": change > threshold})
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m it_spelling_bee.bench", description="Benchmark the lexicon, generator and engine on synthetic lexicons")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated lexicon sizes, e.g. 10k,100k,1M,5M")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help=f"comma-separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the fastest counts")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic lexicon seed")
+    parser.add_argument("--work-dir", type=Path, default=Path(tempfile.gettempdir()) / "itbee-bench", help="where synthetic lexicons are kept")
+    parser.add_argument("--out", type=Path, default=None, help="write results JSON here")
+    parser.add_argument("--results", type=Path, default=None, help="compare these results instead of running")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed fractional slowdown per metric")
+    parser.add_argument("--memory-report", action="store_true", help="report retained memory per structure and check its budgets")
+    args = parser.parse_args(argv)
+
+    if args.results is not None:
+        results = json.loads(args.results.read_text(encoding="utf8"))
+    else:
+        names = [name.strip() for name in args.only.split(",") if name.strip()]
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+        sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+        results = run_suite(sizes, names, args.work_dir, args.seed, args.repeat, memory=args.memory_report)
+    if args.out is not None:
+        args.out.write_text(json.dumps(results, indent=2) + "\n", encoding="utf8")
+        print(f"Wrote {args.out}")
+    over_budget = results.get("over_budget", [])
+    for message in over_budget:
+        print(f"Over budget at {message}")
+
+    if args.compare is None:
+        return 1 if over_budget else 0
+    rows = compare(json.loads(args.compare.read_text(encoding="utf8")), results, args.threshold)
+    print(f"\n{'metric':<28}{'baseline':>14}{'current':>14}{'change':>9}")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"{row['metric']:<28}{row['baseline']:>14.6g}{row['current']:>14.6g}{row['change']:>+9.1%}{flag}")
+    regressed = [row["metric"] for row in rows if row["regressed"]]
+    if regressed:
+        print(f"\n{len(regressed)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} ({len(rows)} metrics compared)")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""On-disk cache of generated boards.
+
+Resuming a session, `--hint`, `--solution` and `--dumpboard` all rebuild
+the board for a stored seed. Boards are cached as JSON (`GeneratedBoard.to_dict`)
+under `Settings.data_path / "boards"`, one file per key:
+
+    <lexicon fingerprint[:16]>-<settings_hash>-<sample|catalog|search>-<seed>.json
+
+A board drawn from a stored board catalog (`catalog_path`) differs from a
+sampled one for the same seed, hence the method in the key.
+
+The fingerprint comes from `lexicon_fingerprint`, which reads the
+warm-start snapshot stamp instead of opening the lexicon, so a hit needs
+neither the lexicon nor the generator. The directory is kept under
+`max_bytes` by deleting the least recently used files (hits refresh a
+file's mtime).
+"""
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from .config import Settings, settings_hash
+from .lexicon.snapshot import source_sha256
+from .typing import GeneratedBoard
+
+BOARD_CACHE_VERSION = 1
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+
+def lexicon_fingerprint(source: Path, cache_dir: Path) -> Optional[str]:
+    """What `Lexicon(source).fingerprint()` returns, or None if `source` does not exist."""
+    if not source.exists():
+        return None
+    return source_sha256(cache_dir, source)
+
+
+def catalog_path(settings: Settings, fingerprint: str) -> Path:
+    """Where the board catalog (see `catalog.py`) for a lexicon and Settings is stored."""
+    return settings.data_path / "catalogs" / f"{fingerprint[:16]}-{settings_hash(settings)}.json"
+
+
+def board_key(seed: int, settings: Settings, fingerprint: str, search: bool = False, catalog: bool = False) -> str:
+    method = "search" if search else "catalog" if catalog else "sample"
+    return f"{fingerprint[:16]}-{settings_hash(settings)}-{method}-{seed}"
+
+
+class DiskBoardCache:
+    def __init__(self, root: Path, max_bytes: int = MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[GeneratedBoard]:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf8") as fh:
+                data = json.load(fh)
+            if data.get("version") != BOARD_CACHE_VERSION:
+                return None
+            board = GeneratedBoard.from_dict(data["board"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return board
+
+    def put(self, key: str, board: GeneratedBoard):
+        path = self._path(key)
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with tmp.open("w", encoding="utf8") as fh:
+                json.dump({"version": BOARD_CACHE_VERSION, "board": board.to_dict()}, fh, ensure_ascii=False, separators=(",", ":"))
+            tmp.replace(path)
+            self.evict()
+        except OSError:
+            # Only a cache: a read-only data path just means no caching
+            pass
+
+    def evict(self):
+        """Delete least recently used boards until the cache fits in `max_bytes`."""
+        files = []
+        total = 0
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                files.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            os.unlink(path)
+            total -= size
@@ -0,0 +1,184 @@
+"""Precomputed catalog of the boards that satisfy a given Settings.
+
+Every (letter set, required letter) pair drawn from the sampler's alphabet is
+evaluated once, offline, and the pairs whose word count and total points fall
+inside the Settings ranges are stored together with those figures. With a
+catalog `generate_board` picks a board with one weighted, seeded draw instead
+of rejection sampling; the CLI, `generate_boards` callers, the daily packs
+and the server use the catalog stored under `catalog_path` when there is
+one (see `load_catalog`).
+
+Usage:
+    python -m it_spelling_bee.catalog --lexicon /path/to/lexicon.sqlite
+"""
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .boardcache import catalog_path
+from .config import Settings, settings_hash
+from .generator import LETTER_WEIGHTS, VOWELS, WeightedLetterSampler, in_range
+from .letters import LETTER_TO_BIT
+from .lexicon.store import Lexicon
+from .scoring import score_word
+
+CATALOG_VERSION = 1
+
+
+@dataclass
+class CatalogEntry:
+    letters: str  # the 7 board letters, sorted
+    required: str
+    words: int
+    points: int
+
+
+class BoardCatalog:
+    def __init__(self, fingerprint: str, settings_key: str, entries: List[CatalogEntry]):
+        self.fingerprint = fingerprint
+        self.settings_key = settings_key
+        self.entries = entries
+        self._cum_weights: Optional[List[float]] = None
+
+    @classmethod
+    def build(cls, lex: Lexicon, settings: Settings) -> "BoardCatalog":
+        """Enumerate every letter set and required letter that fits `settings`."""
+        # Per exact mask: (word count, points as a plain word, points as a pangram).
+        # A word is a pangram only when its mask equals the 7-letter board mask.
+        groups: Dict[int, List[int]] = {}
+        for entry in lex.iter_all():
+            if len(entry.text) < settings.min_len or bin(entry.mask).count("1") > 7:
+                continue
+            g = groups.setdefault(entry.mask, [0, 0, 0])
+            g[0] += 1
+            g[1] += score_word(entry, 0, settings)
+            g[2] += score_word(entry, entry.mask, settings)
+
+        sampler = WeightedLetterSampler(allow_rare=settings.allow_rare_letters)
+        alphabet = sorted(ch for ch in sampler.population if sampler.weights[ch] > 0)
+
+        alphabet_mask = 0
+        for ch in alphabet:
+            alphabet_mask |= LETTER_TO_BIT[ch]
+        # Words using letters outside the sampler's alphabet never appear on a board
+        groups = {m: g for m, g in groups.items() if (m & ~alphabet_mask) == 0}
+
+        entries: List[CatalogEntry] = []
+        for combo in combinations(alphabet, 7):
+            vowels = sum(1 for c in combo if c in VOWELS)
+            if vowels < 2 or 7 - vowels < 3:
+                continue
+            bits = [LETTER_TO_BIT[ch] for ch in combo]
+            board_mask = sum(bits)
+
+            # Walk the 127 non-empty submasks of the board and credit each
+            # group to every board letter it contains
+            counts = [0] * 7
+            points = [0] * 7
+            sub = board_mask
+            while sub:
+                g = groups.get(sub)
+                if g is not None:
+                    pts = g[2] if sub == board_mask else g[1]
+                    for i, bit in enumerate(bits):
+                        if sub & bit:
+                            counts[i] += g[0]
+                            points[i] += pts
+                sub = (sub - 1) & board_mask
+
+            letters = "".join(combo)
+            for i, ch in enumerate(combo):
+                if in_range(counts[i], points[i], settings):
+                    entries.append(CatalogEntry(letters=letters, required=ch, words=counts[i], points=points[i]))
+
+        return cls(lex.fingerprint(), settings_hash(settings), entries)
+
+    def check(self, lex: Lexicon, settings: Settings):
+        """Raise ValueError if the catalog was built for another lexicon or Settings."""
+        if self.fingerprint != lex.fingerprint():
+            raise ValueError("board catalog was built for a different lexicon")
+        if self.settings_key != settings_hash(settings):
+            raise ValueError("board catalog was built for different settings")
+
+    def draw(self, rng: random.Random) -> Tuple[str, List[str]]:
+        """Pick one board, weighted by how common its letters are in Italian.
+
+        Returns (required_letter, other_6_letters) like `WeightedLetterSampler.sample_set`.
+        """
+        if self._cum_weights is None:
+            cum = []
+            total = 0.0
+            for e in self.entries:
+                w = 1.0
+                for ch in e.letters:
+                    w *= LETTER_WEIGHTS[ch]
+                total += w
+                cum.append(total)
+            self._cum_weights = cum
+        entry = rng.choices(self.entries, cum_weights=self._cum_weights, k=1)[0]
+        others = [ch for ch in entry.letters if ch != entry.required]
+        rng.shuffle(others)
+        return entry.required, others
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": CATALOG_VERSION,
+            "fingerprint": self.fingerprint,
+            "settings_hash": self.settings_key,
+            "entries": [[e.letters, e.required, e.words, e.points] for e in self.entries],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BoardCatalog":
+        if data.get("version") != CATALOG_VERSION:
+            raise ValueError(f"unsupported board catalog version: {data.get('version')}")
+        entries = [CatalogEntry(letters=l, required=r, words=w, points=p) for l, r, w, p in data["entries"]]
+        return cls(data["fingerprint"], data["settings_hash"], entries)
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("w", encoding="utf8") as fh:
+            json.dump(self.to_dict(), fh, separators=(",", ":"))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BoardCatalog":
+        with path.open("r", encoding="utf8") as fh:
+            return cls.from_dict(json.load(fh))
+
+
+def load_catalog(lex: Lexicon, settings: Settings) -> Optional[BoardCatalog]:
+    """Load the stored catalog for this lexicon and Settings, if one was built."""
+    path = catalog_path(settings, lex.fingerprint())
+    if not path.exists():
+        return None
+    try:
+        catalog = BoardCatalog.load(path)
+        catalog.check(lex, settings)
+    except (OSError, ValueError, KeyError):
+        return None
+    return catalog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the catalog of valid boards for a lexicon and the default Settings")
+    parser.add_argument("--lexicon", type=Path, default=None, help="Lexicon file (defaults to the one the CLI uses)")
+    parser.add_argument("--out", type=Path, default=None, help="Output path (defaults to the catalog cache under the data path)")
+    parser.add_argument("--allow-rare-letters", action="store_true")
+    args = parser.parse_args(argv)
+
+    settings = Settings(allow_rare_letters=args.allow_rare_letters)
+    lex = Lexicon(args.lexicon)
+    catalog = BoardCatalog.build(lex, settings)
+    out = args.out or catalog_path(settings, catalog.fingerprint)
+    catalog.save(out)
+    print(f"Wrote {len(catalog.entries)} boards to {out}")
+
+
+if __name__ == "__main__":
+    main()
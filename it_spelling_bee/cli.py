@@ -1,14 +1,58 @@
 import argparse
+import importlib
+import json
+import os
 import random
 import sys
+import time
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 from .config import Settings
-from .lexicon.store import Lexicon
-from .generator import generate_board
-from .engine import Engine
-from .letters import shuffle_letters
-from .persistence import load_session, save_session
+
+_START = time.perf_counter()
+
+# Imported on first use so paths that never touch the lexicon (--rules,
+# --help) skip loading it. Tests may monkeypatch these module attributes.
+_LAZY = {
+    "Lexicon": ".lexicon.store",
+    "generate_board": ".generator",
+    "generate_boards": ".generator",
+    "search_board": ".generator",
+    "Engine": ".engine",
+    "shuffle_letters": ".letters",
+    "load_session": ".persistence",
+    "save_session": ".persistence",
+    "SessionJournal": ".persistence",
+    "delete_session": ".persistence",
+    "session_found": ".persistence",
+    "normalize_text": ".letters",
+    "DiskBoardCache": ".boardcache",
+    "board_key": ".boardcache",
+    "catalog_path": ".boardcache",
+    "load_catalog": ".catalog",
+    "lexicon_fingerprint": ".boardcache",
+    "default_lexicon_path": ".lexicon.paths",
+}
+
+# Seeds the letter shuffles apart from generation, so a cached board and a
+# freshly generated one shuffle the same way for a given seed
+SHUFFLE_SALT = 0x5EED5A17
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __package__), name)
+    globals()[name] = value
+    return value
+
+
+def _load_lazy(*names):
+    for name in names or _LAZY:
+        if name not in globals():
+            __getattr__(name)
 
 # ANSI Colors
 class Colors:
@@ -67,6 +111,7 @@ Commands during play:
   list     - Show found words
   score    - Show current score
   hint     - Get a hint (costs points!)
+  grid     - Count remaining words by first letter and length
   giveup   - Show all possible words
   restart  - Start a new game
   quit     - Exit the game
@@ -91,10 +136,138 @@ Scoring:
 Goal: Achieve 75% of total possible points
 """)
 
+def format_hint_grid(data: dict) -> str:
+    """Render `Engine.hint_grid()` as a letter x length table plus two-letter starts."""
+    grid = data["grid"]
+    if not grid:
+        return "No more words to find!"
+    lengths = sorted({length for row in grid.values() for length in row})
+    width = max(2, len(str(sum(sum(row.values()) for row in grid.values()))))
+
+    def line(label, cells):
+        return f"{label:>2}{':' if label else ' '} " + " ".join(f"{c:>{width}}" for c in cells)
+
+    lines = [line("", [*lengths, "Σ"])]
+    for letter, row in grid.items():
+        lines.append(line(letter.upper(), [row.get(n, "-") for n in lengths] + [sum(row.values())]))
+    totals = [sum(row.get(n, 0) for row in grid.values()) for n in lengths]
+    lines.append(line("Σ", totals + [sum(totals)]))
+
+    starts = {}
+    for prefix, count in data["two_letter"].items():
+        starts.setdefault(prefix[:1], []).append(f"{prefix.upper()}-{count}")
+    lines.append("")
+    lines.extend(" ".join(items) for items in starts.values())
+    return "\n".join(lines)
+
 def get_session_path(settings: Settings) -> Path:
     return settings.data_path / "session.json"
 
+def get_board_cache(settings: Settings) -> "DiskBoardCache":
+    return DiskBoardCache(settings.data_path / "boards")
+
+def load_board(settings: Settings, rng: random.Random, search: bool = False):
+    """The board for `settings.seed`: from the board cache, else generated and cached.
+
+    Boards are drawn from the stored board catalog when one was built for
+    the lexicon and Settings. A cache hit does not load the lexicon.
+    """
+    _load_lazy("DiskBoardCache", "board_key", "catalog_path", "lexicon_fingerprint", "default_lexicon_path")
+    source = default_lexicon_path(settings.data_path)
+    fingerprint = lexicon_fingerprint(source, settings.data_path / "cache")
+    cache = get_board_cache(settings)
+    use_catalog = bool(fingerprint) and not search and catalog_path(settings, fingerprint).exists()
+    key = board_key(settings.seed, settings, fingerprint, search, use_catalog) if fingerprint else None
+    board = cache.get(key) if key else None
+    if board is None:
+        _load_lazy("Lexicon", "generate_board", "search_board", "load_catalog")
+        lex = Lexicon(source, cache_dir=settings.data_path / "cache")
+        if search:
+            board, evaluations = search_board(lex, settings, rng)
+            if os.environ.get("ITBEE_TRACE_STARTUP"):
+                print(f"search: {evaluations} boards evaluated", file=sys.stderr)
+        else:
+            catalog = load_catalog(lex, settings) if use_catalog else None
+            board = generate_board(lex, settings, rng, catalog=catalog)
+            if key and use_catalog and catalog is None:
+                # The catalog could not be read, so the board was sampled
+                key = board_key(settings.seed, settings, fingerprint)
+        if key:
+            cache.put(key, board)
+    return board
+
+def parse_seed_range(text: str) -> range:
+    """Parse "A..B" (inclusive) or a single seed into a range of seeds."""
+    try:
+        if ".." in text:
+            start, end = text.split("..", 1)
+            return range(int(start), int(end) + 1)
+        return range(int(text), int(text) + 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seed range: {text!r} (expected A..B)")
+
+def run_generate(argv):
+    parser = argparse.ArgumentParser(prog="itbee generate", description="Generate boards for a range of seeds as JSON lines")
+    parser.add_argument("--seeds", type=parse_seed_range, required=True, help="seed range A..B (inclusive)")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--out", type=Path, default=None, help="output file (default: stdout)")
+    parser.add_argument("--lexicon", type=Path, default=None, help="lexicon file (default: the one the game uses)")
+    parser.add_argument("--min-valid-words", type=int, help="Minimum number of valid words required")
+    parser.add_argument("--search", action="store_true", help="find boards by guided local search instead of rejection sampling")
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    if args.min_valid_words is not None:
+        settings.min_valid_words = args.min_valid_words
+
+    _load_lazy()
+    lex = Lexicon(args.lexicon, cache_dir=settings.data_path / "cache")
+    out = args.out.open("w", encoding="utf8") if args.out else sys.stdout
+    try:
+        catalog = None if args.search else load_catalog(lex, settings)
+        for seed, board in generate_boards(lex, settings, args.seeds, workers=args.workers, search=args.search, catalog=catalog):
+            out.write(json.dumps({"seed": seed, **board.to_dict()}, ensure_ascii=False) + "\n")
+    finally:
+        if args.out:
+            out.close()
+    if args.out:
+        print(f"Wrote {len(args.seeds)} boards to {args.out}")
+
+def parse_day(text: str) -> date:
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {text!r} (expected YYYY-MM-DD)")
+
+def run_daily(argv):
+    from .daily import PACK_BY, write_packs
+
+    parser = argparse.ArgumentParser(prog="itbee daily", description="Precompute daily puzzle packs for the web client")
+    parser.add_argument("--start", type=parse_day, default=None, help="first day, YYYY-MM-DD (default: today, UTC)")
+    parser.add_argument("--days", type=int, default=31, help="number of days to generate")
+    parser.add_argument("--out", type=Path, default=Path("web") / "daily", help="output directory")
+    parser.add_argument("--pack-by", choices=PACK_BY, default="month", help="one pack file per day or per month")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--search", action="store_true", help="find boards by guided local search instead of rejection sampling")
+    args = parser.parse_args(argv)
+
+    start = args.start or datetime.now(timezone.utc).date()
+    _load_lazy()
+    settings = Settings()
+    lex = Lexicon(cache_dir=settings.data_path / "cache")
+    index = write_packs(lex, settings, [start + timedelta(days=i) for i in range(args.days)], args.out, args.pack_by, args.workers, args.search)
+    print(f"Wrote {args.days} daily puzzles from {start.isoformat()} to {args.out} (index: {index})")
+
 def run(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "generate":
+        run_generate(argv[1:])
+        return
+    if argv and argv[0] == "daily":
+        run_daily(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(prog="itbee", description="Italian Spelling Bee - A word puzzle game")
     parser.add_argument("--seed", type=int, default=None, help="use specific seed for board generation")
     parser.add_argument("--rules", action="store_true", help="show game rules and scoring")
@@ -104,6 +277,7 @@ def run(argv=None):
     parser.add_argument("--dumpboard", action="store_true", help="print board data in JSON format")
     parser.add_argument("--no-color", action="store_true", help="disable colored output")
     parser.add_argument("--min-valid-words", type=int, help="Minimum number of valid words required")
+    parser.add_argument("--search", action="store_true", help="find the board by guided local search instead of rejection sampling")
     
     args = parser.parse_args(argv)
     
@@ -111,6 +285,7 @@ def run(argv=None):
         show_rules()
         return
 
+    _load_lazy("Engine", "shuffle_letters", "normalize_text", "load_session", "SessionJournal", "delete_session", "session_found")
     settings = Settings()
     if args.no_color:
         settings.use_colors = False
@@ -134,14 +309,16 @@ def run(argv=None):
         # create a random 32-bit seed and store it so --printseed can display it
         settings.seed = random.getrandbits(32)
         
-    rng = random.Random(settings.seed)
-    lex = Lexicon()
-    board = generate_board(lex, settings, rng)
+    board = load_board(settings, random.Random(settings.seed), args.search)
+    rng = random.Random(settings.seed ^ SHUFFLE_SALT)
     engine = Engine(board)
 
     # Restore state if we loaded a session matching this seed
     if session_data and session_data.get("seed") == settings.seed:
-        engine.restore_state(session_data)
+        engine.restore_state({
+            "found": session_found(session_data, (w.text for w in board.words)),
+            "score": session_data["score"],
+        })
 
     if args.dumpboard:
         print(engine.dump_board())
@@ -174,6 +351,8 @@ def run(argv=None):
         print(f"Found {p['found']}/{len(board.words)}   Score {p['score']} / {board.total_points}   Goal {board.threshold}")
 
     print_status()
+    if os.environ.get("ITBEE_TRACE_STARTUP"):
+        print(f"startup: {(time.perf_counter() - _START) * 1000:.1f} ms", file=sys.stderr)
 
     if args.hint:
         hint, cost = engine.get_hint(settings.hint_cost)
@@ -183,98 +362,100 @@ def run(argv=None):
                 print(colorize(f"(-{cost} points)", Colors.RED, settings.use_colors))
         return
 
-    while True:
-        try:
-            text = input("> ").strip()
-        except (EOFError, KeyboardInterrupt):
-            print("\nGoodbye")
-            return
-        if not text:
-            continue
+    # Progress is journaled from a background thread; see persistence.py
+    journal = SessionJournal(
+        session_path, settings.seed, (w.text for w in board.words), engine.state.found, engine.state.score,
+        seq=session_data.get("seq", 0) if session_data else 0,
+    )
+    try:
+        while True:
+            try:
+                text = input("> ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print("\nGoodbye")
+                return
+            if not text:
+                continue
         
-        if text == "help":
-            print("Commands: help, shuffle, hint, list, score, giveup, restart, printseed, quit")
-            continue
+            if text == "help":
+                print("Commands: help, shuffle, hint, grid, list, score, giveup, restart, printseed, quit")
+                continue
             
-        if text == "printseed":
-            print(f"Board seed: {settings.seed} (0x{settings.seed:X})")
-            continue
+            if text == "printseed":
+                print(f"Board seed: {settings.seed} (0x{settings.seed:X})")
+                continue
             
-        if text == "hint":
-            hint, cost = engine.get_hint(settings.hint_cost)
-            if hint:
-                print(colorize(hint, Colors.YELLOW, settings.use_colors))
-                if cost > 0:
-                    print(colorize(f"Hint penalty applied: -{cost} points", Colors.RED, settings.use_colors))
-                    # Save after score change
-                    save_session(session_path, {
-                        "seed": settings.seed,
-                        "found": list(engine.state.found),
-                        "score": engine.state.score
-                    })
-            else:
-                print("No more words to find!")
-            continue
+            if text == "hint":
+                hint, cost = engine.get_hint(settings.hint_cost)
+                if hint:
+                    print(colorize(hint, Colors.YELLOW, settings.use_colors))
+                    if cost > 0:
+                        print(colorize(f"Hint penalty applied: -{cost} points", Colors.RED, settings.use_colors))
+                        journal.record_hint(engine.state.score)
+                else:
+                    print("No more words to find!")
+                continue
             
-        if text == "shuffle":
-            _, others = shuffle_letters(required, others, rng)
-            others = list(others)
-            print_status()
-            continue
+            if text == "grid":
+                print(format_hint_grid(engine.hint_grid()))
+                continue
             
-        if text == "list":
-            print("Found:")
-            for w in sorted(engine.state.found):
-                print(colorize(w, Colors.GREEN, settings.use_colors))
-            continue
+            if text == "shuffle":
+                _, others = shuffle_letters(required, others, rng)
+                others = list(others)
+                print_status()
+                continue
             
-        if text == "score":
-            print_status()
-            continue
+            if text == "list":
+                print("Found:")
+                for w in sorted(engine.state.found):
+                    print(colorize(w, Colors.GREEN, settings.use_colors))
+                continue
             
-        if text == "restart":
-            print("Starting new game...")
-            if session_path.exists():
-                session_path.unlink()
-            # Re-exec with --new
-            # Or just return to main loop? Simpler to just exit and tell user to run again or wrap in a loop.
-            # Let's wrap in a loop or just re-exec.
-            # For now, let's just clear session and tell user to run again, or better:
-            # We can't easily re-init everything in this structure without refactoring `run` to be a loop.
-            # Let's just delete session and exit.
-            print("Session cleared. Run 'itbee' again to start a new board.")
-            return
+            if text == "score":
+                print_status()
+                continue
             
-        if text == "giveup":
-            print("All words:")
-            for e in board.words:
-                print(f"{e.text} ({board.scores.get(e.text, 0)})")
-            if session_path.exists():
-                session_path.unlink()
-            return
+            if text == "restart":
+                print("Starting new game...")
+                journal.close()
+                delete_session(session_path)
+                # Re-exec with --new
+                # Or just return to main loop? Simpler to just exit and tell user to run again or wrap in a loop.
+                # Let's wrap in a loop or just re-exec.
+                # For now, let's just clear session and tell user to run again, or better:
+                # We can't easily re-init everything in this structure without refactoring `run` to be a loop.
+                # Let's just delete session and exit.
+                print("Session cleared. Run 'itbee' again to start a new board.")
+                return
             
-        if text == "quit":
-            print("Bye")
-            return
-
-        ok, msg, pts = engine.guess(text)
-        if ok:
-            print(colorize(f"+{pts} OK", Colors.GREEN, settings.use_colors))
-            # Save session
-            save_session(session_path, {
-                "seed": settings.seed,
-                "found": list(engine.state.found),
-                "score": engine.state.score
-            })
-        else:
-            if msg == "duplicate":
-                print(colorize(msg, Colors.YELLOW, settings.use_colors))
+            if text == "giveup":
+                print("All words:")
+                for e in board.words:
+                    print(f"{e.text} ({board.scores.get(e.text, 0)})")
+                journal.close()
+                delete_session(session_path)
+                return
+            
+            if text == "quit":
+                print("Bye")
+                return
+
+            ok, msg, pts = engine.guess(text)
+            if ok:
+                print(colorize(f"+{pts} OK", Colors.GREEN, settings.use_colors))
+                journal.record_guess(normalize_text(text), engine.state.score)
             else:
-                print(colorize(msg, Colors.RED, settings.use_colors))
+                if msg == "duplicate":
+                    print(colorize(msg, Colors.YELLOW, settings.use_colors))
+                else:
+                    print(colorize(msg, Colors.RED, settings.use_colors))
             
-        # Update progress after each guess
-        print_status()
+            # Update progress after each guess
+            print_status()
 
+    finally:
+        journal.close()
 
 if __name__ == "__main__":
     run()
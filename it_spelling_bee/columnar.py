@@ -0,0 +1,171 @@
+"""NumPy columnar evaluation of boards.
+
+The lexicon is held as parallel arrays (masks, lengths, zipf) so filtering,
+pangram detection and scoring for a board are single vectorised expressions,
+and `evaluate_many` scores hundreds of candidate boards in one call.
+Results match the scalar path (`generator.evaluate_board`, `score_word`)
+exactly: zipf stays float64 so the frequency points round the same way.
+
+This module requires the `numpy` package.
+"""
+import random
+from typing import Dict, List, Sequence, Tuple
+
+from .config import Settings
+from .generator import WeightedLetterSampler, board_mask_of, in_range, make_board
+from .letters import LETTER_TO_BIT
+from .lexicon.store import Lexicon
+from .typing import GeneratedBoard, Letters, WordEntry
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+# Row k selects the other-letter slots given by the bits of k (64 x 6)
+_SELECT = None if np is None else ((np.arange(64)[:, None] >> np.arange(6)[None, :]) & 1).astype(np.int64)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for columnar evaluation. Install with: pip install numpy")
+
+
+class ColumnarLexicon:
+    def __init__(self, entries: Sequence[WordEntry]):
+        _require_numpy()
+        self.entries: List[WordEntry] = list(entries)
+        self.masks = np.fromiter((e.mask for e in self.entries), dtype=np.uint32, count=len(self.entries))
+        self.lengths = np.fromiter((len(e.text) for e in self.entries), dtype=np.uint8, count=len(self.entries))
+        self.zipf = np.fromiter((e.zipf for e in self.entries), dtype=np.float64, count=len(self.entries))
+        self._base: Dict[Tuple[float, int], "np.ndarray"] = {}
+        self._tables: Dict[Tuple[float, int, int], tuple] = {}
+
+    @classmethod
+    def from_lexicon(cls, lex: Lexicon) -> "ColumnarLexicon":
+        return cls(list(lex.iter_all()))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def base_points(self, settings: Settings) -> "np.ndarray":
+        """Frequency plus length points per word, i.e. `score_word` without the pangram bonus."""
+        key = (settings.alpha, settings.min_len)
+        base = self._base.get(key)
+        if base is None:
+            freq = np.maximum(1, np.round(settings.alpha * (8.0 - self.zipf))).astype(np.int32)
+            length = np.maximum(0, self.lengths.astype(np.int32) - settings.min_len)
+            base = freq + length
+            self._base[key] = base
+        return base
+
+    def _scores(self, base: "np.ndarray", pangram: "np.ndarray", settings: Settings) -> "np.ndarray":
+        return np.minimum(50, base + pangram * settings.pangram_bonus_points)
+
+    def evaluate(self, board_mask: int, required: str, settings: Settings) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return (word indices, scores) of the valid words for one board."""
+        bit = LETTER_TO_BIT.get(required.lower(), 0)
+        outside = np.uint32(~board_mask & 0xFFFFFFFF)
+        ok = ((self.masks & outside) == 0) & ((self.masks & np.uint32(bit)) != 0) & (self.lengths >= settings.min_len)
+        idx = np.flatnonzero(ok)
+        masks = self.masks[idx]
+        scores = self._scores(self.base_points(settings)[idx], masks == np.uint32(board_mask), settings)
+        return idx, scores
+
+    def _mask_table(self, settings: Settings):
+        """Per distinct mask: (sorted masks, word counts, plain points, pangram points)."""
+        key = (settings.alpha, settings.min_len, settings.pangram_bonus_points)
+        table = self._tables.get(key)
+        if table is None:
+            keep = self.lengths >= settings.min_len
+            masks = self.masks[keep]
+            base = self.base_points(settings)[keep]
+            uniq, inverse = np.unique(masks, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(uniq)).astype(np.int64)
+            plain = np.bincount(inverse, weights=self._scores(base, False, settings), minlength=len(uniq)).astype(np.int64)
+            pangram = np.bincount(inverse, weights=self._scores(base, True, settings), minlength=len(uniq)).astype(np.int64)
+            table = (uniq, counts, plain, pangram)
+            self._tables[key] = table
+        return table
+
+    def evaluate_many(self, board_masks: Sequence[int], required_bits: Sequence[int], settings: Settings) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return (word counts, total points) for many boards of up to 7 letters at once.
+
+        Like `Lexicon.words_for_board`, each board is expanded into the 64
+        submasks that contain its required bit; all of them are looked up in
+        the sorted per-mask table with a single `searchsorted`.
+        """
+        boards = np.asarray(board_masks, dtype=np.int64)
+        required = np.asarray(required_bits, dtype=np.int64)
+        uniq, counts, plain, pangram = self._mask_table(settings)
+        if len(uniq) == 0 or len(boards) == 0:
+            return np.zeros(len(boards), dtype=np.int64), np.zeros(len(boards), dtype=np.int64)
+
+        # The other (up to 6) letter bits of each board, zero-padded
+        rest = boards & ~required
+        others = np.zeros((len(boards), 6), dtype=np.int64)
+        for i in range(6):
+            low = rest & -rest
+            others[:, i] = low
+            rest ^= low
+        if (rest != 0).any():
+            raise ValueError("evaluate_many supports boards of at most 7 letters")
+
+        # Submasks: required bit plus every selection of the other bits.
+        # Selections that pick a padding slot duplicate another submask.
+        chosen = others[:, None, :] * _SELECT[None, :, :]
+        subs = required[:, None] | chosen.sum(axis=2)
+        real = ~((_SELECT[None, :, :] == 1) & (others[:, None, :] == 0)).any(axis=2)
+
+        pos = np.minimum(np.searchsorted(uniq, subs), len(uniq) - 1)
+        hit = (uniq[pos] == subs) & real & ((boards & required) != 0)[:, None]
+        points = np.where(subs == boards[:, None], pangram[pos], plain[pos])
+        return (counts[pos] * hit).sum(axis=1), (points * hit).sum(axis=1)
+
+    def board(self, letters: Letters, board_mask: int, settings: Settings) -> GeneratedBoard:
+        idx, scores = self.evaluate(board_mask, letters.required, settings)
+        valid = [self.entries[i] for i in idx.tolist()]
+        score_map = {e.text: int(s) for e, s in zip(valid, scores.tolist())}
+        return make_board(letters, valid, score_map, int(scores.sum()), board_mask, settings)
+
+
+def generate_board_columnar(lex: Lexicon, settings: Settings, rng: random.Random, batch_size: int = 64) -> GeneratedBoard:
+    """Columnar version of `generate_board`.
+
+    Letter sets are sampled in batches and scored with one `evaluate_many`
+    call per batch. Sampling never depends on evaluation, and the RNG is
+    rewound to just after the accepted sample, so the returned board and the
+    RNG state afterwards are the same as with `generate_board`.
+    """
+    col = lex.columnar()
+    sampler = WeightedLetterSampler(allow_rare=settings.allow_rare_letters)
+    target_words = (settings.min_valid_words + settings.max_valid_words) / 2
+    target_points = (settings.min_total_points + settings.max_total_points) / 2
+
+    best = None
+    best_score_diff = float('inf')
+    attempts = 0
+    while attempts < 1000:
+        batch = []
+        for _ in range(min(batch_size, 1000 - attempts)):
+            required, others = sampler.sample_set(rng)
+            batch.append((required, others, rng.getstate()))
+        attempts += len(batch)
+
+        masks = [board_mask_of(required, others) for required, others, _ in batch]
+        counts, totals = col.evaluate_many(masks, [LETTER_TO_BIT[required] for required, _, _ in batch], settings)
+        for i, (required, others, state) in enumerate(batch):
+            count, total_points = int(counts[i]), int(totals[i])
+            letters = Letters(required=required, others=tuple(others))
+            if in_range(count, total_points, settings):
+                rng.setstate(state)
+                return col.board(letters, masks[i], settings)
+            if count > 0:
+                diff = abs(count - target_words) + abs(total_points - target_points) / 10.0
+                if diff < best_score_diff:
+                    best_score_diff = diff
+                    best = (letters, masks[i])
+
+    if best is not None:
+        return col.board(best[0], best[1], settings)
+    return GeneratedBoard(letters=letters, words=[], scores={}, total_points=0, threshold=0, mask=masks[-1])
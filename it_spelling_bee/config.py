@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+import hashlib
+import json
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -18,3 +20,26 @@ class Settings:
     use_colors: bool = True
     seed: Optional[int] = None
     data_path: Path = Path("~/.it_spelling_bee").expanduser()
+
+
+# Settings fields that change which boards are generated or how they score
+BOARD_FIELDS: Tuple[str, ...] = (
+    "min_len",
+    "alpha",
+    "pangram_bonus_points",
+    "min_valid_words",
+    "max_valid_words",
+    "min_total_points",
+    "max_total_points",
+    "win_fraction",
+    "allow_rare_letters",
+)
+
+# Settings fields a word's board-independent base score depends on
+BASE_SCORE_FIELDS: Tuple[str, ...] = ("alpha", "min_len")
+
+
+def settings_hash(settings: Settings, fields: Tuple[str, ...] = BOARD_FIELDS) -> str:
+    """Stable short hash of the given Settings fields, for cache keys."""
+    payload = json.dumps({f: getattr(settings, f) for f in fields}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()[:16]
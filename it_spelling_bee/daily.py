@@ -0,0 +1,106 @@
+"""Precomputed daily puzzles for the web client.
+
+Each day's seed follows `getDailySeed` in `web/app.js`: 100000 plus the
+number of UTC days since 2024-01-01. Boards come from `generate_boards`
+(so from `generate_board` with `random.Random(seed)`, drawing from the
+stored board catalog if one was built) and are written as
+compact JSON packs holding only the letters and the solution words, one
+file per day or per month, plus an `index.json` the client reads first:
+
+    index.json    {"version", "pack_by", "first", "last", "packs": {key: file}}
+    2026-10.json  {"version", "days": {"2026-10-17": {"seed", "center", "outer", "words"}}}
+
+Usage:
+    python -m it_spelling_bee.cli daily --days 60 --out web/daily
+"""
+import json
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from .catalog import load_catalog
+from .config import Settings
+from .generator import generate_boards
+from .lexicon.store import Lexicon
+from .typing import GeneratedBoard
+
+EPOCH = date(2024, 1, 1)
+SEED_BASE = 100000
+PACK_VERSION = 1
+PACK_BY = ("day", "month")
+
+
+def daily_seed(day: date) -> int:
+    return SEED_BASE + (day - EPOCH).days
+
+
+def seed_day(seed: int) -> date:
+    return EPOCH + timedelta(days=seed - SEED_BASE)
+
+
+def pack_key(day: date, pack_by: str) -> str:
+    return day.isoformat() if pack_by == "day" else day.isoformat()[:7]
+
+
+def day_entry(seed: int, board: GeneratedBoard) -> Dict:
+    return {
+        "seed": seed,
+        "center": board.letters.required,
+        "outer": "".join(board.letters.others),
+        "words": sorted(w.text for w in board.words),
+    }
+
+
+def _read_json(path: Path) -> Dict:
+    try:
+        with path.open("r", encoding="utf8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: Path, data: Dict):
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf8") as fh:
+        json.dump(data, fh, ensure_ascii=False, separators=(",", ":"))
+    tmp.replace(path)
+
+
+def write_packs(lex: Lexicon, settings: Settings, days: Iterable[date], out_dir: Path, pack_by: str = "month", workers: int = 1, search: bool = False) -> Path:
+    """Generate the puzzles for `days` into packs under `out_dir`; return the index path.
+
+    Days already in an existing pack or index of the same layout are kept,
+    so packs can be extended a month at a time.
+    """
+    if pack_by not in PACK_BY:
+        raise ValueError(f"pack_by must be one of {PACK_BY}")
+    days = sorted(set(days))
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    index_path = out_dir / "index.json"
+    index = _read_json(index_path)
+    if index.get("version") != PACK_VERSION or index.get("pack_by") != pack_by:
+        index = {"version": PACK_VERSION, "pack_by": pack_by, "packs": {}}
+
+    packs: Dict[str, Dict] = {}
+    seeds = [daily_seed(d) for d in days]
+    catalog = None if search else load_catalog(lex, settings)
+    for seed, board in generate_boards(lex, settings, seeds, workers=workers, search=search, catalog=catalog):
+        day = seed_day(seed)
+        key = pack_key(day, pack_by)
+        if key not in packs:
+            existing = _read_json(out_dir / f"{key}.json")
+            packs[key] = existing if existing.get("version") == PACK_VERSION else {"version": PACK_VERSION, "days": {}}
+        packs[key]["days"][day.isoformat()] = day_entry(seed, board)
+
+    for key, pack in packs.items():
+        pack["days"] = dict(sorted(pack["days"].items()))
+        _write_json(out_dir / f"{key}.json", pack)
+        index["packs"][key] = f"{key}.json"
+
+    index["packs"] = dict(sorted(index["packs"].items()))
+    covered: List[str] = [d for key in index["packs"] for d in _read_json(out_dir / index["packs"][key]).get("days", {})]
+    if covered:
+        index["first"], index["last"] = min(covered), max(covered)
+    _write_json(index_path, index)
+    return index_path
@@ -1,10 +1,11 @@
 from dataclasses import dataclass, field
 import json
 import random
-from typing import Set, Tuple, Dict, Any, Optional
+from typing import Set, Tuple, Dict, Any, Iterable, List, Optional
 
 from .typing import GeneratedBoard
-from .letters import normalize_text
+from .letters import normalize_many, normalize_text
+from .rules import BoardRules
 
 
 @dataclass
@@ -17,6 +18,40 @@ class GameState:
 class Engine:
     def __init__(self, board: GeneratedBoard):
         self.state = GameState(board=board)
+        required = board.letters.required.lower()
+        self.rules = BoardRules.compile(required, [required, *(c.lower() for c in board.letters.others)])
+        self._build_hint_index()
+
+    def _build_hint_index(self):
+        """Index the unguessed words for O(1) hints and an always-current hint grid.
+
+        `_unguessed` is a list plus a position map so a found word is removed
+        by swapping it with the last element. `_grid` counts words by
+        (first letter, length) and `_two_letter` by their first two letters.
+        """
+        found = self.state.found
+        self._unguessed = sorted({w.text for w in self.state.board.words if w.text not in found})
+        self._positions = {w: i for i, w in enumerate(self._unguessed)}
+        self._grid: Dict[Tuple[str, int], int] = {}
+        self._two_letter: Dict[str, int] = {}
+        for w in self._unguessed:
+            key = (w[:1], len(w))
+            self._grid[key] = self._grid.get(key, 0) + 1
+            self._two_letter[w[:2]] = self._two_letter.get(w[:2], 0) + 1
+
+    def _mark_found(self, text: str):
+        i = self._positions.pop(text, None)
+        if i is None:
+            return
+        last = self._unguessed.pop()
+        if last != text:
+            self._unguessed[i] = last
+            self._positions[last] = i
+        for counts, key in ((self._grid, (text[:1], len(text))), (self._two_letter, text[:2])):
+            if counts[key] == 1:
+                del counts[key]
+            else:
+                counts[key] -= 1
 
     def guess(self, word: str) -> Tuple[bool, str | None, int | None]:
         """Process a guess and return (ok, message, points).
@@ -27,33 +62,51 @@ class Engine:
           - 'contains invalid letter' when guess uses letters outside the board
           - 'not in solution' when guess passes above checks but isn't a valid word
         """
-        text = normalize_text(word)
-        if text in self.state.found:
+        return self._guess_normalized(normalize_text(word))
+
+    def guess_many(self, words: Iterable[str]) -> List[Tuple[bool, str | None, int | None]]:
+        """Process guesses in order, as repeated `guess()` calls would."""
+        state = self.state
+        found = state.found
+        scores = state.board.scores
+        check = self.rules.check
+        out: List[Tuple[bool, str | None, int | None]] = []
+        append = out.append
+        for text in normalize_many(words):
+            if text in found:
+                append((False, "duplicate", None))
+                continue
+            error = check(text)
+            if error is not None:
+                append((False, error, None))
+                continue
+            points = scores.get(text)
+            if points is None:
+                append((False, "not in solution", None))
+                continue
+            found.add(text)
+            state.score += points
+            self._mark_found(text)
+            append((True, "ok", points))
+        return out
+
+    def _guess_normalized(self, text: str) -> Tuple[bool, str | None, int | None]:
+        state = self.state
+        if text in state.found:
             return False, "duplicate", None
 
-        # access board via dataclass attribute
-        board = self.state.board
-
-        # prepare allowed letters set
-        required = board.letters.required.lower()
-        allowed = {required} | {c.lower() for c in board.letters.others}
-
-        # check required letter
-        if required not in text:
-            return False, "missing required letter", None
-
-        # check allowed letters
-        for ch in text:
-            if ch not in allowed:
-                return False, "contains invalid letter", None
+        error = self.rules.check(text)
+        if error is not None:
+            return False, error, None
 
         # finally, check if the word is in the board's valid words
-        if text not in board.scores:
+        points = state.board.scores.get(text)
+        if points is None:
             return False, "not in solution", None
 
-        points = board.scores[text]
-        self.state.found.add(text)
-        self.state.score += points
+        state.found.add(text)
+        state.score += points
+        self._mark_found(text)
         return True, "ok", points
 
     def progress(self):
@@ -68,8 +121,7 @@ class Engine:
         """Get a random unguessed word hint showing first 2 letters and length.
         Returns (hint_string, points_deducted)
         """
-        unguessed = sorted([w.text for w in self.state.board.words if w.text not in self.state.found])
-        if not unguessed:
+        if not self._unguessed:
             return None, 0
         
         # Deduct cost but don't go below 0 total score? 
@@ -79,15 +131,27 @@ class Engine:
             self.state.score -= cost
             deduction = cost
             
-        word = random.choice(unguessed)
+        word = random.choice(self._unguessed)
         return f"Hint: {word[:2]}{'_' * (len(word) - 2)} ({len(word)} letters)", deduction
 
+    def hint_grid(self) -> Dict[str, Any]:
+        """Remaining words by first letter and length, and by first two letters.
+
+        {"grid": {letter: {length: count}}, "two_letter": {prefix: count}},
+        with letters, lengths and prefixes in ascending order.
+        """
+        grid: Dict[str, Dict[int, int]] = {}
+        for (first, length), count in sorted(self._grid.items()):
+            grid.setdefault(first, {})[length] = count
+        return {"grid": grid, "two_letter": dict(sorted(self._two_letter.items()))}
+
     def restore_state(self, data: Dict[str, Any]):
         """Restore game state from a dictionary."""
         if "found" in data:
             self.state.found = set(data["found"])
         if "score" in data:
             self.state.score = int(data["score"])
+        self._build_hint_index()
 
     def get_board_data(self) -> Dict[str, Any]:
         """Get board data in JSON-friendly format."""
@@ -98,7 +162,8 @@ class Engine:
             "total_words": len(board.words),
             "total_points": board.total_points,
             "threshold": board.threshold,
-            "words": {w.text: board.scores[w.text] for w in board.words}
+            "words": {w.text: board.scores[w.text] for w in board.words},
+            "hint_grid": self.hint_grid(),
         }
 
     def dump_board(self) -> str:
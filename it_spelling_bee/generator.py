@@ -1,12 +1,16 @@
+import math
 import random
-from typing import List, Tuple, FrozenSet
+from array import array
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from .lexicon.store import Lexicon
 from .config import Settings
 from .letters import mask_of, LETTER_TO_BIT
-from .typing import Letters, GeneratedBoard, WordEntry
-from .rules import RuleSet, is_valid
-from .scoring import score_word
+from .typing import BoardScores, BoardWords, Letters, GeneratedBoard, WordEntry
+
+if TYPE_CHECKING:
+    from .catalog import BoardCatalog
 
 # Italian letter frequencies (approximate) for weighted sampling
 # Source: standard Italian frequency analysis
@@ -72,75 +76,94 @@ class WeightedLetterSampler:
                 return letters[0], letters[1:]
 
 
-def generate_board(lex: Lexicon, settings: Settings, rng: random.Random) -> GeneratedBoard:
+def board_mask_of(required: str, others) -> int:
+    board_mask = 0
+    for ch in (required, *others):
+        board_mask |= LETTER_TO_BIT[ch]
+    return board_mask
+
+
+def evaluate_board(lex: Lexicon, board_mask: int, required: str, settings: Settings) -> Tuple[Sequence[WordEntry], Mapping[str, int], int]:
+    """Return (valid words, scores by text, total points) for one board.
+
+    Lexicons that address words by id give id views (`BoardWords`,
+    `BoardScores`); a SQLite lexicon gives a list and a dict.
+    """
+    # Words built only from board letters that contain the required letter,
+    # looked up by submask in the lexicon's mask index, with their cached
+    # board-independent base scores; only the pangram bonus is added here
+    found = lex.scored_ids_for_board(board_mask, required, settings)
+    if found is None:
+        valid, bases = lex.scored_words_for_board(board_mask, required, settings)
+        masks = [entry.mask for entry in valid]
+    else:
+        source, ids, masks, bases = found
+
+    bonus = settings.pangram_bonus_points
+    points = array("B")
+    for mask, sc in zip(masks, bases):
+        # Every word's mask is a submask of the board, so it covers the
+        # board (score_word's pangram test) exactly when it equals it
+        if mask == board_mask:
+            sc += bonus
+        if sc > 50:
+            sc = 50
+        points.append(sc)
+    total_points = sum(points)
+    if found is None:
+        return valid, dict(zip((entry.text for entry in valid), points)), total_points
+    return BoardWords(source, ids), BoardScores(source, ids, points), total_points
+
+
+def in_range(count: int, total_points: int, settings: Settings) -> bool:
+    return (settings.min_valid_words <= count <= settings.max_valid_words and
+            settings.min_total_points <= total_points <= settings.max_total_points)
+
+
+def make_board(letters: Letters, valid: Sequence[WordEntry], scores: Mapping[str, int], total_points: int, board_mask: int, settings: Settings) -> GeneratedBoard:
+    threshold = int((total_points * settings.win_fraction) + 0.9999)
+    return GeneratedBoard(
+        letters=letters, 
+        words=valid, 
+        scores=scores, 
+        total_points=total_points, 
+        threshold=threshold, 
+        mask=board_mask
+    )
+
+
+def generate_board(lex: Lexicon, settings: Settings, rng: random.Random, catalog: Optional["BoardCatalog"] = None) -> GeneratedBoard:
+    """Generate a board whose word count and points fall in the Settings ranges.
+
+    With a `catalog` (see `it_spelling_bee.catalog`) the board is picked by a
+    single seeded draw from the precomputed valid letter sets; otherwise
+    letter sets are sampled until one fits.
+    """
+    if catalog is not None and catalog.entries:
+        catalog.check(lex, settings)
+        required, others = catalog.draw(rng)
+        board_mask = board_mask_of(required, others)
+        valid, scores, total_points = evaluate_board(lex, board_mask, required, settings)
+        return make_board(Letters(required=required, others=tuple(others)), valid, scores, total_points, board_mask, settings)
+
     sampler = WeightedLetterSampler(allow_rare=settings.allow_rare_letters)
-    alphabet = frozenset(LETTER_TO_BIT.keys())
-    rules = RuleSet(min_len=settings.min_len, alphabet=alphabet)
     
-    best_board = None
+    best = None
     best_score_diff = float('inf') # To find board closest to target range if we fail
     
-    # Try up to 1000 times to find a valid board
+    # Try up to 1000 times to find a valid board. Candidates are only
+    # counted and scored (board_totals); words and the score map are built
+    # for the board that is returned
     for _ in range(1000):
         required, others = sampler.sample_set(rng)
         letters = Letters(required=required, others=tuple(others))
+        board_mask = board_mask_of(required, others)
+        count, total_points = board_totals(lex, board_mask, required, settings)
         
-        board_mask = 0
-        for ch in (required, *others):
-            board_mask |= LETTER_TO_BIT[ch]
-            
-        # 1. Get candidates containing required letter
-        # This is now cached in memory by Lexicon
-        candidates = list(lex.iter_by_required(required))
-        
-        valid = []
-        scores = {}
-        total_points = 0
-        
-        # 2. Filter candidates
-        for entry in candidates:
-            # Fast bitmask check: word must use ONLY board letters
-            if (entry.mask | board_mask) == board_mask:
-                # Detailed check (length, etc)
-                # We create a temp board just for the signature, or pass mask directly if we optimized is_valid
-                # is_valid signature: (entry, board, rules, required)
-                # We can construct a lightweight object or just trust the mask check + length check
-                if len(entry.text) < settings.min_len:
-                    continue
-                    
-                # Double check invalid chars not in mask (already covered by mask check usually)
-                # but let's use the official is_valid to be safe and consistent
-                # We need a dummy board object or change is_valid. 
-                # Let's make a minimal dummy board to satisfy type checker if needed, 
-                # but actually we can just compute score.
-                
-                # Optimization: We know it has required letter (from iter_by_required)
-                # We know it uses only board letters (from mask check)
-                # We checked min_len.
-                # So it is valid.
-                
-                # Calculate score
-                # score_word needs entry, board_mask, settings
-                sc = score_word(entry, board_mask, settings)
-                valid.append(entry)
-                scores[entry.text] = sc
-                total_points += sc
-        
-        count = len(valid)
-        
-        # 3. Check constraints
-        if (settings.min_valid_words <= count <= settings.max_valid_words and 
-            settings.min_total_points <= total_points <= settings.max_total_points):
-            
-            threshold = int((total_points * settings.win_fraction) + 0.9999)
-            return GeneratedBoard(
-                letters=letters, 
-                words=valid, 
-                scores=scores, 
-                total_points=total_points, 
-                threshold=threshold, 
-                mask=board_mask
-            )
+        # Check constraints
+        if in_range(count, total_points, settings):
+            valid, scores, total_points = evaluate_board(lex, board_mask, required, settings)
+            return make_board(letters, valid, scores, total_points, board_mask, settings)
             
         # Track best failure just in case
         # We prefer boards that have ENOUGH words/points over those with too few
@@ -152,19 +175,13 @@ def generate_board(lex: Lexicon, settings: Settings, rng: random.Random) -> Gene
             
             if diff < best_score_diff:
                 best_score_diff = diff
-                threshold = int((total_points * settings.win_fraction) + 0.9999)
-                best_board = GeneratedBoard(
-                    letters=letters, 
-                    words=valid, 
-                    scores=scores, 
-                    total_points=total_points, 
-                    threshold=threshold, 
-                    mask=board_mask
-                )
+                best = (letters, board_mask)
 
     # If we failed to find a perfect board, return the best one we found
-    if best_board:
-        return best_board
+    if best:
+        letters, board_mask = best
+        valid, scores, total_points = evaluate_board(lex, board_mask, letters.required, settings)
+        return make_board(letters, valid, scores, total_points, board_mask, settings)
         
     # Should be very rare to find NOTHING, but handle it
     return GeneratedBoard(
@@ -175,3 +192,189 @@ def generate_board(lex: Lexicon, settings: Settings, rng: random.Random) -> Gene
         threshold=0, 
         mask=board_mask
     )
+
+
+def board_totals(lex: Lexicon, board_mask: int, required: str, settings: Settings) -> Tuple[int, int]:
+    """(word count, total points) of a board, without building its words or score map."""
+    count = total = 0
+    for mask, bases in lex.board_bases(board_mask, required, settings):
+        bonus = settings.pangram_bonus_points if mask == board_mask else 0
+        count += len(bases)
+        for sc in bases:
+            sc += bonus
+            total += sc if sc < 50 else 50
+    return count, total
+
+
+def range_distance(count: int, total_points: int, settings: Settings) -> float:
+    """How far a board is outside the Settings ranges; 0.0 when `in_range`.
+
+    Each shortfall or excess is taken relative to the lower bound, so word
+    count and points weigh about the same.
+    """
+    def outside(value, low, high):
+        if value < low:
+            return (low - value) / max(1, low)
+        if value > high:
+            return (value - high) / max(1, low)
+        return 0.0
+    return (outside(count, settings.min_valid_words, settings.max_valid_words) +
+            outside(total_points, settings.min_total_points, settings.max_total_points))
+
+
+# Moves tried per local-search step before giving up on the current board
+STEP_CANDIDATES = 2
+
+
+def search_board(lex: Lexicon, settings: Settings, rng: random.Random, max_evaluations: int = 1000) -> Tuple[GeneratedBoard, int]:
+    """Generate a board by local search; return (board, boards evaluated).
+
+    Starting from a sampled letter set, each step looks at the neighbours
+    that swap one outer letter for an unused one or make another board
+    letter the required one, and moves to the first that gets closer to the
+    Settings ranges (`range_distance`). Neighbours are tried in order of how
+    close a simple model puts them to the target: log(word count) is taken
+    as linear in log(words containing each letter), with the two slopes
+    (outer and required letters) fitted to the boards evaluated so far.
+    When the first STEP_CANDIDATES neighbours bring no improvement the
+    search restarts from a new sample. Results depend only on `rng`.
+
+    Returns the first in-range board, or the closest one seen once
+    `max_evaluations` boards have been evaluated.
+    """
+    if max_evaluations < 1:
+        raise ValueError(f"max_evaluations must be at least 1, got {max_evaluations}")
+    sampler = WeightedLetterSampler(allow_rare=settings.allow_rare_letters)
+    alphabet = sorted(ch for ch in sampler.population if sampler.weights[ch] > 0)
+    weight = {ch: math.log(n + 1) for ch, n in lex.letter_counts().items()}
+    seen: Dict[Tuple[int, str], Tuple[int, int]] = {}
+    target_words = math.log((settings.min_valid_words + settings.max_valid_words) / 2 + 1)
+    target_points = math.log((settings.min_total_points + settings.max_total_points) / 2 + 1)
+
+    # Least-squares fit through the origin of
+    #   d log(count) = slope_outer * d outer weight + slope_required * d required weight
+    # over the moves evaluated so far, starting from a weak prior
+    sums = {"oo": 1.0, "or": 0.0, "rr": 1.0, "oy": 0.5, "ry": 0.5}
+
+    def slopes() -> Tuple[float, float]:
+        det = sums["oo"] * sums["rr"] - sums["or"] ** 2
+        return ((sums["oy"] * sums["rr"] - sums["ry"] * sums["or"]) / det,
+                (sums["ry"] * sums["oo"] - sums["oy"] * sums["or"]) / det)
+
+    def evaluate(required: str, others: List[str]) -> Tuple[int, int]:
+        key = (board_mask_of(required, others), required)
+        if key not in seen:
+            seen[key] = board_totals(lex, key[0], required, settings)
+        return seen[key]
+
+    def balanced(letters: Iterable[str]) -> bool:
+        vowels = sum(1 for c in letters if c in VOWELS)
+        return vowels >= 2 and 7 - vowels >= 3
+
+    best = None
+    best_distance = float("inf")
+    while len(seen) < max_evaluations:
+        required, others = sampler.sample_set(rng)
+        count, points = evaluate(required, others)
+        distance = range_distance(count, points, settings)
+        while distance > 0 and len(seen) < max_evaluations:
+            if distance < best_distance:
+                best, best_distance = (required, list(others)), distance
+            # Wanted change in log(count): towards the word range, or, with the
+            # count already in range, whatever moves points into theirs
+            if not settings.min_valid_words <= count <= settings.max_valid_words:
+                wanted = target_words - math.log(count + 1)
+            else:
+                wanted = target_points - math.log(points + 1)
+            slope_outer, slope_required = slopes()
+
+            board = [required, *others]
+            moves = []
+            for i, old in enumerate(others):
+                for new in alphabet:
+                    if new not in board:
+                        new_others = others[:i] + [new] + others[i + 1:]
+                        if balanced([required, *new_others]):
+                            moves.append((weight[new] - weight[old], 0.0, required, new_others))
+                new_others = others[:i] + [required] + others[i + 1:]
+                moves.append((weight[required] - weight[old], weight[old] - weight[required], old, new_others))
+            # Shuffle first so ties are broken by the seed, then sort by predicted miss
+            rng.shuffle(moves)
+            moves.sort(key=lambda m: abs(slope_outer * m[0] + slope_required * m[1] - wanted))
+
+            step = None
+            for d_outer, d_required, new_required, new_others in moves[:STEP_CANDIDATES]:
+                if len(seen) >= max_evaluations:
+                    break
+                new_count, new_points = evaluate(new_required, new_others)
+                dy = math.log(new_count + 1) - math.log(count + 1)
+                sums["oo"] += d_outer * d_outer
+                sums["or"] += d_outer * d_required
+                sums["rr"] += d_required * d_required
+                sums["oy"] += d_outer * dy
+                sums["ry"] += d_required * dy
+                new_distance = range_distance(new_count, new_points, settings)
+                if new_distance < distance:
+                    step = (new_required, new_others, new_count, new_points, new_distance)
+                    break
+            if step is None:
+                break  # no nearby improvement: restart
+            required, others, count, points, distance = step
+        if distance == 0:
+            best, best_distance = (required, list(others)), 0.0
+            break
+        if distance < best_distance:
+            best, best_distance = (required, list(others)), distance
+
+    required, others = best
+    letters = Letters(required=required, others=tuple(others))
+    board_mask = board_mask_of(required, others)
+    valid, scores, total_points = evaluate_board(lex, board_mask, required, settings)
+    return make_board(letters, valid, scores, total_points, board_mask, settings), len(seen)
+
+
+# Lexicon (and board catalog, if any) set up once per worker process by _init_worker
+_worker_lex: Optional[Lexicon] = None
+_worker_catalog: Optional["BoardCatalog"] = None
+
+
+def _init_worker(db_path, catalog: Optional["BoardCatalog"] = None):
+    global _worker_lex, _worker_catalog
+    _worker_lex = Lexicon(db_path)
+    _worker_catalog = catalog
+
+
+def _generate_one(lex: Lexicon, settings: Settings, seed: int, search: bool, catalog: Optional["BoardCatalog"] = None) -> GeneratedBoard:
+    if search:
+        return search_board(lex, settings, random.Random(seed))[0]
+    return generate_board(lex, settings, random.Random(seed), catalog)
+
+
+def _generate_seed(seed: int, settings: Settings, search: bool = False) -> GeneratedBoard:
+    return _generate_one(_worker_lex, settings, seed, search, _worker_catalog)
+
+
+def generate_boards(lex: Lexicon, settings: Settings, seeds: Iterable[int], workers: int = 1, search: bool = False,
+                    catalog: Optional["BoardCatalog"] = None) -> Iterator[Tuple[int, GeneratedBoard]]:
+    """Generate one board per seed, yielding (seed, board) in seed order.
+
+    Each board is exactly what `generate_board(lex, settings, random.Random(seed), catalog)`
+    (or `search_board` with `search=True`) returns, whatever the number of workers. With workers > 1 the seeds are
+    spread over a process pool; each worker opens the lexicon from
+    `lex.db_path` once, so the lexicon must be file-backed.
+    """
+    seeds = list(seeds)
+    if workers <= 1 or len(seeds) <= 1:
+        for seed in seeds:
+            yield seed, _generate_one(lex, settings, seed, search, catalog)
+        return
+
+    db_path = getattr(lex, "db_path", None)
+    if db_path is None or not db_path.exists():
+        raise ValueError("parallel board generation needs a file-backed lexicon")
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(seeds) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(db_path, catalog)) as pool:
+        # map() yields results in submission order while workers run ahead
+        yield from zip(seeds, pool.map(partial(_generate_seed, settings=settings, search=search), seeds, chunksize=chunksize))
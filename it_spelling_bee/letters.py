@@ -1,4 +1,4 @@
-from typing import Iterable, Tuple
+from typing import Iterable, Iterator, List, Tuple
 import random
 import unicodedata
 
@@ -6,23 +6,74 @@ ALPHABET = "abcdefghijklmnopqrstuvwxyz"
 LETTER_TO_BIT = {ch: 1 << (ord(ch) - ord('a')) for ch in ALPHABET}
 
 
-def normalize_text(s: str) -> str:
+def _normalize_slow(s: str) -> str:
     s = s.lower()
     s = unicodedata.normalize("NFD", s)
     s = "".join(c for c in s if unicodedata.category(c) != "Mn")
     return s
 
 
+# Precomposed Latin letters (accented Italian vowels and the like) that
+# _normalize_slow folds to ASCII, mapped to that ASCII text. Each is a single
+# base character, so folding them one at a time gives the same result as
+# normalising the whole string.
+_FOLD = {}
+for _cp in range(0x80, 0x250):
+    _folded = _normalize_slow(chr(_cp))
+    if _folded.isascii():
+        _FOLD[_cp] = _folded
+del _cp, _folded
+
+
+def normalize_text(s: str) -> str:
+    """Lowercase `s` and strip combining marks (accents)."""
+    if s.isascii():
+        return s.lower()
+    folded = s.translate(_FOLD)
+    if folded.isascii():
+        return folded.lower()
+    return _normalize_slow(s)
+
+
+def normalize_many(texts: Iterable[str]) -> List[str]:
+    """normalize_text() over many strings; all-ASCII batches are lowercased in one call."""
+    texts = list(texts)
+    if not texts:
+        return []
+    joined = "\n".join(texts)
+    if joined.isascii() and joined.count("\n") == len(texts) - 1:
+        return joined.lower().split("\n")
+    return [normalize_text(t) for t in texts]
+
+
+def _mask_of_normalized(text: str) -> int:
+    m = 0
+    for ch in set(text):
+        m |= LETTER_TO_BIT.get(ch, 0)
+    return m
+
+
 def mask_of(text: str) -> int:
     """Convert text to a bitmask where each letter sets its corresponding bit.
     Only counts each letter once and normalizes text first."""
-    text = normalize_text(text)
-    # Only use the first occurrence of each letter, sorted for consistency
-    unique_letters = sorted(set(text))
+    return _mask_of_normalized(normalize_text(text))
+
+
+def masks_of_many(texts: Iterable[str], normalized: bool = False) -> List[int]:
+    """mask_of() over many strings; pass `normalized=True` for the output of normalize_many()."""
+    return [_mask_of_normalized(t) for t in (texts if normalized else normalize_many(texts))]
+
+
+# Set by strict_mask_of() for any character outside a-z; no board allows it
+NON_LETTER_BIT = 1 << 26
+
+
+def strict_mask_of(text: str) -> int:
+    """Letter mask of already-normalised `text`, plus NON_LETTER_BIT if it has other characters."""
     m = 0
-    for ch in unique_letters:
-        if ch in LETTER_TO_BIT:
-            m |= LETTER_TO_BIT[ch]
+    get = LETTER_TO_BIT.get
+    for ch in set(text):
+        m |= get(ch, NON_LETTER_BIT)
     return m
 
 
@@ -30,6 +81,17 @@ def uses_only(word_mask: int, board_mask: int) -> bool:
     return (word_mask & ~board_mask) == 0
 
 
+def submasks_with(board_mask: int, required_bit: int) -> Iterator[int]:
+    """Yield every submask of `board_mask` that contains `required_bit`."""
+    rest = board_mask & ~required_bit
+    sub = rest
+    while True:
+        yield sub | required_bit
+        if sub == 0:
+            return
+        sub = (sub - 1) & rest
+
+
 def mask_includes(mask: int, letter: str) -> bool:
     letter = letter.lower()
     return bool(mask & LETTER_TO_BIT.get(letter, 0))
@@ -0,0 +1,179 @@
+"""Compact memory-mapped lexicon format.
+
+The file is used in place through `mmap`: opening it parses nothing beyond a
+fixed-size header, and every process that opens the same file shares its
+pages through the OS page cache.
+
+Layout (little-endian, sections 4-byte aligned):
+
+    header      magic, version, word count, group count, blob size, flags
+    offsets     uint32[n_words + 1]  start of each word in the blob
+    masks       uint32[n_words]      letter mask of each word
+    zipf        uint16[n_words]      zipf * 100, rounded
+                (float64[n_words], 8-byte aligned, with FLAG_EXACT_ZIPF)
+    group_masks uint32[n_groups]     distinct masks, ascending
+    group_start uint32[n_groups + 1] first word of each group
+    blob        UTF-8 text of every word, back to back
+
+Words are sorted by (mask, text) so each mask group is a contiguous run.
+wordfreq reports zipf to two decimals, so the x100 quantisation is lossless
+for lexicons built by `lexicon/build.py`. Files written with
+`exact_zipf=True` (the warm-start snapshots) keep arbitrary zipf values.
+
+Usage:
+    python -m it_spelling_bee.lexicon.binary SRC OUT
+"""
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+
+from ..typing import WordEntry
+
+MAGIC = b"ITBLEX\x00\x01"
+VERSION = 1
+ZIPF_SCALE = 100
+FLAG_EXACT_ZIPF = 1
+_HEADER = struct.Struct("<8sIIIII")
+_HEADER_SIZE = 32
+
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _to_le(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_binary(path: Path, entries: Iterable[WordEntry], exact_zipf: bool = False):
+    """Write `entries` to `path` in the binary format, replacing it atomically."""
+    rows = sorted((e.mask, e.text, e.zipf) for e in entries)
+
+    offsets = array("I", [0])
+    masks = array("I")
+    zipf = array("d" if exact_zipf else "H")
+    group_masks = array("I")
+    group_start = array("I")
+    blob = bytearray()
+    for i, (mask, text, z) in enumerate(rows):
+        if not group_masks or group_masks[-1] != mask:
+            group_masks.append(mask)
+            group_start.append(i)
+        blob += text.encode("utf8")
+        offsets.append(len(blob))
+        masks.append(mask)
+        if exact_zipf:
+            zipf.append(float(z))
+        else:
+            zipf.append(max(0, min(0xFFFF, round(float(z) * ZIPF_SCALE))))
+    group_start.append(len(rows))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as fh:
+        flags = FLAG_EXACT_ZIPF if exact_zipf else 0
+        header = _HEADER.pack(MAGIC, VERSION, len(rows), len(group_masks), len(blob), flags)
+        fh.write(header.ljust(_HEADER_SIZE, b"\0"))
+        pos = _HEADER_SIZE
+        for section in (offsets, masks, zipf, group_masks, group_start):
+            data = _to_le(section)
+            if section.typecode == "d" and pos % 8:
+                fh.write(b"\0" * (_pad8(pos) - pos))
+                pos = _pad8(pos)
+            fh.write(data.ljust(_pad4(len(data)), b"\0"))
+            pos += _pad4(len(data))
+        fh.write(bytes(blob))
+    tmp.replace(path)
+
+
+class BinaryLexicon:
+    """Read-only view over a binary lexicon file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_words, n_groups, blob_len, flags = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a binary lexicon (version {VERSION})")
+        self.n_words = n_words
+        self.n_groups = n_groups
+
+        view = memoryview(self._mmap)
+        pos = _HEADER_SIZE
+
+        def section(count: int, fmt: str, size: int):
+            nonlocal pos
+            if size == 8:
+                pos = _pad8(pos)
+            sec = view[pos:pos + count * size].cast(fmt)
+            pos += _pad4(count * size)
+            if sys.byteorder != "little":
+                swapped = array(fmt, sec)
+                swapped.byteswap()
+                return swapped
+            return sec
+
+        self.offsets = section(n_words + 1, "I", 4)
+        self.masks = section(n_words, "I", 4)
+        self.exact_zipf = bool(flags & FLAG_EXACT_ZIPF)
+        self.zipf = section(n_words, "d", 8) if self.exact_zipf else section(n_words, "H", 2)
+        self.group_masks = section(n_groups, "I", 4)
+        self.group_start = section(n_groups + 1, "I", 4)
+        self._blob = view[pos:pos + blob_len]
+
+    def __len__(self) -> int:
+        return self.n_words
+
+    def text(self, i: int) -> str:
+        return str(self._blob[self.offsets[i]:self.offsets[i + 1]], "utf8")
+
+    def entry(self, i: int) -> WordEntry:
+        zipf = self.zipf[i] if self.exact_zipf else self.zipf[i] / ZIPF_SCALE
+        return WordEntry(text=self.text(i), zipf=zipf, mask=self.masks[i])
+
+    def iter_entries(self) -> Iterator[WordEntry]:
+        for i in range(self.n_words):
+            yield self.entry(i)
+
+    def group_range(self, mask: int) -> Tuple[int, int]:
+        """Word index range [start, end) of the words whose mask is exactly `mask`."""
+        g = bisect_left(self.group_masks, mask)
+        if g == self.n_groups or self.group_masks[g] != mask:
+            return 0, 0
+        return self.group_start[g], self.group_start[g + 1]
+
+    def iter_with_bit(self, bit: int) -> Iterator[WordEntry]:
+        for g in range(self.n_groups):
+            if self.group_masks[g] & bit:
+                for i in range(self.group_start[g], self.group_start[g + 1]):
+                    yield self.entry(i)
+
+
+def main(argv=None):
+    from .store import Lexicon
+
+    parser = argparse.ArgumentParser(description="Convert a lexicon (.sqlite or .jsonl) to the binary format")
+    parser.add_argument("src", type=Path)
+    parser.add_argument("out", type=Path)
+    args = parser.parse_args(argv)
+
+    lex = Lexicon(args.src)
+    write_binary(args.out, lex.iter_all())
+    print(f"Wrote {len(BinaryLexicon(args.out))} entries to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
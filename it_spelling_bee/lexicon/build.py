@@ -3,6 +3,14 @@
 Usage:
     python -m it_spelling_bee.lexicon.build --out /path/to/lexicon.sqlite --limit 200000
 
+Next to the SQLite file a memory-mapped binary copy (`lexicon.bin`, see
+`lexicon/binary.py`) is written, which `Lexicon` prefers at startup.
+
+With `--incremental`, an existing database built from the same dictionary,
+wordfreq version, limit and min_len is updated in place: only the words
+added to or removed from the whitelist/blacklist since the last build are
+re-evaluated. Any other change falls back to a full rebuild.
+
 This script requires the `wordfreq` package.
 """
 import argparse
@@ -13,9 +21,11 @@ from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
 import sys
-from typing import Optional, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from ..letters import normalize_text, mask_of
+from ..letters import masks_of_many, normalize_many
+from ..typing import WordEntry
+from .binary import write_binary
 
 
 def _sha256_of_file(path: Path) -> str:
@@ -28,45 +38,221 @@ def _sha256_of_file(path: Path) -> str:
     return h.hexdigest()
 
 
-def _parse_dic(path: Path, min_len: int = 2) -> Set[str]:
-    s: Set[str] = set()
-    if not path or not path.exists():
-        return s
-    with path.open(encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
+# Files smaller than this are parsed in-process; a pool costs more than it saves
+PARALLEL_MIN_BYTES = 1 << 20
+# Chunks per worker, so uneven chunks still keep every worker busy
+CHUNKS_PER_WORKER = 4
+
+
+def _parse_chunk(path: Path, start: int, end: int, min_len: int, dic: bool) -> Set[str]:
+    """Parse bytes [start, end) of a word file; both ends lie on line boundaries."""
+    with path.open("rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    # Same result as reading in text mode: a multi-byte UTF-8 sequence never
+    # contains b"\n", so no character straddles a chunk boundary, and
+    # \r\n, \r and \n all end a line (universal newlines)
+    text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    tokens: List[str] = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if dic:
             # split on first / (flags) and take left side
-            tok = line.split("/", 1)[0]
-            text = normalize_text(tok)
-            if not text.isalpha():
-                continue
-            if len(text) < min_len:
+            line = line.split("/", 1)[0]
+        tokens.append(line)
+    return {t for t in normalize_many(tokens) if t.isalpha() and len(t) >= min_len}
+
+
+def _chunk_ranges(path: Path, n_chunks: int) -> List[Tuple[int, int]]:
+    """Split a file into about `n_chunks` byte ranges that end just after a newline."""
+    size = path.stat().st_size
+    bounds = [0]
+    with path.open("rb") as fh:
+        for i in range(1, n_chunks):
+            pos = size * i // n_chunks
+            if pos <= bounds[-1]:
                 continue
-            s.add(text)
-    return s
+            fh.seek(pos - 1)
+            fh.readline()  # finish the line that byte pos-1 belongs to
+            pos = fh.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
 
 
-def _parse_list(path: Optional[Path], min_len: int = 2) -> Set[str]:
-    s: Set[str] = set()
+def _parse_word_file(path: Optional[Path], min_len: int, dic: bool, workers: Optional[int]) -> Set[str]:
     if path is None or not path.exists():
-        return s
-    with path.open(encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            text = normalize_text(line)
-            if not text.isalpha():
-                continue
-            if len(text) < min_len:
-                continue
-            s.add(text)
+        return set()
+    workers = workers or os.cpu_count() or 1
+    size = path.stat().st_size
+    if workers <= 1 or size < PARALLEL_MIN_BYTES:
+        return _parse_chunk(path, 0, size, min_len, dic)
+    from concurrent.futures import ProcessPoolExecutor
+
+    ranges = _chunk_ranges(path, workers * CHUNKS_PER_WORKER)
+    s: Set[str] = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_parse_chunk, path, start, end, min_len, dic) for start, end in ranges]
+        for fut in futures:
+            s |= fut.result()
     return s
 
 
-def build(out_path: Path, dict_path: Optional[Path], whitelist_path: Optional[Path], blacklist_path: Optional[Path], limit: int = 200000, min_len: int = 2):
+def _parse_dic(path: Path, min_len: int = 2, workers: Optional[int] = None) -> Set[str]:
+    """Words of a Hunspell .dic file, normalised, parsed in parallel chunks."""
+    return _parse_word_file(path, min_len, True, workers)
+
+
+def _parse_list(path: Optional[Path], min_len: int = 2, workers: Optional[int] = None) -> Set[str]:
+    """Words of a one-word-per-line list file, normalised."""
+    return _parse_word_file(path, min_len, False, workers)
+
+
+# Whitelist/blacklist words of the last build and whether the dictionary had them
+CREATE_OVERRIDES = "CREATE TABLE overrides(clean_form TEXT PRIMARY KEY, whitelisted INTEGER, blacklisted INTEGER, in_dict INTEGER)"
+INSERT_OVERRIDES = "INSERT INTO overrides(clean_form, whitelisted, blacklisted, in_dict) VALUES (?, ?, ?, ?)"
+
+# Meta keys that must match for an incremental build; anything else forces a full one
+FULL_REBUILD_KEYS = ("dict_sha256", "wordfreq_version", "wordfreq_limit", "min_len")
+
+
+def _write_db(out_path: Path, rows: Iterable[Tuple[str, float, int, str]], meta: List[Tuple[str, str]], overrides: Iterable[Tuple[str, int, int, int]] = ()):
+    """Write a complete lexicon database to a temporary file, then swap it in.
+
+    The file is built in one transaction with durability turned off (a
+    crash only loses the temporary file), indexes are created after the
+    rows are loaded, and os.replace() makes the finished file visible
+    atomically, so readers never see a half-built lexicon.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(tmp_path), isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA cache_size = -65536")  # 64 MiB
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("BEGIN")
+        # schema with source and meta for provenance
+        conn.execute("CREATE TABLE words(clean_form TEXT PRIMARY KEY, zipf REAL, mask INTEGER, source TEXT)")
+        conn.execute("CREATE TABLE meta(key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT OR REPLACE INTO words(clean_form, zipf, mask, source) VALUES (?, ?, ?, ?)", rows)
+        conn.execute("CREATE INDEX idx_mask ON words(mask)")
+        conn.execute("CREATE INDEX idx_zipf ON words(zipf)")
+        conn.executemany("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", meta)
+        conn.execute(CREATE_OVERRIDES)
+        conn.executemany(INSERT_OVERRIDES, overrides)
+        conn.execute("COMMIT")
+        conn.close()
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _read_meta(path: Path) -> Optional[Dict[str, str]]:
+    """Meta of an existing lexicon database, or None if it cannot be updated incrementally."""
+    if not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(path.resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            conn.execute("SELECT 1 FROM overrides LIMIT 1")
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # Missing file contents, or built before the overrides table existed
+        return None
+    return meta
+
+
+def _apply_list_diff(out_path: Path, whitelist: Set[str], blacklist: Set[str], toks: Iterable[str], zipf_frequency, meta: List[Tuple[str, str]]) -> Dict[str, int]:
+    """Update an existing database for a new whitelist/blacklist in one transaction.
+
+    Only words whose whitelist/blacklist membership changed are looked at;
+    each gets the row a full build would give it now (zipf and mask
+    recomputed), or loses its row.
+    """
+    counts = {"changed_words": 0, "rows_inserted": 0, "rows_updated": 0, "rows_deleted": 0}
+    conn = sqlite3.connect(str(out_path), isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        old = {w: (bool(wl), bool(bl), bool(d)) for w, wl, bl, d in conn.execute("SELECT clean_form, whitelisted, blacklisted, in_dict FROM overrides")}
+        changed = sorted(
+            w for w in set(old) | whitelist | blacklist
+            if (w in whitelist, w in blacklist) != old.get(w, (False, False, False))[:2]
+        )
+        counts["changed_words"] = len(changed)
+
+        existing: Dict[str, str] = {}
+        for start in range(0, len(changed), 500):
+            chunk = changed[start:start + 500]
+            query = "SELECT clean_form, source FROM words WHERE clean_form IN ({})".format(",".join("?" * len(chunk)))
+            existing.update(conn.execute(query, chunk))
+
+        def in_dict(w: str) -> bool:
+            # Words outside the old lists have a row exactly when the dictionary has them
+            return old[w][2] if w in old else existing.get(w) == "dictionary"
+
+        # The token a full build would take each word's zipf from (the last one)
+        last_tok: Dict[str, str] = {}
+        if changed:
+            wanted = set(changed)
+            toks = list(toks)
+            for tok, norm in zip(toks, normalize_many(toks)):
+                if norm in wanted:
+                    last_tok[norm] = tok
+
+        masks = dict(zip(changed, masks_of_many(changed, normalized=True)))
+        for w in changed:
+            source = None
+            if w in last_tok and w not in blacklist:
+                if w in whitelist:
+                    source = "whitelist"
+                elif in_dict(w):
+                    source = "dictionary"
+            if source is None:
+                if w in existing:
+                    conn.execute("DELETE FROM words WHERE clean_form = ?", (w,))
+                    counts["rows_deleted"] += 1
+                continue
+            try:
+                zipf = zipf_frequency(last_tok[w], "it")
+            except Exception:
+                zipf = 0.0
+            conn.execute("INSERT OR REPLACE INTO words(clean_form, zipf, mask, source) VALUES (?, ?, ?, ?)", (w, zipf, masks[w], source))
+            counts["rows_updated" if w in existing else "rows_inserted"] += 1
+
+        listed = whitelist | blacklist
+        conn.execute("DELETE FROM overrides")
+        conn.executemany(INSERT_OVERRIDES, ((w, int(w in whitelist), int(w in blacklist), int(in_dict(w))) for w in sorted(listed)))
+        conn.executemany("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", meta)
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return counts
+
+
+def _write_binary_from_db(binary_path: Path, db_path: Path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute("SELECT clean_form, zipf, mask FROM words").fetchall()
+    finally:
+        conn.close()
+    write_binary(binary_path, (WordEntry(text=t, zipf=z, mask=m) for t, z, m in rows))
+
+
+def build(out_path: Path, dict_path: Optional[Path], whitelist_path: Optional[Path], blacklist_path: Optional[Path], limit: int = 200000, min_len: int = 2, binary_path: Optional[Path] = None, incremental: bool = False, workers: Optional[int] = None):
     try:
         from wordfreq import top_n_list, zipf_frequency
     except Exception:
@@ -88,18 +274,46 @@ def build(out_path: Path, dict_path: Optional[Path], whitelist_path: Optional[Pa
     if dict_path is None:
         raise ValueError("--dict PATH is required (or set ITBEE_DICT environment variable)")
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(out_path))
-    cur = conn.cursor()
-    # schema with source and meta for provenance
-    cur.execute("DROP TABLE IF EXISTS words")
-    cur.execute("CREATE TABLE words(clean_form TEXT PRIMARY KEY, zipf REAL, mask INTEGER, source TEXT)")
-    cur.execute("CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT)")
-
-    # load authoritative dictionary and lists
-    dict_set = _parse_dic(dict_path, min_len=min_len)
-    whitelist = _parse_list(whitelist_path, min_len=min_len)
-    blacklist = _parse_list(blacklist_path, min_len=min_len)
+    whitelist = _parse_list(whitelist_path, min_len=min_len, workers=workers)
+    blacklist = _parse_list(blacklist_path, min_len=min_len, workers=workers)
+    meta = [
+        ("dict_path", str(dict_path)),
+        ("dict_sha256", _sha256_of_file(dict_path)),
+        ("whitelist_path", str(whitelist_path) if whitelist_path else ""),
+        ("whitelist_sha256", _sha256_of_file(whitelist_path) if whitelist_path else ""),
+        ("blacklist_path", str(blacklist_path) if blacklist_path else ""),
+        ("blacklist_sha256", _sha256_of_file(blacklist_path) if blacklist_path else ""),
+        ("wordfreq_limit", str(limit)),
+        ("wordfreq_version", str(wordfreq_version)),
+        ("min_len", str(min_len)),
+        ("build_ts_utc", datetime.now(timezone.utc).isoformat()),
+    ]
+
+    if incremental:
+        previous = _read_meta(out_path)
+        current = dict(meta)
+        if previous is None:
+            print(f"No incrementally updatable lexicon at {out_path}; doing a full build")
+        elif any(previous.get(k) != current[k] for k in FULL_REBUILD_KEYS):
+            changed = [k for k in FULL_REBUILD_KEYS if previous.get(k) != current[k]]
+            print(f"{', '.join(changed)} changed; doing a full build")
+        elif all(previous.get(k) == current[k] for k in ("whitelist_sha256", "blacklist_sha256")):
+            print(f"{out_path} is up to date")
+            if binary_path is not None and not binary_path.exists():
+                _write_binary_from_db(binary_path, out_path)
+            return
+        else:
+            counts = _apply_list_diff(out_path, whitelist, blacklist, top_n_list("it", limit), zipf_frequency, meta)
+            if binary_path is not None:
+                _write_binary_from_db(binary_path, out_path)
+            print("Incremental build summary:")
+            for k, v in counts.items():
+                print(f"  {k}: {v}")
+            print(f"Updated {out_path}")
+            return
+
+    # load authoritative dictionary
+    dict_set = _parse_dic(dict_path, min_len=min_len, workers=workers)
 
     toks = top_n_list("it", limit)
 
@@ -114,9 +328,11 @@ def build(out_path: Path, dict_path: Optional[Path], whitelist_path: Optional[Pa
         "rows_written": 0,
     }
 
-    for tok in toks:
+    # Stage rows in memory; a later token with the same normalised form
+    # replaces the earlier one, as INSERT OR REPLACE did
+    staged: Dict[str, Tuple[float, str]] = {}
+    for tok, norm in zip(toks, normalize_many(toks)):
         counts["tokens_examined"] += 1
-        norm = normalize_text(tok)
         if not norm.isalpha():
             continue
         if len(norm) < min_len:
@@ -136,42 +352,27 @@ def build(out_path: Path, dict_path: Optional[Path], whitelist_path: Optional[Pa
         else:
             continue
 
-        # compute zipf and mask and insert
         try:
             zipf = zipf_frequency(tok, "it")
         except Exception:
             zipf = 0.0
-        mask = mask_of(norm)
-        try:
-            cur.execute("INSERT OR REPLACE INTO words(clean_form, zipf, mask, source) VALUES (?, ?, ?, ?)", (norm, zipf, mask, source))
-            counts["rows_written"] += 1
-        except Exception:
-            continue
+        staged[norm] = (zipf, source)
+    counts["rows_written"] = len(staged)
+    # Masks for the whole batch at once, from the already normalised forms
+    rows = [(norm, z, m, src) for (norm, (z, src)), m in zip(staged.items(), masks_of_many(staged, normalized=True))]
 
-    # indices
-    conn.commit()
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_mask ON words(mask)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_zipf ON words(zipf)")
-
-    # write provenance
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("dict_path", str(dict_path)))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("dict_sha256", _sha256_of_file(dict_path)))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("whitelist_path", str(whitelist_path) if whitelist_path else ""))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("whitelist_sha256", _sha256_of_file(whitelist_path) if whitelist_path else ""))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("blacklist_path", str(blacklist_path) if blacklist_path else ""))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("blacklist_sha256", _sha256_of_file(blacklist_path) if blacklist_path else ""))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("wordfreq_limit", str(limit)))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("wordfreq_version", str(wordfreq_version)))
-    cur.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", ("build_ts_utc", datetime.now(timezone.utc).isoformat()))
-
-    conn.commit()
-    conn.close()
+    overrides = ((w, int(w in whitelist), int(w in blacklist), int(w in dict_set)) for w in sorted(whitelist | blacklist))
+    _write_db(out_path, rows, meta, overrides)
+    if binary_path is not None:
+        write_binary(binary_path, (WordEntry(text=norm, zipf=z, mask=m) for norm, z, m, _ in rows))
 
     # logging
     print("Build summary:")
     for k, v in counts.items():
         print(f"  {k}: {v}")
     print(f"Wrote {counts['rows_written']} entries to {out_path}")
+    if binary_path is not None:
+        print(f"Wrote binary lexicon to {binary_path}")
 
 
 def main(argv=None):
@@ -181,13 +382,22 @@ def main(argv=None):
     parser.add_argument("--dict", type=Path, default=None, help="Path to Hunspell .dic file (or set ITBEE_DICT env var)")
     parser.add_argument("--whitelist", type=Path, default=None, help="Optional whitelist file (one word per line)")
     parser.add_argument("--blacklist", type=Path, default=None, help="Optional blacklist file (one word per line)")
+    parser.add_argument("--no-binary", action="store_true", help="Do not write the memory-mapped lexicon.bin next to --out, and remove an existing one")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for parsing the dictionary (default: CPU count)")
+    parser.add_argument("--incremental", action="store_true", help="Apply only whitelist/blacklist changes to an existing --out when possible")
     args = parser.parse_args(argv)
 
     dict_path = args.dict or (Path(os.environ.get("ITBEE_DICT")) if os.environ.get("ITBEE_DICT") else None)
     whitelist_path = args.whitelist or (Path(os.environ.get("ITBEE_WHITELIST")) if os.environ.get("ITBEE_WHITELIST") else None)
     blacklist_path = args.blacklist or (Path(os.environ.get("ITBEE_BLACKLIST")) if os.environ.get("ITBEE_BLACKLIST") else None)
 
-    build(args.out, dict_path, whitelist_path, blacklist_path, args.limit)
+    binary_path = None if args.no_binary else args.out.with_suffix(".bin")
+    build(args.out, dict_path, whitelist_path, blacklist_path, args.limit, binary_path=binary_path, incremental=args.incremental, workers=args.workers)
+    stale = args.out.with_suffix(".bin")
+    if args.no_binary and stale.exists():
+        # default_lexicon_path() prefers lexicon.bin, so an old one would shadow this build
+        stale.unlink()
+        print(f"Removed stale binary lexicon {stale}")
 
 
 if __name__ == "__main__":
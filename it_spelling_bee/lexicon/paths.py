@@ -0,0 +1,16 @@
+from pathlib import Path
+
+
+def default_lexicon_path(data_path: Path) -> Path:
+    """The lexicon `Lexicon()` opens when no path is given.
+
+    A binary or sqlite lexicon in the user data path if available, else the
+    package data, else the bundled sample.
+    """
+    for default_db in (data_path / "lexicon.bin", data_path / "lexicon.sqlite"):
+        if default_db.exists():
+            return default_db
+    base = Path(__file__).parent.parent / "data"
+    if (base / "lexicon.db").exists():
+        return base / "lexicon.db"
+    return base / "lexicon_sample.jsonl"
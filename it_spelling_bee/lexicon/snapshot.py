@@ -0,0 +1,139 @@
+"""Warm-start snapshots of JSONL and SQLite lexicons.
+
+Building a Lexicon from JSONL parses and normalises every line, and the
+SQLite backend fills its per-letter index with one full scan per letter.
+A snapshot is a copy of the lexicon in the binary format of
+`lexicon/binary.py` (with exact float64 zipf), kept under the cache
+directory: its group table is the prebuilt per-mask index, per-letter
+lookups walk that table, and the file is mmapped in place, so a warm start
+does no parsing and builds no Python objects up front.
+
+A small JSON stamp next to each snapshot records the source file it was
+made from. The snapshot is used only while that source is unchanged: same
+mtime and size, or failing that the same SHA-256, and the same
+`build_ts_utc` in the SQLite `meta` table.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+from ..typing import WordEntry
+from .binary import BinaryLexicon, write_binary
+
+if TYPE_CHECKING:
+    import sqlite3
+
+SNAPSHOT_VERSION = 1
+
+
+def sha256_of_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def build_ts_of(conn: Optional["sqlite3.Connection"]) -> str:
+    """The `build_ts_utc` meta value of a SQLite lexicon, or "" if it has none."""
+    if conn is None:
+        return ""
+    import sqlite3
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'build_ts_utc'").fetchone()
+    except sqlite3.Error:
+        return ""
+    return row[0] if row else ""
+
+
+def snapshot_paths(cache_dir: Path, source: Path) -> Tuple[Path, Path]:
+    """(snapshot file, stamp file) for a lexicon source."""
+    key = hashlib.sha256(str(source.resolve()).encode("utf8")).hexdigest()[:16]
+    return cache_dir / f"lexicon-{key}.bin", cache_dir / f"lexicon-{key}.json"
+
+
+def _write_stamp(stamp_path: Path, stamp: dict):
+    tmp = stamp_path.with_name(stamp_path.name + ".tmp")
+    tmp.write_text(json.dumps(stamp), encoding="utf8")
+    tmp.replace(stamp_path)
+
+
+def _restamp(stamp_path: Path, stamp: dict, st):
+    """Record the current mtime and size of a source whose content hash still matches.
+
+    Without this, every later start would hash the whole source again.
+    """
+    try:
+        _write_stamp(stamp_path, {**stamp, "mtime_ns": st.st_mtime_ns, "size": st.st_size})
+    except OSError:
+        pass
+
+
+def source_sha256(cache_dir: Path, source: Path) -> str:
+    """SHA-256 of `source`, taken from its stamp while mtime and size still match.
+
+    Sources without a snapshot (`.bin` lexicons) get a stamp of their own
+    the first time they are hashed.
+    """
+    _, stamp_path = snapshot_paths(cache_dir, source)
+    st = source.stat()
+    try:
+        stamp = json.loads(stamp_path.read_text(encoding="utf8"))
+    except (OSError, ValueError):
+        stamp = {}
+    if stamp.get("version") == SNAPSHOT_VERSION and "sha256" in stamp:
+        if (stamp.get("mtime_ns"), stamp.get("size")) == (st.st_mtime_ns, st.st_size):
+            return stamp["sha256"]
+    sha256 = sha256_of_file(source)
+    if stamp.get("version") == SNAPSHOT_VERSION and sha256 == stamp.get("sha256"):
+        _restamp(stamp_path, stamp, st)
+    else:
+        # No build_ts: a snapshot stamped for the old content is not reused
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            _write_stamp(stamp_path, {"version": SNAPSHOT_VERSION, "source": str(source), "mtime_ns": st.st_mtime_ns,
+                                      "size": st.st_size, "sha256": sha256})
+        except OSError:
+            pass
+    return sha256
+
+
+def load_snapshot(cache_dir: Path, source: Path, build_ts: str) -> Optional[Tuple[BinaryLexicon, str]]:
+    """Return (snapshot, source sha256) if a valid snapshot of `source` exists."""
+    snap, stamp_path = snapshot_paths(cache_dir, source)
+    try:
+        stamp = json.loads(stamp_path.read_text(encoding="utf8"))
+        st = source.stat()
+    except (OSError, ValueError):
+        return None
+    if stamp.get("version") != SNAPSHOT_VERSION or stamp.get("build_ts") != build_ts:
+        return None
+    if (stamp.get("mtime_ns"), stamp.get("size")) != (st.st_mtime_ns, st.st_size):
+        # Touched or copied but possibly identical: fall back to the content hash
+        if stamp.get("sha256") != sha256_of_file(source):
+            return None
+        _restamp(stamp_path, stamp, st)
+    try:
+        return BinaryLexicon(snap), stamp["sha256"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_snapshot(cache_dir: Path, source: Path, build_ts: str, sha256: str, entries: Iterable[WordEntry]):
+    snap, stamp_path = snapshot_paths(cache_dir, source)
+    st = source.stat()
+    stamp = {
+        "version": SNAPSHOT_VERSION,
+        "source": str(source),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": sha256,
+        "build_ts": build_ts,
+    }
+    try:
+        write_binary(snap, entries, exact_zipf=True)
+        _write_stamp(stamp_path, stamp)
+    except OSError:
+        # The snapshot is only a cache; failing to write it is not an error
+        pass
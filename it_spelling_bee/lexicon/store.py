@@ -1,43 +1,92 @@
+import hashlib
 import json
 import sqlite3
 from pathlib import Path
-from typing import Iterable, Dict
+from array import array
+from typing import Any, Iterable, Iterator, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from ..typing import WordEntry
-from ..letters import mask_of, normalize_text
-from ..config import Settings
+from ..letters import masks_of_many, normalize_many, submasks_with, LETTER_TO_BIT
+from ..config import BASE_SCORE_FIELDS, Settings, settings_hash
+from ..scoring import base_score
+from .binary import BinaryLexicon
+from .paths import default_lexicon_path
+from .snapshot import build_ts_of, load_snapshot, sha256_of_file, write_snapshot
+from .wordstore import WordStore
+
+if TYPE_CHECKING:
+    from ..columnar import ColumnarLexicon
+
+
+# Rows per fetchmany() batch and bound parameters per IN (...) query
+FETCH_BATCH = 1024
+MAX_IN_PARAMS = 500
+
+SELECT_BY_MASKS = "SELECT clean_form, zipf, mask FROM words WHERE mask IN ({})"
 
 
 class Lexicon:
-    def __init__(self, db_path: Path | None = None):
-        # Prefer a sqlite DB in user data path if available
-        settings = Settings()
-        default_db = settings.data_path / "lexicon.sqlite"
-        if db_path is None and default_db.exists():
-            db_path = default_db
-        if db_path is None:
-            # default to package data
-            base = Path(__file__).parent.parent / "data"
-            self.db_path = base / "lexicon.db"
-            if not self.db_path.exists():
-                 # fallback to bundled sample
-                 self.db_path = base / "lexicon_sample.jsonl"
-        else:
-            self.db_path = db_path
-            
+    _use_sqlite: bool = False
+    _conn: Optional[sqlite3.Connection] = None
+    # Words of a JSONL lexicon
+    _store: Optional[WordStore] = None
+    # Distinct masks of a SQLite lexicon, read from idx_mask on first use
+    _sqlite_masks: Optional[List[int]] = None
+    _path: Optional[Path] = None
+    _fingerprint: Optional[str] = None
+    _columnar = None  # type: Optional[ColumnarLexicon]
+    _binary: Optional[BinaryLexicon] = None
+    _letter_counts: Optional[Dict[str, int]] = None
+    # Base scores per (settings_hash of BASE_SCORE_FIELDS, word ids); see _base_table()
+    _base_cache: Optional[Dict[Tuple[str, str], Any]] = None
+
+    def __init__(self, db_path: Path | None = None, cache_dir: Path | None = None):
+        """Open a lexicon (.sqlite, .bin or .jsonl).
+
+        With `cache_dir`, JSONL and SQLite lexicons are loaded from a
+        warm-start snapshot kept there (see `lexicon/snapshot.py`), which is
+        rebuilt whenever the source changes.
+        """
+        self.db_path = db_path if db_path is not None else default_lexicon_path(Settings().data_path)
         self._path = self.db_path
         self._use_sqlite = self.db_path.suffix == ".sqlite" and self.db_path.exists()
-        self._entries = []  # type: list[WordEntry]
-        self._by_required: Dict[str, list[WordEntry]] = {}
+        self._store = None
+        # Ids into _store of the words containing each letter, filled per letter on demand
+        self._by_required: Dict[str, array] = {}
         self._conn = None
         if self._use_sqlite:
-            self._conn = sqlite3.connect(str(self._path))
-        else:
+            # Read-only: the lexicon is never written at runtime, and this lets
+            # many processes share one file without taking write locks
+            self._conn = sqlite3.connect(self._path.resolve().as_uri() + "?mode=ro", uri=True)
+        elif self.db_path.suffix == ".bin" and self.db_path.exists():
+            # Used in place through mmap; nothing is parsed up front
+            self._binary = BinaryLexicon(self.db_path)
+        if self._binary is None and cache_dir is not None and self._path.exists():
+            self._warm_start(cache_dir)
+        elif not self._use_sqlite and self._binary is None:
             self._load_jsonl()
 
+    def _warm_start(self, cache_dir: Path):
+        build_ts = build_ts_of(self._conn)
+        found = load_snapshot(cache_dir, self._path, build_ts)
+        if found is None:
+            if not self._use_sqlite:
+                self._load_jsonl()
+            entries = self.iter_all()
+            write_snapshot(cache_dir, self._path, build_ts, self.fingerprint(), entries)
+            found = load_snapshot(cache_dir, self._path, build_ts)
+            if found is None:
+                # Cache not writable: keep serving the source directly
+                return
+        self._binary, self._fingerprint = found
+        self._store = None
+        self._by_required = {}
+
     def _load_jsonl(self):
         if not self._path.exists():
+            self._store = WordStore()
             return
+        raw = []
         with self._path.open("r", encoding="utf8") as fh:
             for line in fh:
                 line = line.strip()
@@ -50,49 +99,260 @@ class Lexicon:
                 text = obj.get("clean_form") or obj.get("text")
                 if not text:
                     continue
-                text = normalize_text(text)
-                zipf = float(obj.get("zipf", 4.0))
-                mask = int(obj.get("mask", 0))
-                if mask == 0:
-                    mask = mask_of(text)
-                entry = WordEntry(text=text, zipf=zipf, mask=mask)
-                self._entries.append(entry)
-                # index by each unique letter in the word
-                used = set(text)
-                for ch in used:
-                    self._by_required.setdefault(ch, []).append(entry)
+                raw.append((text, float(obj.get("zipf", 4.0)), int(obj.get("mask", 0))))
+        texts = normalize_many(text for text, _, _ in raw)
+        # Masks for the lines that lack one, computed as a batch
+        computed = iter(masks_of_many((text for text, (_, _, mask) in zip(texts, raw) if not mask), normalized=True))
+        self._store = WordStore((text, zipf, mask or next(computed)) for text, (_, zipf, mask) in zip(texts, raw))
+
+    def _word_store(self) -> WordStore:
+        """The in-memory words; read from `iter_all()` the first time if there are none yet."""
+        if self._store is None:
+            self._store = WordStore((e.text, e.zipf, e.mask) for e in self.iter_all())
+        return self._store
+
+    @property
+    def thread_bound(self) -> bool:
+        """True if queries go through the SQLite connection, which only the thread that opened it may use."""
+        return self._binary is None and self._conn is not None
+
+    def fingerprint(self) -> str:
+        """SHA-256 of the lexicon source, used to key caches derived from it.
+
+        Lexicons without a backing file hash their entries instead.
+        """
+        if self._fingerprint is None:
+            if self._path is not None and self._path.exists():
+                self._fingerprint = sha256_of_file(self._path)
+            else:
+                h = hashlib.sha256()
+                for entry in self.iter_all():
+                    h.update(f"{entry.text}\t{entry.zipf}\t{entry.mask}\n".encode("utf8"))
+                self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def columnar(self) -> "ColumnarLexicon":
+        """NumPy column view of this lexicon, built on first use (requires numpy)."""
+        if self._columnar is None:
+            from ..columnar import ColumnarLexicon
+            self._columnar = ColumnarLexicon.from_lexicon(self)
+        return self._columnar
 
     def iter_all(self) -> Iterable[WordEntry]:
-        if self._use_sqlite and self._conn is not None:
-            cur = self._conn.cursor()
-            for row in cur.execute("SELECT clean_form, zipf, mask FROM words"):
-                yield WordEntry(text=row[0], zipf=float(row[1]), mask=int(row[2]))
-        else:
-            yield from self._entries
+        if self._binary is not None:
+            yield from self._binary.iter_entries()
+        elif self._use_sqlite and self._conn is not None:
+            cur = self._conn.execute("SELECT clean_form, zipf, mask FROM words")
+            for rows in iter(lambda: cur.fetchmany(FETCH_BATCH), []):
+                for row in rows:
+                    yield WordEntry(text=row[0], zipf=float(row[1]), mask=int(row[2]))
+        elif self._store is not None:
+            yield from self._store.iter_entries()
+
+
+    def letter_counts(self) -> Dict[str, int]:
+        """Number of entries containing each letter a-z, computed once."""
+        if self._letter_counts is None:
+            per_mask: Dict[int, int] = {}
+            if self._binary is not None:
+                b = self._binary
+                for g in range(b.n_groups):
+                    per_mask[b.group_masks[g]] = b.group_start[g + 1] - b.group_start[g]
+            elif self._store is not None:
+                for m in self._store.masks:
+                    per_mask[m] = per_mask.get(m, 0) + 1
+            else:
+                for entry in self.iter_all():
+                    per_mask[entry.mask] = per_mask.get(entry.mask, 0) + 1
+            self._letter_counts = {
+                ch: sum(n for m, n in per_mask.items() if m & bit) for ch, bit in LETTER_TO_BIT.items()
+            }
+        return self._letter_counts
 
+    def _distinct_masks(self) -> List[int]:
+        if self._sqlite_masks is None:
+            # Answered from idx_mask alone (covering index), no table rows read
+            self._sqlite_masks = [row[0] for row in self._conn.execute("SELECT DISTINCT mask FROM words")]
+        return self._sqlite_masks
+
+    def _sqlite_iter_masks(self, masks: List[int]) -> Iterator[WordEntry]:
+        """Fetch the rows whose mask is one of `masks` through idx_mask."""
+        for start in range(0, len(masks), MAX_IN_PARAMS):
+            chunk = masks[start:start + MAX_IN_PARAMS]
+            cur = self._conn.execute(SELECT_BY_MASKS.format(",".join("?" * len(chunk))), chunk)
+            for rows in iter(lambda: cur.fetchmany(FETCH_BATCH), []):
+                for r in rows:
+                    yield WordEntry(text=r[0], zipf=float(r[1]), mask=int(r[2]))
+
+    def _sqlite_by_masks(self, masks: List[int]) -> List[WordEntry]:
+        return list(self._sqlite_iter_masks(masks))
 
     def iter_by_required(self, letter: str) -> Iterable[WordEntry]:
         l = letter.lower()
-        # Check cache first
-        if l in self._by_required:
-            yield from self._by_required[l]
+        if self._binary is not None:
+            yield from self._binary.iter_with_bit(LETTER_TO_BIT.get(l, 0))
             return
+        if self._use_sqlite and self._conn is not None:
+            # Indexed lookup of the letter's masks, streamed rather than cached
+            bit = LETTER_TO_BIT.get(l, 0)
+            yield from self._sqlite_iter_masks([m for m in self._distinct_masks() if m & bit])
+            return
+        store = self._word_store()
+        ids = self._by_required.get(l)
+        if ids is None:
+            ids = self._by_required[l] = store.ids_with_bit(LETTER_TO_BIT.get(l, 0))
+        yield from map(store.entry, ids)
+
+    def words_for_board(self, board_mask: int, required: str) -> List[WordEntry]:
+        """Return every entry that uses only board letters and contains `required`.
 
+        Only the submasks of `board_mask` that include the required bit are
+        looked up, so the cost depends on the board size (64 lookups for a
+        7-letter board) rather than on the size of the lexicon.
+        """
+        bit = LETTER_TO_BIT.get(required.lower(), 0)
+        if not bit or not (board_mask & bit):
+            return []
+        out: List[WordEntry] = []
+        if self._binary is not None:
+            for sub in submasks_with(board_mask, bit):
+                start, end = self._binary.group_range(sub)
+                out.extend(self._binary.entry(i) for i in range(start, end))
+            return out
         if self._use_sqlite and self._conn is not None:
-            bit = 0
-            # compute bit for letter
-            if len(l) == 1 and 'a' <= l <= 'z':
-                bit = 1 << (ord(l) - ord('a'))
-            
-            entries = []
-            cur = self._conn.cursor()
-            # mask & bit != 0
-            for row in cur.execute("SELECT clean_form, zipf, mask FROM words WHERE (mask & ?) != 0", (bit,)):
-                entry = WordEntry(text=row[0], zipf=float(row[1]), mask=int(row[2]))
-                entries.append(entry)
-            
-            # Cache the result
-            self._by_required[l] = entries
-            yield from entries
+            # Pushed down as one indexed IN lookup over the submasks
+            return self._sqlite_by_masks(list(submasks_with(board_mask, bit)))
+        store = self._word_store()
+        for sub in submasks_with(board_mask, bit):
+            out.extend(map(store.entry, store.group(sub)))
+        return out
+
+    def _base_table(self, settings: Settings, kind: str):
+        """Cached base scores for the current Settings.
+
+        `kind` picks the layout: "binary" is an array by word index,
+        "store" an array by word store id, filled on first lookup (-1 until
+        then), and "text" maps a SQLite primary key to its score. Words
+        shorter than min_len store 0 (a real base score is at least 1).
+        """
+        if self._base_cache is None:
+            self._base_cache = {}
+        key = (settings_hash(settings, BASE_SCORE_FIELDS), kind)
+        table = self._base_cache.get(key)
+        if table is None:
+            if kind == "binary":
+                table = array("I", (self._base_or_zero(e, settings) for e in self._binary.iter_entries()))
+            elif kind == "store":
+                table = array("i", [-1]) * len(self._word_store())
+            else:
+                table = {}
+            self._base_cache[key] = table
+        return table
+
+    @staticmethod
+    def _base_or_zero(entry: WordEntry, settings: Settings) -> int:
+        return base_score(entry, settings) if len(entry.text) >= settings.min_len else 0
+
+    def _store_group(self, store: WordStore, table: array, sub: int, settings: Settings) -> Tuple[Sequence[int], List[int]]:
+        """Ids of the stored words with mask `sub` and their base scores (0 below min_len)."""
+        ids = store.group(sub)
+        bases = []
+        for i in ids:
+            b = table[i]
+            if b < 0:
+                b = table[i] = self._base_or_zero(store.entry(i), settings)
+            bases.append(b)
+        return ids, bases
+
+    def scored_ids_for_board(self, board_mask: int, required: str, settings: Settings) -> Optional[Tuple[Any, array, List[int], List[int]]]:
+        """The words of `scored_words_for_board` as ids, without creating entries.
+
+        Returns (source, ids, masks, base scores), where `source` is the
+        WordStore or BinaryLexicon the ids index (`source.entry(i)` and
+        `source.text(i)`), or None for a SQLite lexicon, which has no ids.
+        """
+        if self._use_sqlite and self._binary is None:
+            return None
+        bit = LETTER_TO_BIT.get(required.lower(), 0)
+        ids = array("I")
+        masks: List[int] = []
+        bases: List[int] = []
+        if self._binary is not None:
+            source: Any = self._binary
+            table = self._base_table(settings, "binary")
+            for sub in submasks_with(board_mask, bit) if bit and board_mask & bit else ():
+                start, end = self._binary.group_range(sub)
+                for i in range(start, end):
+                    b = table[i]
+                    if b:
+                        ids.append(i)
+                        masks.append(sub)
+                        bases.append(b)
+            return source, ids, masks, bases
+        source = self._word_store()
+        table = self._base_table(settings, "store")
+        for sub in submasks_with(board_mask, bit) if bit and board_mask & bit else ():
+            group_ids, group_bases = self._store_group(source, table, sub, settings)
+            for i, b in zip(group_ids, group_bases):
+                if b:
+                    ids.append(i)
+                    masks.append(sub)
+                    bases.append(b)
+        return source, ids, masks, bases
+
+    def scored_words_for_board(self, board_mask: int, required: str, settings: Settings) -> Tuple[List[WordEntry], List[int]]:
+        """Like `words_for_board`, minus words shorter than min_len, with each word's base score.
+
+        The base score (`scoring.base_score`) does not depend on the board,
+        so it is computed once per entry and Settings and then looked up.
+        """
+        found = self.scored_ids_for_board(board_mask, required, settings)
+        if found is not None:
+            source, ids, _, bases = found
+            return [source.entry(i) for i in ids], bases
+        bit = LETTER_TO_BIT.get(required.lower(), 0)
+        words: List[WordEntry] = []
+        bases = []
+        if not bit or not (board_mask & bit):
+            return words, bases
+        if self._use_sqlite and self._conn is not None:
+            table = self._base_table(settings, "text")
+            for entry in self._sqlite_by_masks(list(submasks_with(board_mask, bit))):
+                b = table.get(entry.text)
+                if b is None:
+                    b = table[entry.text] = self._base_or_zero(entry, settings)
+                if b:
+                    words.append(entry)
+                    bases.append(b)
+        return words, bases
+
+    def board_bases(self, board_mask: int, required: str, settings: Settings) -> Iterator[Tuple[int, List[int]]]:
+        """(mask, base scores) of each letter mask with words on the board.
+
+        The same words and scores as `scored_words_for_board`, grouped by
+        mask, but without creating a WordEntry per word: enough to count a
+        board's words and points (a group is pangrams exactly when its mask
+        is the board's).
+        """
+        bit = LETTER_TO_BIT.get(required.lower(), 0)
+        if not bit or not (board_mask & bit):
+            return
+        if self._binary is not None:
+            table = self._base_table(settings, "binary")
+            for sub in submasks_with(board_mask, bit):
+                start, end = self._binary.group_range(sub)
+                bases = [b for b in table[start:end] if b]
+                if bases:
+                    yield sub, bases
+        elif self._use_sqlite and self._conn is not None:
+            groups: Dict[int, List[int]] = {}
+            for entry, b in zip(*self.scored_words_for_board(board_mask, required, settings)):
+                groups.setdefault(entry.mask, []).append(b)
+            yield from groups.items()
         else:
-            yield from self._by_required.get(l, [])
+            store = self._word_store()
+            table = self._base_table(settings, "store")
+            for sub in submasks_with(board_mask, bit):
+                bases = [b for b in self._store_group(store, table, sub, settings)[1] if b]
+                if bases:
+                    yield sub, bases
@@ -0,0 +1,107 @@
+"""Struct-of-arrays storage for an in-memory lexicon.
+
+Words are addressed by id, the order they were added in, and kept in
+parallel arrays rather than one `WordEntry` per word:
+
+    text     every word back to back in one string; offsets (uint32[n + 1])
+             delimit each word
+    masks    uint32[n] letter mask of each word
+    zipfs    uint16[n] zipf * 100 (as `lexicon/binary.py`), or float64[n]
+             once a value is added that hundredths cannot hold exactly
+
+That is about 10 bytes per word plus its text, where a `WordEntry` with
+its own str object takes well over 100. `WordEntry` objects are only
+created as views by `entry()`, for callers of the entry-based API.
+
+The mask index (`group`) lists the ids of each exact mask, ascending, so
+`Lexicon.words_for_board` returns words in the order they were added.
+"""
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..typing import WordEntry
+from .binary import ZIPF_SCALE
+
+
+class WordStore:
+    def __init__(self, words: Iterable[Tuple[str, float, int]] = ()):
+        self._parts: List[str] = []
+        self._text = ""
+        self.offsets = array("I", [0])
+        self.masks = array("I")
+        self.zipfs = array("H")
+        self.quantised = True
+        # (ids sorted by mask, distinct masks, start of each mask's ids); built by _groups()
+        self._mask_index: Optional[Tuple[array, array, array]] = None
+        for text, zipf, mask in words:
+            self.add(text, zipf, mask)
+        self._join()
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def add(self, text: str, zipf: float, mask: int) -> int:
+        """Append a word; returns its id."""
+        self._parts.append(text)
+        self.offsets.append(self.offsets[-1] + len(text))
+        self.masks.append(mask)
+        if self.quantised:
+            q = round(zipf * ZIPF_SCALE)
+            if 0 <= q <= 0xFFFF and q / ZIPF_SCALE == zipf:
+                self.zipfs.append(q)
+            else:
+                self.zipfs = array("d", (z / ZIPF_SCALE for z in self.zipfs))
+                self.quantised = False
+        if not self.quantised:
+            self.zipfs.append(float(zipf))
+        self._mask_index = None
+        return len(self.masks) - 1
+
+    def _join(self):
+        """Fold the text of words added since the last call into the single string."""
+        if self._parts:
+            self._text += "".join(self._parts)
+            self._parts = []
+
+    def text(self, i: int) -> str:
+        self._join()
+        return self._text[self.offsets[i]:self.offsets[i + 1]]
+
+    def zipf(self, i: int) -> float:
+        return self.zipfs[i] / ZIPF_SCALE if self.quantised else self.zipfs[i]
+
+    def entry(self, i: int) -> WordEntry:
+        return WordEntry(text=self.text(i), zipf=self.zipf(i), mask=self.masks[i])
+
+    def iter_entries(self) -> Iterator[WordEntry]:
+        for i in range(len(self.masks)):
+            yield self.entry(i)
+
+    def ids_with_bit(self, bit: int) -> array:
+        """Ids of the words whose mask has `bit`, ascending."""
+        return array("I", compress(range(len(self.masks)), (m & bit for m in self.masks)))
+
+    def _groups(self) -> Tuple[array, array, array]:
+        if self._mask_index is None:
+            masks = self.masks
+            # Stable sort: ids stay ascending within a mask
+            order = array("I", sorted(range(len(masks)), key=masks.__getitem__))
+            group_masks = array("I")
+            group_start = array("I")
+            for pos, i in enumerate(order):
+                if not group_masks or group_masks[-1] != masks[i]:
+                    group_masks.append(masks[i])
+                    group_start.append(pos)
+            group_start.append(len(order))
+            self._mask_index = (order, group_masks, group_start)
+        return self._mask_index
+
+    def group(self, mask: int) -> Sequence[int]:
+        """Ids of the words whose mask is exactly `mask`, ascending."""
+        order, group_masks, group_start = self._groups()
+        g = bisect_left(group_masks, mask)
+        if g == len(group_masks) or group_masks[g] != mask:
+            return ()
+        return order[group_start[g]:group_start[g + 1]]
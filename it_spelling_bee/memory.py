@@ -0,0 +1,141 @@
+"""Retained memory of the lexicon and board structures, measured with tracemalloc.
+
+Each structure is measured by what it retains: the traced memory that a
+step allocates and keeps, or that dropping the structure gives back.
+
+    entries           Lexicon._store, the WordStore arrays and text
+    per_letter_index  Lexicon._by_required, word ids for every letter
+    mask_index        the WordStore's mask index (ids sorted by mask)
+    base_scores       Lexicon._base_cache after generating the boards
+    sqlite_cache      what a SQLite lexicon keeps after iter_by_required over
+                      every letter (its distinct masks; rows are streamed)
+    boards            GeneratedBoard objects as generated (word ids, points)
+    board_scores      the text-keyed score dict a board builds on its first
+                      lookup, i.e. once it is played
+
+The lexicon structures are reported per lexicon word and the board ones
+per board word. tracemalloc only sees allocations made through Python's
+allocator, so SQLite's own page cache and mmapped `.bin` files are not
+included.
+
+`MEMORY_BUDGETS` holds the allowed bytes per unit of each structure;
+`check_budgets` lists the ones a report exceeds.
+"""
+import gc
+import random
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import Settings
+from .generator import generate_board
+from .lexicon.store import Lexicon
+
+# Bytes per word (per board word for "boards" and "board_scores"): about
+# 30% over CPython 3.11 measurements on the synthetic 10k/100k lexicons of
+# `bench.py`. The mask index costs more per word on small lexicons (fewer
+# words per mask), and boards with few words pay more per word for their
+# fixed overhead.
+MEMORY_BUDGETS: Dict[str, float] = {
+    "entries": 23.0,
+    "per_letter_index": 32.0,
+    "mask_index": 13.0,
+    "base_scores": 6.0,
+    "sqlite_cache": 55.0,
+    "boards": 90.0,
+    "board_scores": 105.0,
+}
+
+
+def _traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def retained(fn: Callable[[], object]) -> Tuple[object, int]:
+    """Result of `fn()` and the traced bytes it allocated and still holds."""
+    before = _traced()
+    result = fn()
+    return result, _traced() - before
+
+
+def released(drop: Callable[[], None]) -> int:
+    """Traced bytes given back by `drop()`."""
+    before = _traced()
+    drop()
+    return before - _traced()
+
+
+def _fill_letter_cache(lex: Lexicon):
+    for ch in "abcdefghijklmnopqrstuvwxyz":
+        for _ in lex.iter_by_required(ch):
+            pass
+
+
+def _row(nbytes: int, count: int, per: str) -> Dict:
+    return {"bytes": nbytes, "count": count, "per": per, "bytes_per": nbytes / count if count else 0.0}
+
+
+def memory_report(jsonl_path: Path, sqlite_path: Optional[Path] = None, boards: int = 20,
+                  settings: Optional[Settings] = None) -> Dict:
+    """Retained bytes of each structure for the lexicon at `jsonl_path` (and `sqlite_path`).
+
+    Returns {"words", "total", "structures": {name: {"bytes", "count", "per", "bytes_per"}}}.
+    """
+    settings = settings or Settings()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        lex, total = retained(lambda: Lexicon(jsonl_path))
+        store = lex._store
+        n_words = len(store)
+        structures: Dict[str, Dict] = {}
+
+        # The mask index and base scores are built by the first boards
+        _, indexes = retained(lambda: generate_board(lex, settings, random.Random(-1)))
+        generated, board_bytes = retained(lambda: [generate_board(lex, settings, random.Random(seed)) for seed in range(boards)])
+        board_words = sum(len(b.words) for b in generated)
+        structures["boards"] = _row(board_bytes, board_words, "board word")
+        _, played = retained(lambda: [b.scores.get("") for b in generated])
+        structures["board_scores"] = _row(played, board_words, "board word")
+        del generated[:]
+        structures["base_scores"] = _row(released(lambda: setattr(lex, "_base_cache", None)), n_words, "word")
+        structures["mask_index"] = _row(released(lambda: setattr(store, "_mask_index", None)), n_words, "word")
+
+        _, by_letter = retained(lambda: _fill_letter_cache(lex))
+        structures["per_letter_index"] = _row(by_letter, n_words, "word")
+        del store
+        lex._by_required = {}
+        structures["entries"] = _row(released(lambda: setattr(lex, "_store", None)), n_words, "word")
+        del lex
+
+        if sqlite_path is not None:
+            sqlite_lex = Lexicon(sqlite_path)
+            _, cache = retained(lambda: _fill_letter_cache(sqlite_lex))
+            structures["sqlite_cache"] = _row(cache, n_words, "word")
+            del sqlite_lex
+        return {"words": n_words, "total": total, "structures": structures}
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def check_budgets(report: Dict, budgets: Dict[str, float] = MEMORY_BUDGETS) -> List[str]:
+    """Structures of `report` over their budget, as messages."""
+    over = []
+    for name, row in report["structures"].items():
+        budget = budgets.get(name)
+        if budget is not None and row["bytes_per"] > budget:
+            over.append(f"{name}: {row['bytes_per']:.0f} B/{row['per']} over budget {budget:.0f}")
+    return over
+
+
+def format_report(report: Dict, budgets: Dict[str, float] = MEMORY_BUDGETS) -> str:
+    lines = [f"{'structure':<18}{'MiB':>9}{'bytes/unit':>12}{'budget':>9}  unit"]
+    for name, row in report["structures"].items():
+        budget = budgets.get(name)
+        lines.append(f"{name:<18}{row['bytes'] / 2 ** 20:9.2f}{row['bytes_per']:12.1f}"
+                     f"{budget if budget is not None else float('nan'):9.0f}  {row['per']}")
+    lines.append(f"{'lexicon load':<18}{report['total'] / 2 ** 20:9.2f}{report['total'] / max(report['words'], 1):12.1f}{'':>9}  word")
+    return "\n".join(lines)
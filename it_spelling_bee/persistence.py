@@ -1,20 +1,265 @@
+"""Game session persistence: a snapshot file plus an append-only journal.
+
+`session.json` is a snapshot, always replaced atomically (write to a
+temporary file, fsync, rename):
+
+    {"version": 2, "seed", "score", "seq", "n_words", "words_digest", "found_bits"}
+
+Found words are a bitset (hex) over the board's words in sorted order;
+`words_digest` identifies that word list, so the bits are only applied to
+the board they were written for. Sessions written before the journal
+existed (a "found" list) still load.
+
+`session.journal` next to it starts with a header {"d": words_digest}
+naming the board it belongs to, then holds one compact JSON record per
+event, numbered by `n`: {"n", "w": word, "s": score} for a found word and
+{"n", "s": score} for a hint penalty. Scores are absolute, and records
+numbered at or below the snapshot's `seq` are already in it, so replaying
+is idempotent. A journal whose header does not match the snapshot's
+`words_digest` (left behind by a crash after a new board's snapshot was
+written) is not replayed. A record torn by a crash fails to parse and
+ends the replay; everything before it is kept.
+
+`SessionJournal` appends from a background thread, so the input loop never
+waits on the disk: records that arrive within `flush_interval` are written
+and fsynced together, and every `compact_every` records (and on close) the
+state is folded into a new snapshot and the journal is emptied.
+"""
+import hashlib
 import json
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 
-def save_session(path: Path, data: Dict[str, Any]):
-    """Save the game session data to a JSON file."""
+SESSION_VERSION = 2
+
+
+def journal_path(path: Path) -> Path:
+    return path.with_suffix(".journal")
+
+
+def word_order(words: Iterable[str]) -> List[str]:
+    """Board words in bitset order."""
+    return sorted(set(words))
+
+
+def words_digest(order: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(order).encode("utf8")).hexdigest()[:16]
+
+
+def encode_found(found: Iterable[str], order: Sequence[str]) -> str:
+    index = {w: i for i, w in enumerate(order)}
+    bits = 0
+    for w in found:
+        i = index.get(w)
+        if i is not None:
+            bits |= 1 << i
+    return format(bits, "x")
+
+
+def session_found(data: Dict[str, Any], words: Iterable[str]) -> Set[str]:
+    """Found words of a loaded session that are on the board, decoding its bitset against the board's words."""
+    order = word_order(words)
+    found = set(data.get("found", [])).intersection(order)
+    bits = int(data.get("found_bits") or "0", 16)
+    if bits and data.get("words_digest") == words_digest(order):
+        found.update(w for i, w in enumerate(order) if bits >> i & 1)
+    return found
+
+
+def _journal_header(digest: str) -> str:
+    return json.dumps({"d": digest}, separators=(",", ":")) + "\n"
+
+
+def _fsync_dir(path: Path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_snapshot(path: Path, data: Dict[str, Any]):
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf8") as fh:
-        json.dump(data, fh, indent=2)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+        fh.flush()
+        os.fsync(fh.fileno())
+    tmp.replace(path)
+    _fsync_dir(path.parent)
+
+
+def save_session(path: Path, data: Dict[str, Any]):
+    """Replace the session with `data` ({"seed", "found", "score"}) and clear its journal."""
+    _write_snapshot(path, {"version": SESSION_VERSION, "seq": 0, **data})
+    journal_path(path).unlink(missing_ok=True)
 
 
 def load_session(path: Path) -> Optional[Dict[str, Any]]:
-    """Load the game session data from a JSON file."""
-    if not path.exists():
-        return None
+    """Load the session snapshot and replay its journal.
+
+    Returns {"seed", "score", "seq", "found", "found_bits", "words_digest"};
+    pass it with the board's words to `session_found` for the found words.
+    """
     try:
         with path.open("r", encoding="utf8") as fh:
-            return json.load(fh)
+            data = json.load(fh)
     except (json.JSONDecodeError, OSError):
         return None
+    if not isinstance(data, dict):
+        return None
+    data.setdefault("found", [])
+    data.setdefault("score", 0)
+    seq = data.setdefault("seq", 0)
+
+    found = list(data["found"])
+    try:
+        with journal_path(path).open("r", encoding="utf8") as fh:
+            try:
+                header = json.loads(fh.readline())
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get("d") != data.get("words_digest"):
+                # Empty, or written for another board
+                return data
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                    n, score = record["n"], record["s"]
+                except (ValueError, KeyError, TypeError):
+                    break
+                if n <= seq:
+                    continue
+                if "w" in record:
+                    found.append(record["w"])
+                data["score"] = score
+                data["seq"] = seq = n
+    except OSError:
+        pass
+    data["found"] = found
+    return data
+
+
+def delete_session(path: Path):
+    path.unlink(missing_ok=True)
+    journal_path(path).unlink(missing_ok=True)
+
+
+class SessionJournal:
+    """Records a game's progress to `path` and its journal from a writer thread.
+
+    The first record first compacts the starting state into a fresh
+    snapshot, which replaces a stored session for another seed; a game
+    that records nothing leaves the stored session alone.
+    """
+
+    def __init__(self, path: Path, seed: int, words: Iterable[str], found: Iterable[str] = (), score: int = 0,
+                 seq: int = 0, flush_interval: float = 0.05, compact_every: int = 64):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self._seed = seed
+        self._order = word_order(words)
+        self._digest = words_digest(self._order)
+        self._found = set(found)
+        self._score = score
+        self._seq = seq
+        self._written = seq
+        self._since_compact = 0
+        self._started = False
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+        self._thread.start()
+
+    def record_guess(self, word: str, score: int):
+        self._put({"w": word, "s": score})
+
+    def record_hint(self, score: int):
+        self._put({"s": score})
+
+    def _put(self, record: Dict[str, Any]):
+        with self._lock:
+            self._seq += 1
+            self._queue.put({"n": self._seq, **record})
+
+    def close(self):
+        """Write out everything recorded so far, compact, and stop the writer."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self) -> "SessionJournal":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        done = False
+        while not done:
+            batch = [self._queue.get()]
+            # Coalesce whatever arrives within the flush interval into one write
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            done = batch[-1] is None
+            records = [item for item in batch if item is not None]
+            try:
+                if records and not self._started:
+                    self._compact()
+                    self._started = True
+                self._append(records)
+                if self._started and (done or self._since_compact >= self.compact_every):
+                    self._compact()
+            except OSError:
+                # Persistence is best effort: the game goes on without it
+                pass
+
+    def _append(self, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        lines = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+        with journal_path(self.path).open("a", encoding="utf8") as fh:
+            if fh.tell() == 0:
+                fh.write(_journal_header(self._digest))
+            fh.write(lines)
+            fh.flush()
+            os.fsync(fh.fileno())
+        for r in records:
+            if "w" in r:
+                self._found.add(r["w"])
+            self._score = r["s"]
+            self._written = r["n"]
+        self._since_compact += len(records)
+
+    def _compact(self):
+        _write_snapshot(self.path, {
+            "version": SESSION_VERSION,
+            "seed": self._seed,
+            "score": self._score,
+            "seq": self._written,
+            "n_words": len(self._order),
+            "words_digest": self._digest,
+            "found_bits": encode_found(self._found, self._order),
+        })
+        # Records up to seq are in the snapshot; a crash before this truncation
+        # leaves them to be skipped, or, for another board, the header ignored
+        with journal_path(self.path).open("w", encoding="utf8") as fh:
+            fh.write(_journal_header(self._digest))
+        self._since_compact = 0
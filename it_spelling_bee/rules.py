@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from typing import FrozenSet
+from typing import FrozenSet, Iterable, Optional
 
 from .typing import WordEntry
-from .letters import normalize_text, mask_of, uses_only
+from .letters import LETTER_TO_BIT, normalize_text, mask_of, strict_mask_of, uses_only
 
 
 @dataclass
@@ -11,9 +11,56 @@ class RuleSet:
     alphabet: FrozenSet[str]
 
 
+@dataclass(frozen=True)
+class BoardRules:
+    """The letter rules of one board, compiled to bitmasks.
+
+    Build it once per board; checking a word then costs a single mask
+    computation. Only the letters a-z can be allowed.
+    """
+    required_bit: int
+    allowed_mask: int
+    min_len: int = 0
+
+    @classmethod
+    def compile(cls, required: str, allowed: Iterable[str], min_len: int = 0) -> "BoardRules":
+        allowed_mask = 0
+        for ch in allowed:
+            allowed_mask |= LETTER_TO_BIT.get(ch, 0)
+        return cls(required_bit=LETTER_TO_BIT.get(required, 0), allowed_mask=allowed_mask, min_len=min_len)
+
+    def check(self, text: str) -> Optional[str]:
+        """First letter rule that normalised `text` breaks, or None.
+
+        Returns 'missing required letter' or 'contains invalid letter', in
+        that order of precedence. The length rule is not checked here.
+        """
+        m = strict_mask_of(text)
+        if not m & self.required_bit:
+            return "missing required letter"
+        if m & ~self.allowed_mask:
+            return "contains invalid letter"
+        return None
+
+    def accepts(self, text: str) -> bool:
+        return len(text) >= self.min_len and self.check(text) is None
+
+
+def compile_rules(board: dict | object, rules: RuleSet, required: str) -> BoardRules:
+    """BoardRules for `is_valid(..., board, rules, required)`."""
+    if isinstance(board, dict):
+        letters = [board["letters"]["required"], *board["letters"]["others"]]
+    else:
+        letters = [board.letters.required, *board.letters.others]
+    return BoardRules.compile(required.lower(), [ch for ch in letters if ch in rules.alphabet], rules.min_len)
+
+
 def is_valid(entry: WordEntry, board: dict | object, rules: RuleSet, required: str) -> bool:
     """Check if a word entry is valid for the given board and rules.
     
+    To check many words against one board, build `compile_rules(board,
+    rules, required)` once and call its `accepts()` instead.
+
     Args:
         entry: The word entry to validate
         board: Board configuration (dict or GeneratedBoard)
@@ -23,22 +70,4 @@ def is_valid(entry: WordEntry, board: dict | object, rules: RuleSet, required: s
     Returns:
         bool: True if the word is valid, False otherwise
     """
-    text = normalize_text(entry.text)
-    # Get allowed letters set
-    allowed_letters = None
-    if isinstance(board, dict):
-        allowed_letters = frozenset([board["letters"]["required"]] + list(board["letters"]["others"]))
-    else:
-        allowed_letters = frozenset([board.letters.required] + list(board.letters.others))
-    
-    # Basic validations
-    if len(text) < rules.min_len:
-        return False
-    if required.lower() not in text:
-        return False
-    if any(ch not in rules.alphabet for ch in text):
-        return False
-    if any(ch not in allowed_letters for ch in text):
-        return False
-    
-    return True
+    return compile_rules(board, rules, required).accepts(normalize_text(entry.text))
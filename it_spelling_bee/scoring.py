@@ -3,7 +3,8 @@ from .config import Settings
 from .letters import mask_of
 
 
-def score_word(entry: WordEntry, board_mask: int, settings: Settings) -> int:
+def base_score(entry: WordEntry, settings: Settings) -> int:
+    """Frequency plus length points: the part of the score no board affects."""
     # zipf in [1..8], higher is more common
     zipf = float(entry.zipf)
     alpha = settings.alpha
@@ -11,12 +12,16 @@ def score_word(entry: WordEntry, board_mask: int, settings: Settings) -> int:
     text = entry.text
     min_len = settings.min_len
     len_points = max(0, len(text) - min_len)
+    return freq_points + len_points
+
+
+def score_word(entry: WordEntry, board_mask: int, settings: Settings) -> int:
     pangram_bonus = 0
     
     # if word uses all letters
     if board_mask != 0 and (entry.mask & board_mask) == board_mask:
         pangram_bonus = settings.pangram_bonus_points
-    s = freq_points + len_points + pangram_bonus
+    s = base_score(entry, settings) + pangram_bonus
     if s > 50:
         s = 50
     return s
@@ -0,0 +1,414 @@
+"""Local HTTP/JSON API serving boards and game sessions (stdlib asyncio only).
+
+The lexicon is loaded once at startup. Boards are generated off the event
+loop in an executor (one thread by default, or a process pool with
+--workers N, each worker opening the lexicon once; the thread opens its
+own copy of a SQLite lexicon not served from a snapshot) and kept in a bounded
+LRU cache keyed by (seed, settings_hash, lexicon fingerprint); concurrent
+requests for a board being generated wait for the same job. Boards are
+drawn from the stored board catalog when one was built for the lexicon
+and Settings.
+
+With --session-db, games started with a "player" are kept in a
+`SessionStore` keyed by (player, seed): every guess and hint saves the
+game, pending saves are flushed together every --flush-interval seconds,
+and games idle for --session-ttl seconds are evicted.
+
+Endpoints (all responses are JSON):
+
+    GET  /board/<seed>                 letters, word count, points, goal
+                                       (?words=1 adds the solution words)
+    GET  /board/<seed>/check?word=W    validate a guess without a session
+    POST /session         {"seed": n}  start a session -> {"session", "board", "progress"}
+                          (with --session-db, {"seed", "player"} resumes that player's game)
+    GET  /session/<id>                 progress and found words
+    POST /session/<id>/guess           {"word": W} or {"words": [...]}
+    POST /session/<id>/hint            a hint (costs `hint_cost` points) and the hint grid
+    GET  /health                       lexicon fingerprint and cache stats
+
+Usage:
+    python -m it_spelling_bee.server --port 8080
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import secrets
+import sys
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .catalog import load_catalog
+from .config import Settings, settings_hash
+from .engine import Engine
+from .generator import _generate_one, _generate_seed, _init_worker
+from .letters import normalize_text
+from .lexicon.store import Lexicon
+from .rules import BoardRules
+from .session_store import DEFAULT_TTL, SessionStore
+from .typing import GeneratedBoard
+
+MAX_HEADER_LINES = 100
+MAX_BODY = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class BoardCache:
+    """LRU cache of generated boards that also deduplicates in-flight generation."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._boards: "OrderedDict[Tuple, GeneratedBoard]" = OrderedDict()
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def get(self, key: Tuple) -> Optional[GeneratedBoard]:
+        board = self._boards.get(key)
+        if board is not None:
+            self._boards.move_to_end(key)
+        return board
+
+    def put(self, key: Tuple, board: GeneratedBoard):
+        self._boards[key] = board
+        self._boards.move_to_end(key)
+        while len(self._boards) > self.maxsize:
+            self._boards.popitem(last=False)
+
+    async def get_or_create(self, key: Tuple, create) -> GeneratedBoard:
+        """Cached board for `key`, or the result of awaiting `create()` (run once per key)."""
+        board = self.get(key)
+        if board is not None:
+            self.hits += 1
+            return board
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        future = asyncio.ensure_future(create())
+        self._pending[key] = future
+        try:
+            board = await asyncio.shield(future)
+        finally:
+            self._pending.pop(key, None)
+        self.put(key, board)
+        return board
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._boards), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class Session:
+    def __init__(self, seed: int, engine: Engine, player: Optional[str] = None):
+        self.seed = seed
+        self.engine = engine
+        self.player = player
+
+
+class BoardService:
+    """Boards, guesses, hints and sessions over one lexicon; transport-independent."""
+
+    def __init__(self, lex: Lexicon, settings: Settings, cache_size: int = 256, max_sessions: int = 10000, workers: int = 1,
+                 store: Optional[SessionStore] = None):
+        self.lex = lex
+        self.settings = settings
+        self.store = store
+        self.fingerprint = lex.fingerprint()
+        self.catalog = load_catalog(lex, settings)
+        self.cache = BoardCache(cache_size)
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.executor: Executor
+        if workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(lex.db_path, self.catalog))
+            self._job = partial(_generate_seed, settings=settings)
+        elif lex.thread_bound:
+            # The SQLite connection cannot be used from the executor thread: open the lexicon again there
+            self.executor = ThreadPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(lex.db_path, self.catalog))
+            self._job = partial(_generate_seed, settings=settings)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+            self._job = partial(_generate_one, lex, settings, search=False, catalog=self.catalog)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.store is not None:
+            self.store.close()
+
+    async def board(self, seed: int) -> GeneratedBoard:
+        key = (seed, settings_hash(self.settings), self.fingerprint)
+        loop = asyncio.get_running_loop()
+        return await self.cache.get_or_create(key, lambda: loop.run_in_executor(self.executor, partial(self._job, seed=seed)))
+
+    @staticmethod
+    def board_data(seed: int, board: GeneratedBoard, words: bool = False) -> Dict[str, Any]:
+        data = {
+            "seed": seed,
+            "required": board.letters.required,
+            "others": list(board.letters.others),
+            "total_words": len(board.words),
+            "total_points": board.total_points,
+            "threshold": board.threshold,
+        }
+        if words:
+            data["words"] = {w.text: board.scores[w.text] for w in board.words}
+        return data
+
+    async def check(self, seed: int, word: str) -> Dict[str, Any]:
+        """What `Engine.guess` would answer for `word` on a fresh board."""
+        board = await self.board(seed)
+        required = board.letters.required.lower()
+        text = normalize_text(word)
+        error = BoardRules.compile(required, [required, *(c.lower() for c in board.letters.others)]).check(text)
+        points = None if error else board.scores.get(text)
+        if error is None and points is None:
+            error = "not in solution"
+        return {"ok": error is None, "message": error or "ok", "points": points}
+
+    async def new_session(self, seed: int, player: Optional[str] = None) -> Tuple[str, Session]:
+        session = Session(seed, Engine(await self.board(seed)), player if self.store is not None else None)
+        if session.player is not None:
+            session.engine.restore_state(self.store.load(session.player, seed) or {})
+        session_id = secrets.token_urlsafe(12)
+        self.sessions[session_id] = session
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        return session_id, session
+
+    def session(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "unknown session")
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def save(self, session: Session):
+        if session.player is not None:
+            self.store.save(session.player, session.seed, session.engine.state.found, session.engine.state.score)
+
+    async def maintain_store(self, flush_interval: float = 0.05, evict_interval: float = 3600.0):
+        """Flush pending saves every `flush_interval` seconds and evict stale games every `evict_interval`.
+
+        The writes run in the loop's default executor, so a locked database
+        does not hold up requests. A failed flush (say, "database is locked"
+        past the busy timeout) keeps its saves pending for the next one, and
+        a failed eviction waits for the next interval.
+        """
+        loop = asyncio.get_running_loop()
+        next_evict = loop.time()
+        while True:
+            await asyncio.sleep(flush_interval)
+            try:
+                await self.store.flush_async()
+            except Exception as e:
+                print(f"session store flush failed: {type(e).__name__}: {e}", file=sys.stderr)
+            if loop.time() >= next_evict:
+                next_evict = loop.time() + evict_interval
+                try:
+                    await self.store.evict_async()
+                except Exception as e:
+                    print(f"session store eviction failed: {type(e).__name__}: {e}", file=sys.stderr)
+
+    @staticmethod
+    def progress(session: Session) -> Dict[str, Any]:
+        engine = session.engine
+        return {**engine.progress(), "won": engine.is_won(), "found_words": sorted(engine.state.found)}
+
+
+def _seed(text: str) -> int:
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "seed must be an integer")
+
+
+class BoardServer:
+    """Minimal HTTP/1.1 front end (keep-alive, Content-Length bodies) for a BoardService."""
+
+    ROUTES = [
+        ("GET", re.compile(r"/health"), "health"),
+        ("GET", re.compile(r"/board/(-?\d+)"), "get_board"),
+        ("GET", re.compile(r"/board/(-?\d+)/check"), "check"),
+        ("POST", re.compile(r"/session"), "create_session"),
+        ("GET", re.compile(r"/session/([\w-]+)"), "get_session"),
+        ("POST", re.compile(r"/session/([\w-]+)/guess"), "guess"),
+        ("POST", re.compile(r"/session/([\w-]+)/hint"), "hint"),
+    ]
+
+    def __init__(self, service: BoardService):
+        self.service = service
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                status, payload = await self.dispatch(method, target, body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf8")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, version = line.decode("latin-1").split()
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY:
+            raise ValueError("request body too large")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, headers, body, keep_alive
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        allowed = False
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.fullmatch(url.path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                return HTTPStatus.BAD_REQUEST, {"error": "invalid JSON body"}
+            if not isinstance(data, dict):
+                return HTTPStatus.BAD_REQUEST, {"error": "request body must be a JSON object"}
+            try:
+                return HTTPStatus.OK, await getattr(self, name)(*match.groups(), query=query, data=data)
+            except HTTPError as e:
+                return e.status, {"error": e.message}
+            except Exception as e:  # a failed generation must not take the connection down
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+        if allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "method not allowed"}
+        return HTTPStatus.NOT_FOUND, {"error": "not found"}
+
+    async def health(self, query, data):
+        return {"fingerprint": self.service.fingerprint, "cache": self.service.cache.stats(), "sessions": len(self.service.sessions)}
+
+    async def get_board(self, seed, query, data):
+        seed = _seed(seed)
+        board = await self.service.board(seed)
+        return self.service.board_data(seed, board, words=query.get("words") in ("1", "true"))
+
+    async def check(self, seed, query, data):
+        if "word" not in query:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "missing word")
+        return await self.service.check(_seed(seed), query["word"])
+
+    async def create_session(self, query, data):
+        seed = _seed(data.get("seed", random.getrandbits(32)))
+        player = data.get("player")
+        if player is not None and not isinstance(player, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "player must be a string")
+        session_id, session = await self.service.new_session(seed, player)
+        board = session.engine.state.board
+        return {"session": session_id, "board": self.service.board_data(seed, board), "progress": self.service.progress(session)}
+
+    async def get_session(self, session_id, query, data):
+        session = self.service.session(session_id)
+        return {"seed": session.seed, "progress": self.service.progress(session)}
+
+    async def guess(self, session_id, query, data):
+        session = self.service.session(session_id)
+        words = data.get("words", [data["word"]] if "word" in data else None)
+        if not isinstance(words, list) or not all(isinstance(w, str) for w in words):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "expected \"word\" or a \"words\" list")
+        results = [{"word": w, "ok": ok, "message": message, "points": points}
+                   for w, (ok, message, points) in zip(words, session.engine.guess_many(words))]
+        if any(r["ok"] for r in results):
+            self.service.save(session)
+        return {"results": results, "progress": self.service.progress(session)}
+
+    async def hint(self, session_id, query, data):
+        session = self.service.session(session_id)
+        hint, cost = session.engine.get_hint(self.service.settings.hint_cost)
+        if cost:
+            self.service.save(session)
+        return {"hint": hint, "cost": cost, "grid": session.engine.hint_grid(), "progress": self.service.progress(session)}
+
+
+async def serve(service: BoardService, host: str, port: int, flush_interval: float = 0.05):
+    server = await BoardServer(service).start(host, port)
+    addresses = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+    print(f"Serving boards on {addresses} (lexicon {service.fingerprint[:16]})")
+    maintenance = asyncio.ensure_future(service.maintain_store(flush_interval)) if service.store is not None else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if maintenance is not None:
+            maintenance.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="itbee-server", description="Serve boards, guesses and hints over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--lexicon", type=Path, default=None, help="lexicon file (default: the CLI's lexicon)")
+    parser.add_argument("--cache-size", type=int, default=256, help="boards kept in the LRU cache")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="sessions kept in memory (least recently used are dropped)")
+    parser.add_argument("--workers", type=int, default=1, help="generate boards in a pool of this many processes")
+    parser.add_argument("--session-db", type=Path, default=None, help="SQLite file keeping players' games across restarts")
+    parser.add_argument("--session-ttl", type=float, default=DEFAULT_TTL, help="seconds before an idle stored game is evicted")
+    parser.add_argument("--flush-interval", type=float, default=0.05, help="seconds between batched session writes")
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    lex = Lexicon(args.lexicon, cache_dir=settings.data_path / "cache")
+    store = SessionStore(args.session_db, ttl=args.session_ttl) if args.session_db else None
+    service = BoardService(lex, settings, args.cache_size, args.max_sessions, args.workers, store=store)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.flush_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
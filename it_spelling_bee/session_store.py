@@ -0,0 +1,184 @@
+"""SQLite session store for many players, keyed by (player, seed).
+
+Meant for a server holding many games at once; the CLI keeps using
+`persistence.py`. `save` only records the latest state of a game in
+memory: repeated saves of one game between flushes cost one row, and
+`flush` writes every pending game in a single transaction (one
+`executemany` upsert). `load` sees pending saves, and returns the dict
+`Engine.restore_state` takes:
+
+    engine.restore_state(store.load(player, seed) or {})
+
+The database runs in WAL mode, so readers in other processes are not
+blocked by a flush, with `synchronous=NORMAL` (a power loss can drop the
+last flushes, never corrupt the file). Games not saved for `ttl` seconds
+are deleted by `evict`.
+
+`flush_async` and `evict_async` run the SQL in the event loop's default
+executor, so a database locked by another process (up to the 5 s busy
+timeout) does not stall the loop; `load` reads through a second
+connection, which WAL never blocks. Every other method is called from
+the loop thread.
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Key = Tuple[str, int]
+
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_BATCH = 5000
+
+CREATE_SESSIONS = """
+CREATE TABLE IF NOT EXISTS sessions (
+    player TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    found TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (player, seed)
+) WITHOUT ROWID
+"""
+CREATE_UPDATED_INDEX = "CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated)"
+UPSERT = """
+INSERT INTO sessions (player, seed, score, found, updated) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (player, seed) DO UPDATE SET score = excluded.score, found = excluded.found, updated = excluded.updated
+"""
+
+
+def _row(score: int, found: str) -> Dict[str, Any]:
+    return {"score": score, "found": found.split(" ") if found else []}
+
+
+class SessionStore:
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL, batch_size: int = DEFAULT_BATCH,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.clock = clock
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; flush() opens its own transaction
+        self._conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(CREATE_SESSIONS)
+        self._conn.execute(CREATE_UPDATED_INDEX)
+        # Writes may come from an executor thread; one at a time on _conn
+        self._lock = threading.Lock()
+        self._reader = sqlite3.connect(str(path), check_same_thread=False)
+        self._pending: Dict[Key, Tuple[int, str, float]] = {}
+        # Batches taken by a flush and not yet committed, still visible to load()
+        self._in_flight: List[Dict[Key, Tuple[int, str, float]]] = []
+        self.flushes = 0
+        self.rows_written = 0
+
+    def load(self, player: str, seed: int) -> Optional[Dict[str, Any]]:
+        """{"score", "found"} of a game, or None if there is none."""
+        key = (player, seed)
+        for batch in (self._pending, *reversed(self._in_flight)):
+            pending = batch.get(key)
+            if pending is not None:
+                return _row(pending[0], pending[1])
+        row = self._reader.execute("SELECT score, found FROM sessions WHERE player = ? AND seed = ?", key).fetchone()
+        return _row(*row) if row else None
+
+    def save(self, player: str, seed: int, found: Iterable[str], score: int):
+        """Record a game's state; written by the next flush (automatic every `batch_size` games)."""
+        self._pending[(player, seed)] = (score, " ".join(sorted(found)), self.clock())
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def _take(self) -> Tuple[Dict[Key, Tuple[int, str, float]], List[tuple]]:
+        """Move the pending games into an in-flight batch; returns it and its rows."""
+        batch, self._pending = self._pending, {}
+        self._in_flight.append(batch)
+        return batch, [(player, seed, score, found, updated) for (player, seed), (score, found, updated) in batch.items()]
+
+    def _write(self, rows: List[tuple]) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(UPSERT, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _settle(self, batch: Dict[Key, Tuple[int, str, float]], written: bool):
+        self._in_flight = [b for b in self._in_flight if b is not batch]
+        if written:
+            self.flushes += 1
+            self.rows_written += len(batch)
+        else:
+            # Failed: back to pending for the next flush, unless saved again since
+            for key, value in batch.items():
+                self._pending.setdefault(key, value)
+
+    def flush(self) -> int:
+        """Write all pending games in one transaction; returns how many.
+
+        If the write fails, the games stay pending.
+        """
+        if not self._pending:
+            return 0
+        batch, rows = self._take()
+        written = False
+        try:
+            n = self._write(rows)
+            written = True
+            return n
+        finally:
+            self._settle(batch, written)
+
+    async def flush_async(self) -> int:
+        """flush() with the transaction run in the loop's default executor."""
+        if not self._pending:
+            return 0
+        batch, rows = self._take()
+        written = False
+        try:
+            n = await asyncio.get_running_loop().run_in_executor(None, self._write, rows)
+            written = True
+            return n
+        finally:
+            self._settle(batch, written)
+
+    def delete(self, player: str, seed: int):
+        """Forget a game; one already taken by a flush under way is still written."""
+        self._pending.pop((player, seed), None)
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE player = ? AND seed = ?", (player, seed))
+
+    def _evict_stale_pending(self, cutoff: float) -> int:
+        stale = [key for key, (_, _, updated) in self._pending.items() if updated < cutoff]
+        for key in stale:
+            del self._pending[key]
+        return len(stale)
+
+    def _delete_before(self, cutoff: float) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE updated < ?", (cutoff,)).rowcount
+
+    def evict(self) -> int:
+        """Delete games last saved more than `ttl` seconds ago; returns how many."""
+        cutoff = self.clock() - self.ttl
+        return self._evict_stale_pending(cutoff) + self._delete_before(cutoff)
+
+    async def evict_async(self) -> int:
+        """evict() with the DELETE run in the loop's default executor."""
+        cutoff = self.clock() - self.ttl
+        stale = self._evict_stale_pending(cutoff)
+        return stale + await asyncio.get_running_loop().run_in_executor(None, self._delete_before, cutoff)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._reader.close()
+            self._conn.close()
@@ -1,5 +1,7 @@
+from array import array
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field, asdict
-from typing import Iterable, Tuple, Dict, List
+from typing import Any, Iterable, Iterator, Optional, Tuple, Dict
 
 
 @dataclass
@@ -10,6 +12,8 @@ class Letters:
 
 @dataclass
 class WordEntry:
+    # No per-instance dict: lexicon backends create these in bulk
+    __slots__ = ("text", "zipf", "mask")
     text: str
     zipf: float
     mask: int
@@ -17,12 +21,97 @@ class WordEntry:
     def to_dict(self) -> Dict:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WordEntry":
+        return cls(text=data["text"], zipf=data["zipf"], mask=data["mask"])
+
+
+class BoardWords(Sequence):
+    """A board's words as ids into a word source (a `WordStore` or
+    `BinaryLexicon`: anything with `entry(i)` and `text(i)`).
+
+    Reads like a list of `WordEntry`, each one a view created on access;
+    pickles as a plain list, so the source is never sent along.
+    """
+    __slots__ = ("_source", "ids")
+
+    def __init__(self, source: Any, ids: array):
+        self._source = source
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._source.entry(j) for j in self.ids[i]]
+        return self._source.entry(self.ids[i])
+
+    def __iter__(self) -> Iterator[WordEntry]:
+        return map(self._source.entry, self.ids)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class BoardScores(Mapping):
+    """Points of a board's words by text, over the same ids as `BoardWords`.
+
+    Held as one byte per word (points are capped at 50); the text-keyed
+    dict is built on the first lookup, so a board that is generated but
+    never played holds no word text. Pickles as a plain dict.
+    """
+    __slots__ = ("_source", "_ids", "_points", "_scores")
+
+    def __init__(self, source: Any, ids: array, points: array):
+        self._source = source
+        self._ids = ids
+        self._points = points
+        self._scores: Optional[Dict[str, int]] = None
+
+    def _dict(self) -> Dict[str, int]:
+        if self._scores is None:
+            self._scores = dict(zip(map(self._source.text, self._ids), self._points))
+        return self._scores
+
+    def __getitem__(self, text: str) -> int:
+        return self._dict()[text]
+
+    def get(self, text: str, default=None):
+        return self._dict().get(text, default)
+
+    def __contains__(self, text) -> bool:
+        return text in self._dict()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dict())
+
+    def __len__(self) -> int:
+        return len(self._dict())
+
+    def __repr__(self) -> str:
+        return repr(self._dict())
+
+    def __reduce__(self):
+        return dict, (self._dict(),)
+
 
 @dataclass
 class GeneratedBoard:
     letters: Letters
-    words: List[WordEntry] = field(default_factory=list)
-    scores: Dict[str, int] = field(default_factory=dict)
+    # Lists for boards read back from JSON; id views for generated ones
+    words: Sequence = field(default_factory=list)
+    scores: Mapping = field(default_factory=dict)
     total_points: int = 0
     threshold: int = 0
     mask: int = 0
@@ -31,9 +120,22 @@ class GeneratedBoard:
         return {
             "letters": asdict(self.letters),
             "words": [w.to_dict() for w in self.words],
-            "scores": self.scores,
+            "scores": dict(self.scores),
             "total_points": self.total_points,
             "threshold": self.threshold,
             "mask": self.mask,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GeneratedBoard":
+        """Inverse of `to_dict`."""
+        letters = data["letters"]
+        return cls(
+            letters=Letters(required=letters["required"], others=tuple(letters["others"])),
+            words=[WordEntry.from_dict(w) for w in data["words"]],
+            scores=dict(data["scores"]),
+            total_points=data["total_points"],
+            threshold=data["threshold"],
+            mask=data["mask"],
+        )
+
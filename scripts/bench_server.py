@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the board server (it_spelling_bee/server.py).
+
+Starts a local server in a subprocess (or uses --host/--port of a running
+one) and runs --clients concurrent keep-alive clients. Each client loop
+fetches a board from a pool of --seeds seeds (so the LRU cache sees both
+hits and misses), starts a session, submits --guesses guesses, asks for a
+hint and reads the session progress. Prints throughput, per-endpoint
+latency percentiles and the server's cache stats.
+
+Usage:
+    python scripts/bench_server.py --lexicon ~/.it_spelling_bee/lexicon.sqlite --clients 16 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+async def call(reader, writer, method, path, body=None):
+    data = b"" if body is None else json.dumps(body).encode("utf-8")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    payload = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f"{method} {path} -> {status}: {payload}")
+    return payload
+
+
+async def client(host, port, args, deadline, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def timed(name, method, path, body=None):
+        t0 = time.perf_counter()
+        result = await call(reader, writer, method, path, body)
+        latencies.setdefault(name, []).append(time.perf_counter() - t0)
+        return result
+
+    try:
+        while time.perf_counter() < deadline:
+            seed = rng.randrange(args.seeds)
+            board = await timed("board", "GET", f"/board/{seed}?words=1")
+            session = (await timed("session", "POST", "/session", {"seed": seed}))["session"]
+            letters = [board["required"], *board["others"]]
+            words = list(board["words"])
+            for _ in range(args.guesses):
+                # Mostly real words, some random strings that fail validation
+                word = rng.choice(words) if words and rng.random() < 0.7 else "".join(rng.choices(letters, k=rng.randint(3, 8)))
+                await timed("guess", "POST", f"/session/{session}/guess", {"word": word})
+            await timed("hint", "POST", f"/session/{session}/hint")
+            await timed("progress", "GET", f"/session/{session}")
+    finally:
+        writer.close()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run(host, port, args):
+    latencies = {}
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(client(host, port, args, deadline, latencies, random.Random(i)) for i in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    health = await call(reader, writer, "GET", "/health")
+    writer.close()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{total:,} requests in {elapsed:.1f}s with {args.clients} clients: {total / elapsed:,.0f} req/s")
+    print(f"{'endpoint':<10}{'count':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, values in latencies.items():
+        print(f"{name:<10}{len(values):>8}{percentile(values, 0.5) * 1000:9.2f}"
+              f"{percentile(values, 0.95) * 1000:9.2f}{percentile(values, 0.99) * 1000:9.2f}")
+    print(f"board cache: {health['cache']}")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(host, port, proc, timeout=120):
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < timeout:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited with status {proc.returncode}")
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return time.perf_counter() - t0
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit("server did not start")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load benchmark for the board server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="benchmark a running server instead of starting one")
+    parser.add_argument("--lexicon", default=None, help="lexicon for the local server")
+    parser.add_argument("--workers", type=int, default=1, help="generation processes for the local server")
+    parser.add_argument("--cache-size", type=int, default=256)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--seeds", type=int, default=50, help="number of distinct seeds requested")
+    parser.add_argument("--guesses", type=int, default=10, help="guesses per session")
+    args = parser.parse_args(argv)
+
+    proc = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        cmd = [sys.executable, "-m", "it_spelling_bee.server", "--host", args.host, "--port", str(port),
+               "--cache-size", str(args.cache_size), "--workers", str(args.workers)]
+        if args.lexicon:
+            cmd += ["--lexicon", args.lexicon]
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL)
+        print(f"Server ready in {wait_for(args.host, port, proc):.1f}s")
+    try:
+        asyncio.run(run(args.host, port, args))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == '__main__':
+    main()
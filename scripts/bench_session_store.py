@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Write-throughput benchmark for the SQLite session store (it_spelling_bee/session_store.py).
+
+Simulates --players players, each playing one of --seeds boards, sending
+guesses for --duration seconds: every guess is one `save` of that
+player's game (found words and score), and the store is flushed every
+--flush-interval seconds, as the server does. With --readers N, N other
+processes load random games from the same database meanwhile, to check
+that WAL readers neither block nor are blocked by the writer.
+
+Prints saves/s (what the server asks of the store), rows committed/s
+(saves left after coalescing repeated saves of one game), the flush
+latency percentiles and the readers' loads/s.
+
+Usage:
+    python scripts/bench_session_store.py --players 100000 --duration 10 --readers 2
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from it_spelling_bee.session_store import SessionStore  # noqa: E402
+
+
+def player_name(i):
+    return f"player-{i:08d}"
+
+
+def reader(path, players, seeds, stop, counter):
+    store = SessionStore(Path(path))
+    rng = random.Random(os.getpid())
+    n = 0
+    while not stop.is_set():
+        store.load(player_name(rng.randrange(players)), rng.randrange(seeds))
+        n += 1
+    with counter.get_lock():
+        counter.value += n
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SessionStore write throughput")
+    parser.add_argument("--db", default=None, help="database file (default: a temporary one)")
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--seeds", type=int, default=20, help="boards being played")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--readers", type=int, default=0, help="concurrent reader processes")
+    args = parser.parse_args(argv)
+
+    tmp = None
+    if args.db is None:
+        tmp = tempfile.TemporaryDirectory()
+        args.db = os.path.join(tmp.name, "sessions.sqlite")
+    store = SessionStore(Path(args.db), batch_size=args.batch_size)
+    rng = random.Random(0)
+    vocabulary = [f"parola{i:04d}" for i in range(2000)]
+    games = {}
+
+    stop = multiprocessing.Event()
+    counter = multiprocessing.Value("q", 0)
+    procs = [multiprocessing.Process(target=reader, args=(args.db, args.players, args.seeds, stop, counter))
+             for _ in range(args.readers)]
+    for p in procs:
+        p.start()
+
+    saves = 0
+    flush_times = []
+    start = time.perf_counter()
+    next_flush = start + args.flush_interval
+    while True:
+        now = time.perf_counter()
+        if now - start >= args.duration:
+            break
+        for _ in range(1000):
+            key = (player_name(rng.randrange(args.players)), rng.randrange(args.seeds))
+            found, score = games.get(key, ((), 0))
+            found = (*found, rng.choice(vocabulary))
+            games[key] = (found, score + len(found[-1]))
+            store.save(key[0], key[1], found, score + len(found[-1]))
+        saves += 1000
+        if now >= next_flush:
+            t0 = time.perf_counter()
+            store.flush()
+            flush_times.append(time.perf_counter() - t0)
+            next_flush = time.perf_counter() + args.flush_interval
+    t0 = time.perf_counter()
+    store.flush()
+    flush_times.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for p in procs:
+        p.join()
+    store.close()
+
+    print(f"{saves:,} saves in {elapsed:.1f}s over {len(games):,} games")
+    print(f"saves/s           {saves / elapsed:12,.0f}")
+    print(f"rows committed/s  {store.rows_written / elapsed:12,.0f}  ({store.flushes:,} transactions)")
+    print(f"flush ms          p50 {percentile(flush_times, 0.5) * 1000:.1f}  p99 {percentile(flush_times, 0.99) * 1000:.1f}"
+          f"  max {max(flush_times) * 1000:.1f}")
+    if args.readers:
+        print(f"reader loads/s    {counter.value / elapsed:12,.0f}  ({args.readers} processes)")
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,289 @@
 #!/usr/bin/env python3
 """
 Export the Italian lexicon from SQLite to JSON for client-side use.
-Outputs a simple JSON array of word strings.
+
+Formats (--format):
+    plain   a JSON array of word strings (web/words.json, the original format)
+    masks   {"v", "format", "count", "groups": [[mask, "word word ..."], ...]},
+            words grouped by letter mask (bit 0 = 'a'), ascending by mask
+    front   {"v", "format", "count", "words": "0abaco 5ndonare ..."}, the sorted
+            words front-coded: each item is the length of the prefix shared
+            with the previous word, then the rest of the word.
+            --with-masks adds a parallel "masks" array.
+
+Next to the export it writes precompressed `.gz` and `.br` siblings (`.br`
+needs the `brotli` package) for servers that serve them as-is, and
+`words.manifest.json` with the file name, format, word count and the
+fingerprint the web client uses (first 16 hex digits of the SHA-256 of the
+file), so a client can tell whether its cached copy is current by fetching
+the manifest alone. Sizes and parse times are printed against the plain
+format.
+
+With --hashed the export is content-addressed: the fingerprint goes into
+the file name (`words.<fingerprint>.json`), so the file never changes and
+can be cached as immutable; only the small manifest needs a short TTL.
+(web/_headers caches every `words.*.json` as immutable except the manifest
+and the unhashed default names `words.front.json` and `words.masks.json`,
+so an unhashed export should keep its default name.)
+Each hashed export also writes delta files from the previous versions
+listed in the old manifest (up to --keep-versions):
+
+    words.delta.<from>.<to>.json  {"v", "from", "to", "count", "add": [...], "remove": [...]}
+
+and lists them under "deltas" in the manifest, keyed by the old
+fingerprint, so a returning client can patch its cached word list instead
+of downloading the whole export after a small whitelist/blacklist change.
+
+Usage:
+    python scripts/export_lexicon_to_json.py --format front
+    python scripts/export_lexicon_to_json.py --words web/words.json --format masks --compare
+    python scripts/export_lexicon_to_json.py --format front --hashed
 """
 
-import sqlite3
+import argparse
+import gzip
+import hashlib
 import json
 import os
+import sqlite3
+import time
+
+FORMAT_VERSION = 1
+FORMATS = ("plain", "masks", "front")
+MANIFEST_NAME = "words.manifest.json"
+KEEP_VERSIONS = 5
+
+
+# As it_spelling_bee.letters; kept local so the script runs without the package
+LETTER_TO_BIT = {ch: 1 << i for i, ch in enumerate("abcdefghijklmnopqrstuvwxyz")}
+
+
+def mask_of(word):
+    """Letter mask of a normalised word; characters outside a-z set no bit."""
+    mask = 0
+    for ch in word:
+        mask |= LETTER_TO_BIT.get(ch, 0)
+    return mask
+
+
+def encode_words(words, fmt="plain", with_masks=False):
+    """Encode sorted, distinct words in the given format; returns the JSON text."""
+    if fmt == "plain":
+        payload = words
+    elif fmt == "masks":
+        groups = {}
+        for w in words:
+            groups.setdefault(mask_of(w), []).append(w)
+        payload = {
+            "v": FORMAT_VERSION,
+            "format": "masks",
+            "count": len(words),
+            "groups": [[mask, " ".join(groups[mask])] for mask in sorted(groups)],
+        }
+    elif fmt == "front":
+        items = []
+        prev = ""
+        for w in words:
+            n = 0
+            limit = min(len(w), len(prev))
+            while n < limit and w[n] == prev[n]:
+                n += 1
+            items.append(f"{n}{w[n:]}")
+            prev = w
+        payload = {"v": FORMAT_VERSION, "format": "front", "count": len(words), "words": " ".join(items)}
+        if with_masks:
+            payload["masks"] = [mask_of(w) for w in words]
+    else:
+        raise ValueError(f"unknown format: {fmt}")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_words(text):
+    """Inverse of encode_words: the sorted word list (as in `web/lexicon-loader.js`)."""
+    payload = json.loads(text)
+    if isinstance(payload, list):
+        return payload
+    fmt = payload.get("format")
+    if fmt == "masks":
+        words = [w for _, group in payload["groups"] for w in group.split(" ")]
+        words.sort()
+        return words
+    if fmt == "front":
+        words = []
+        prev = ""
+        # "".split(" ") is [""]: an empty export has no items
+        for item in payload["words"].split(" ") if payload["words"] else []:
+            i = 0
+            while item[i].isdigit():
+                i += 1
+            prev = prev[:int(item[:i])] + item[i:]
+            words.append(prev)
+        return words
+    raise ValueError(f"unknown lexicon format: {fmt!r}")
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
 
-def export_lexicon_to_json():
-    # Paths
+def compressed_sizes(data):
+    """{'gzip': bytes, 'br': bytes} of the compressed payload; 'br' only with brotli installed."""
+    out = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        out["br"] = brotli.compress(data, quality=11)
+    return out
+
+
+def parse_time(text, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        decode_words(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def read_words(db_path=None, words_path=None):
+    if words_path:
+        with open(words_path, encoding="utf-8") as f:
+            words = decode_words(f.read())
+    else:
+        conn = sqlite3.connect(db_path)
+        try:
+            words = [row[0] for row in conn.execute("SELECT clean_form FROM words ORDER BY clean_form")]
+        finally:
+            conn.close()
+    return sorted(set(words))
+
+
+def hashed_path(path, fp):
+    """words.json -> words.<fp>.json"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{fp}{ext}"
+
+
+def read_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == FORMAT_VERSION else None
+
+
+def write_deltas(out_dir, previous, words, fp, keep=KEEP_VERSIONS):
+    """Write deltas to `words` from the versions in the previous manifest.
+
+    Returns (deltas, history) for the new manifest: {old fingerprint: delta
+    file} and the newest-first list of up to `keep` versions, each
+    {"fingerprint", "file"}. Versions whose export file is gone are dropped.
+    """
+    history = [{"fingerprint": fp, "file": None}]
+    if previous:
+        older = previous.get("history") or [{"fingerprint": previous["fingerprint"], "file": previous["file"]}]
+        history += [v for v in older if v["fingerprint"] != fp]
+    deltas = {}
+    current = set(words)
+    for version in history[1:keep]:
+        try:
+            with open(os.path.join(out_dir, version["file"]), encoding="utf-8") as f:
+                old = set(decode_words(f.read()))
+        except (OSError, ValueError):
+            continue
+        name = f"words.delta.{version['fingerprint']}.{fp}.json"
+        delta = {
+            "v": FORMAT_VERSION,
+            "from": version["fingerprint"],
+            "to": fp,
+            "count": len(words),
+            "add": sorted(current - old),
+            "remove": sorted(old - current),
+        }
+        with open(os.path.join(out_dir, name), 'w', encoding='utf-8') as f:
+            json.dump(delta, f, ensure_ascii=False, separators=(",", ":"))
+        deltas[version["fingerprint"]] = name
+    kept = [v for v in history[1:keep] if v["fingerprint"] in deltas]
+    return deltas, history[:1] + kept
+
+
+def export_lexicon_to_json(argv=None):
     home = os.path.expanduser("~")
-    db_path = os.path.join(home, '.it_spelling_bee', 'lexicon.sqlite')
-    output_path = os.path.join(os.path.dirname(__file__), '..', 'web', 'words.json')
-    
-    # Connect to SQLite
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Get all words
-    cursor.execute("SELECT clean_form FROM words ORDER BY clean_form")
-    words = [row[0] for row in cursor.fetchall()]
-    
-    conn.close()
-    
-    # Write to JSON
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(words, f, ensure_ascii=False)
-    
-    # Stats
-    file_size = os.path.getsize(output_path)
-    print(f"✅ Exported {len(words):,} words to {output_path}")
-    print(f"📦 File size: {file_size:,} bytes ({file_size / 1024:.1f} KB)")
-    print(f"💡 Gzipped size will be ~{file_size / 1024 / 3:.1f} KB")
+    web_dir = os.path.join(os.path.dirname(__file__), '..', 'web')
+
+    parser = argparse.ArgumentParser(description="Export the lexicon for the web client")
+    parser.add_argument("--db", default=os.path.join(home, '.it_spelling_bee', 'lexicon.sqlite'), help="SQLite lexicon to export")
+    parser.add_argument("--words", default=None, help="re-encode an existing export instead of reading --db")
+    parser.add_argument("--format", choices=FORMATS, default="plain")
+    parser.add_argument("--with-masks", action="store_true", help="include letter masks (front format)")
+    parser.add_argument("--out", default=None, help="output file (default: web/words.json, web/words.<format>.json)")
+    parser.add_argument("--no-compress", action="store_true", help="do not write .gz/.br siblings")
+    parser.add_argument("--compare", action="store_true", help="print size and parse-time comparison with every format")
+    parser.add_argument("--hashed", action="store_true", help="content-addressed file name plus deltas from previous versions")
+    parser.add_argument("--keep-versions", type=int, default=KEEP_VERSIONS, help="versions to keep deltas from (--hashed)")
+    args = parser.parse_args(argv)
+
+    words = read_words(args.db, args.words)
+    output_path = args.out or os.path.join(web_dir, "words.json" if args.format == "plain" else f"words.{args.format}.json")
+    text = encode_words(words, args.format, args.with_masks)
+    if decode_words(text) != words:
+        raise SystemExit("export does not round-trip; not writing it")
+    data = text.encode("utf-8")
+    fp = fingerprint(data)
+    out_dir = os.path.dirname(output_path) or "."
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    if args.hashed:
+        previous = read_manifest(manifest_path)
+        output_path = hashed_path(output_path, fp)
+
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    compressed = {} if args.no_compress else compressed_sizes(data)
+    for ext, blob in compressed.items():
+        with open(f"{output_path}.{'gz' if ext == 'gzip' else ext}", 'wb') as f:
+            f.write(blob)
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "file": os.path.basename(output_path),
+        "format": args.format,
+        "count": len(words),
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "fingerprint": fp,
+        "encodings": {ext: len(blob) for ext, blob in compressed.items()},
+    }
+    if args.hashed:
+        manifest["deltas"], history = write_deltas(out_dir, previous, words, fp, args.keep_versions)
+        history[0]["file"] = manifest["file"]
+        manifest["history"] = history
+    # Written last and atomically: the manifest switches clients to the new files
+    tmp = manifest_path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
+
+    print(f"✅ Exported {len(words):,} words to {output_path} ({args.format})")
+    print(f"🔑 Fingerprint {manifest['fingerprint']} written to {manifest_path}")
+    for old_fp, name in manifest.get("deltas", {}).items():
+        print(f"🩹 Delta from {old_fp}: {name} ({os.path.getsize(os.path.join(out_dir, name)):,} bytes)")
+    if "br" not in compressed and not args.no_compress:
+        print("💡 brotli is not installed; skipped .br (pip install brotli)")
+
+    # Size and parse-time comparison against the plain array
+    formats = FORMATS if args.compare else tuple(dict.fromkeys(("plain", args.format)))
+    print(f"\n{'format':<14}{'raw KB':>9}{'gzip KB':>9}{'br KB':>9}{'py parse ms':>13}")
+    for fmt in formats:
+        for masks in ((False, True) if fmt == "front" and args.compare else (args.with_masks and fmt == "front",)):
+            t = encode_words(words, fmt, masks)
+            sizes = compressed_sizes(t.encode("utf-8"))
+            br = f"{len(sizes['br']) / 1024:9.1f}" if "br" in sizes else f"{'-':>9}"
+            label = fmt + ("+masks" if masks else "")
+            print(f"{label:<14}{len(t.encode('utf-8')) / 1024:9.1f}{len(sizes['gzip']) / 1024:9.1f}{br}{parse_time(t) * 1000:13.1f}")
+
 
 if __name__ == '__main__':
     export_lexicon_to_json()
@@ -7,4 +7,8 @@ setup(
     include_package_data=True,
     description='Italian Spelling Bee CLI (minimal MVP)',
     python_requires='>=3.9',
+    extras_require={
+        # Columnar board evaluation (it_spelling_bee/columnar.py)
+        'columnar': ['numpy>=1.21.0'],
+    },
 )
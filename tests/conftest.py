@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from it_spelling_bee.config import settings_hash
+from it_spelling_bee.letters import mask_of
+from it_spelling_bee.lexicon.store import Lexicon
+
+# Every vowel-consonant-vowel-consonant word on a few letters: enough for
+# boards with a handful of words on most seeds
+TOY_WORDS = [f"{v}{c1}{v}{c2}" for v in "aeiou" for c1 in "bcdfg" for c2 in "lmnrt"]
+
+
+def write_jsonl(path, words, zipf=4.0, masks=True):
+    """Write a JSONL lexicon; `words` is a list of words or a {word: zipf} dict.
+
+    With masks=False each line has mask 0, leaving the loader to compute it.
+    """
+    items = words.items() if isinstance(words, dict) else ((w, zipf) for w in words)
+    with path.open("w", encoding="utf8") as fh:
+        for w, z in items:
+            fh.write(json.dumps({"clean_form": w, "zipf": z, "mask": mask_of(w) if masks else 0}) + "\n")
+    return path
+
+
+@pytest.fixture
+def jsonl_writer():
+    return write_jsonl
+
+
+def store_catalog(lex, settings, board):
+    """Store a board catalog holding only `board`'s letters, so every draw picks that board."""
+    from it_spelling_bee.boardcache import catalog_path
+    from it_spelling_bee.catalog import BoardCatalog, CatalogEntry
+    letters = "".join(sorted((board.letters.required, *board.letters.others)))
+    entry = CatalogEntry(letters=letters, required=board.letters.required, words=len(board.words), points=board.total_points)
+    BoardCatalog(lex.fingerprint(), settings_hash(settings), [entry]).save(catalog_path(settings, lex.fingerprint()))
+
+
+@pytest.fixture
+def catalog_writer():
+    return store_catalog
+
+
+@pytest.fixture
+def toy_lexicon_path(tmp_path):
+    return write_jsonl(tmp_path / "lex.jsonl", TOY_WORDS)
+
+
+@pytest.fixture
+def toy_lexicon(toy_lexicon_path):
+    return Lexicon(db_path=toy_lexicon_path)
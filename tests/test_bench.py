@@ -0,0 +1,47 @@
+import json
+import sys
+
+from it_spelling_bee import bench
+from it_spelling_bee.lexicon.store import Lexicon
+
+
+def test_synthetic_words_are_seeded_and_nested():
+    words = bench.synthetic_words(2000, seed=3)
+    assert words == bench.synthetic_words(2000, seed=3)
+    assert words[:500] == bench.synthetic_words(500, seed=3)
+    assert words != bench.synthetic_words(2000, seed=4)
+    texts = [w for w, _ in words]
+    assert len(set(texts)) == 2000
+    assert all(w.isalpha() and w.islower() and len(w) >= 4 and not set(w) & set("jkwxy") for w in texts)
+    assert all(1.0 <= z <= 8.0 for _, z in words) and words[0][1] > words[-1][1]
+    assert bench.parse_size("10k") == 10000 and bench.parse_size("5M") == 5000000
+    assert bench.format_size(5000000) == "5M" and bench.format_size(1500) == "1500"
+
+
+def test_synthetic_lexicons_load_the_same_words(tmp_path):
+    expected = sorted(w for w, _ in bench.synthetic_words(300, seed=1))
+    for suffix in (".jsonl", ".sqlite", ".bin"):
+        path = bench.synthetic_lexicon(tmp_path, 300, 1, suffix)
+        assert sorted(e.text for e in Lexicon(path).iter_all()) == expected
+
+
+def test_suite_results_and_regression_gate(tmp_path, capsys):
+    had_wordfreq = "wordfreq" in sys.modules
+    results = bench.run_suite([300], ["load_jsonl", "engine_guess", "build"], tmp_path, seed=0, repeat=1, log=lambda line: None)
+    assert set(results["metrics"]) == {"load_jsonl@300", "engine_guess@300", "build@300"}
+    assert results["metrics"]["engine_guess@300"]["better"] == "higher"
+    assert ("wordfreq" in sys.modules) == had_wordfreq
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(results))
+    current = json.loads(json.dumps(results))
+    current["metrics"]["load_jsonl@300"]["value"] *= 1.1
+    current["metrics"]["engine_guess@300"]["value"] *= 0.5
+    current_path = tmp_path / "current.json"
+    current_path.write_text(json.dumps(current))
+
+    rows = {row["metric"]: row for row in bench.compare(results, current, threshold=0.25)}
+    assert not rows["load_jsonl@300"]["regressed"] and rows["engine_guess@300"]["regressed"]
+    assert bench.main(["--results", str(current_path), "--compare", str(baseline)]) == 1
+    assert "engine_guess@300" in capsys.readouterr().out
+    assert bench.main(["--results", str(baseline), "--compare", str(baseline)]) == 0
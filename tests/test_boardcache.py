@@ -0,0 +1,100 @@
+import json
+import os
+import random
+import subprocess
+import sys
+
+from it_spelling_bee.boardcache import DiskBoardCache, board_key, lexicon_fingerprint
+from it_spelling_bee.config import Settings
+from it_spelling_bee.generator import generate_board
+from it_spelling_bee.lexicon.store import Lexicon
+from it_spelling_bee.typing import GeneratedBoard
+
+
+def test_board_round_trip_and_key(tmp_path, toy_lexicon_path):
+    settings = Settings(min_valid_words=2, max_valid_words=10, min_total_points=5, max_total_points=50)
+    source = toy_lexicon_path
+    lex = Lexicon(db_path=source, cache_dir=tmp_path / "cache")
+    board = generate_board(lex, settings, random.Random(3))
+    assert GeneratedBoard.from_dict(json.loads(json.dumps(board.to_dict()))) == board
+
+    # Matches the lexicon's own fingerprint with or without a snapshot stamp
+    assert lexicon_fingerprint(source, tmp_path / "cache") == lex.fingerprint()
+    assert lexicon_fingerprint(source, tmp_path / "nocache") == lex.fingerprint()
+    assert lexicon_fingerprint(tmp_path / "missing.jsonl", tmp_path / "cache") is None
+
+    cache = DiskBoardCache(tmp_path / "boards")
+    key = board_key(3, settings, lex.fingerprint())
+    assert cache.get(key) is None
+    cache.put(key, board)
+    assert cache.get(key) == board
+    assert board_key(3, Settings(), lex.fingerprint()) != key
+    assert board_key(3, settings, lex.fingerprint(), search=True) != key
+
+
+def test_cli_draws_from_stored_catalog(tmp_path, toy_lexicon, catalog_writer):
+    from dataclasses import replace
+    from it_spelling_bee import cli
+    from it_spelling_bee.lexicon.binary import write_binary
+    settings = replace(Settings(min_valid_words=2, max_valid_words=10, min_total_points=5, max_total_points=50), data_path=tmp_path, seed=2)
+    write_binary(tmp_path / "lexicon.bin", toy_lexicon.iter_all())
+    lex = Lexicon(db_path=tmp_path / "lexicon.bin")
+    board = generate_board(lex, settings, random.Random(1))
+    catalog_writer(lex, settings, board)
+
+    drawn = cli.load_board(settings, random.Random(2))
+    assert drawn.letters.required == board.letters.required and drawn.scores == board.scores
+    # Cached apart from the sampled board for the same seed
+    assert DiskBoardCache(tmp_path / "boards").get(board_key(2, settings, lex.fingerprint(), catalog=True)) == drawn
+    assert DiskBoardCache(tmp_path / "boards").get(board_key(2, settings, lex.fingerprint())) is None
+
+
+def test_binary_lexicon_fingerprint_is_stamped(tmp_path, toy_lexicon, monkeypatch):
+    from it_spelling_bee.lexicon import snapshot
+    from it_spelling_bee.lexicon.binary import write_binary
+    source = tmp_path / "lexicon.bin"
+    write_binary(source, toy_lexicon.iter_all())
+    expected = snapshot.sha256_of_file(source)
+    assert lexicon_fingerprint(source, tmp_path / "cache") == expected
+
+    # Later starts read the stamp instead of hashing the file again
+    hashed = []
+    monkeypatch.setattr(snapshot, "sha256_of_file", lambda path: hashed.append(path) or expected)
+    assert lexicon_fingerprint(source, tmp_path / "cache") == expected and hashed == []
+
+
+def test_eviction_keeps_recently_used(tmp_path):
+    board = GeneratedBoard.from_dict({"letters": {"required": "a", "others": list("bcdefg")}, "words": [],
+                                      "scores": {}, "total_points": 0, "threshold": 0, "mask": 0})
+    cache = DiskBoardCache(tmp_path, max_bytes=10 ** 9)
+    for i in range(4):
+        cache.put(f"k{i}", board)
+    size = (tmp_path / "k0.json").stat().st_size
+    for i in range(4):
+        os.utime(tmp_path / f"k{i}.json", ns=(i * 10 ** 9, i * 10 ** 9))
+    assert cache.get("k0") == board  # refreshes k0
+    cache.max_bytes = 2 * size
+    cache.evict()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["k0.json", "k3.json"]
+
+
+def test_cli_cache_hit_skips_lexicon(tmp_path):
+    code = (
+        "import sys, json\n"
+        "from it_spelling_bee.cli import run\n"
+        "run(['--seed', '5', '--dumpboard', '--min-valid-words', '1'])\n"
+        "print(json.dumps('it_spelling_bee.lexicon.store' in sys.modules))\n"
+    )
+    env = {**os.environ, "HOME": str(tmp_path), "PYTHONPATH": os.getcwd()}
+
+    def dump():
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+        lines = out.strip().splitlines()
+        return "\n".join(lines[:-1]), json.loads(lines[-1])
+
+    cold, loaded = dump()
+    assert loaded
+    assert len(list((tmp_path / ".it_spelling_bee" / "boards").iterdir())) == 1
+    warm, loaded = dump()
+    assert not loaded
+    assert warm == cold
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch, Mock
 from io import StringIO
 import sys
+from it_spelling_bee.boardcache import DiskBoardCache
 from it_spelling_bee.cli import run
 from it_spelling_bee.typing import Letters, WordEntry, GeneratedBoard
 from it_spelling_bee.letters import mask_of
@@ -25,10 +26,13 @@ def make_mock_board():
     )
 
 @pytest.fixture
-def mock_generate(monkeypatch):
+def mock_generate(monkeypatch, tmp_path):
     def mock_gen(*args, **kwargs):
         return make_mock_board()
     monkeypatch.setattr("it_spelling_bee.cli.generate_board", mock_gen)
+    # Keep mock boards and their sessions out of the real data path
+    monkeypatch.setattr("it_spelling_bee.cli.get_board_cache", lambda settings: DiskBoardCache(tmp_path / "boards"))
+    monkeypatch.setattr("it_spelling_bee.cli.get_session_path", lambda settings: tmp_path / "session.json")
 
 def test_cli_help(mock_generate):
     # Simulate 'help' command followed by 'quit'
@@ -57,6 +61,14 @@ def test_cli_score_command(mock_generate):
         assert "Found 1/3" in out
         assert "Score 4" in out
 
+def test_cli_grid_command(mock_generate):
+    input_stream = StringIO("able\ngrid\nquit\n")
+    with patch("sys.stdin", input_stream), patch("sys.stdout", new_callable=StringIO) as output:
+        run(["--seed", "42", "--no-color"])
+        out = output.getvalue()
+        assert " A:  -  1  1\n F:  1  -  1\n Σ:  1  1  2" in out
+        assert "AB-1" in out and "FA-1" in out
+
 def test_cli_giveup_command(mock_generate):
     # Test 'giveup' showing all words
     input_stream = StringIO("giveup\n")
@@ -77,6 +89,19 @@ def test_cli_shuffle_command(mock_generate):
         assert "[A]" in out  # Required letter should be capitalized
         # Note: Can't test exact shuffle order as it's random
 
+def test_cli_shuffles_same_with_cached_board(mock_generate, monkeypatch):
+    def consuming_gen(lex, settings, rng, catalog=None):
+        rng.random()  # generation draws from the seeded rng; a cache hit does not
+        return make_mock_board()
+    monkeypatch.setattr("it_spelling_bee.cli.generate_board", consuming_gen)
+    monkeypatch.setattr("it_spelling_bee.cli.load_session", lambda path: None)
+    outputs = []
+    for _ in range(2):  # generated, then from the board cache
+        with patch("sys.stdin", StringIO("shuffle\nshuffle\nquit\n")), patch("sys.stdout", new_callable=StringIO) as output:
+            run(["--seed", "42", "--no-color"])
+        outputs.append([line for line in output.getvalue().splitlines() if "[A]" in line])
+    assert len(outputs[0]) == 3 and outputs[0] == outputs[1]
+
 def test_cli_invalid_word(mock_generate):
     # Test submitting invalid word
     input_stream = StringIO("xyz\nquit\n")
@@ -93,4 +118,17 @@ def test_cli_duplicate_word(mock_generate):
         run(["--seed", "42"])
         out = output.getvalue()
         assert "+4 OK" in out  # First submission
-        assert "duplicate" in out  # Second submission
\ No newline at end of file
+        assert "duplicate" in out  # Second submission
+
+def test_cli_generate_command(tmp_path):
+    import json
+    from it_spelling_bee import bench
+    # A .bin lexicon is used in place, so nothing is written to the data path
+    lexicon = bench.synthetic_lexicon(tmp_path, 3000, 0, ".bin")
+    out_file = tmp_path / "boards.jsonl"
+    with patch("sys.stdout", new_callable=StringIO) as output:
+        run(["generate", "--seeds", "3..5", "--out", str(out_file), "--lexicon", str(lexicon), "--min-valid-words", "1"])
+    assert "Wrote 3 boards" in output.getvalue()
+    rows = [json.loads(line) for line in out_file.read_text().splitlines()]
+    assert [r["seed"] for r in rows] == [3, 4, 5]
+    assert all("letters" in r and "scores" in r for r in rows)
@@ -0,0 +1,62 @@
+import json
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from it_spelling_bee.columnar import ColumnarLexicon, generate_board_columnar
+from it_spelling_bee.config import Settings
+from it_spelling_bee.generator import generate_board, evaluate_board, board_mask_of, WeightedLetterSampler
+from it_spelling_bee.letters import LETTER_TO_BIT
+from it_spelling_bee.lexicon.store import Lexicon
+
+
+@pytest.fixture(scope="module")
+def lexicon(tmp_path_factory):
+    rng = random.Random(5)
+    syll = [c + v for c in "bcdfglmnprstvz" for v in "aeiou"] + list("aeiou")
+    words = {"".join(rng.choice(syll) for _ in range(rng.randint(2, 5))) for _ in range(3000)}
+    path = tmp_path_factory.mktemp("lex") / "lex.jsonl"
+    with path.open("w", encoding="utf8") as fh:
+        for w in sorted(words):
+            # include .5 boundaries so rounding must match the scalar path
+            fh.write(json.dumps({"clean_form": w, "zipf": rng.choice([1.25, 3.75, 4.0, rng.uniform(1, 7)]), "mask": 0}) + "\n")
+    return Lexicon(db_path=path)
+
+
+def test_evaluate_matches_scalar(lexicon):
+    settings = Settings()
+    col = ColumnarLexicon.from_lexicon(lexicon)
+    sampler = WeightedLetterSampler()
+    rng = random.Random(1)
+    boards, required_bits, expected = [], [], []
+    for _ in range(50):
+        required, others = sampler.sample_set(rng)
+        board_mask = board_mask_of(required, others)
+        valid, scores, total = evaluate_board(lexicon, board_mask, required, settings)
+
+        idx, col_scores = col.evaluate(board_mask, required, settings)
+        assert {col.entries[i].text: int(s) for i, s in zip(idx, col_scores)} == scores
+
+        boards.append(board_mask)
+        required_bits.append(LETTER_TO_BIT[required])
+        expected.append((len(valid), total))
+
+    counts, totals = col.evaluate_many(boards, required_bits, settings)
+    assert list(zip(counts.tolist(), totals.tolist())) == expected
+
+
+@pytest.mark.parametrize("seed,min_words", [(1, 5), (2, 5), (12345, 5), (7, 10000)])
+def test_generate_board_columnar_matches_scalar(lexicon, seed, min_words):
+    # min_words=10000 is unreachable and exercises the best-failure fallback
+    settings = Settings(min_valid_words=min_words, max_valid_words=max(60, min_words), min_total_points=30, max_total_points=600)
+    rng1, rng2 = random.Random(seed), random.Random(seed)
+    scalar = generate_board(lexicon, settings, rng1)
+    columnar = generate_board_columnar(lexicon, settings, rng2)
+    assert columnar.letters == scalar.letters
+    assert columnar.scores == scalar.scores
+    assert columnar.total_points == scalar.total_points
+    assert columnar.threshold == scalar.threshold
+    # RNG is left in the same state, so later shuffles match too
+    assert rng1.random() == rng2.random()
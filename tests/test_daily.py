@@ -0,0 +1,78 @@
+import json
+import random
+import shutil
+import subprocess
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+from it_spelling_bee.config import Settings
+from it_spelling_bee.daily import daily_seed, seed_day, write_packs
+from it_spelling_bee.generator import generate_board
+
+
+SETTINGS = Settings(min_valid_words=2, max_valid_words=10, min_total_points=5, max_total_points=50)
+
+
+def test_daily_seed_scheme():
+    assert daily_seed(date(2024, 1, 1)) == 100000
+    assert daily_seed(date(2024, 3, 1)) == 100060
+    assert daily_seed(date(2026, 10, 17)) == 101020
+    for seed in (100000, 100365, 101020):
+        assert daily_seed(seed_day(seed)) == seed
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_daily_seed_matches_web_client():
+    with open("web/app.js", encoding="utf8") as fh:
+        source = fh.read()
+    func = source[source.index("function getDailySeed"):source.index("function getTodayDateString")]
+    script = "Date = class extends Date { constructor(...a) { super(...(a.length ? a : [Date.UTC(2026, 9, 17, 23, 30)])); } };\n"
+    out = subprocess.run(["node", "-e", script + func + "console.log(getDailySeed());"], capture_output=True, text=True, check=True)
+    assert int(out.stdout) == daily_seed(date(2026, 10, 17))
+
+
+@pytest.mark.parametrize("pack_by", ["day", "month"])
+def test_packs_match_generate_board(tmp_path, toy_lexicon, pack_by):
+    lex = toy_lexicon
+    days = [date(2026, 10, 30), date(2026, 10, 31), date(2026, 11, 1)]
+    out = tmp_path / "daily"
+    index = json.loads(write_packs(lex, SETTINGS, days, out, pack_by=pack_by).read_text(encoding="utf8"))
+
+    assert index["pack_by"] == pack_by
+    assert (index["first"], index["last"]) == ("2026-10-30", "2026-11-01")
+    expected_packs = 3 if pack_by == "day" else 2
+    assert len(index["packs"]) == expected_packs
+    for day in days:
+        key = day.isoformat() if pack_by == "day" else day.isoformat()[:7]
+        pack = json.loads((out / index["packs"][key]).read_text(encoding="utf8"))
+        entry = pack["days"][day.isoformat()]
+        board = generate_board(lex, SETTINGS, random.Random(daily_seed(day)))
+        assert entry["seed"] == daily_seed(day)
+        assert entry["center"] == board.letters.required
+        assert entry["outer"] == "".join(board.letters.others)
+        assert entry["words"] == sorted(w.text for w in board.words)
+
+
+def test_packs_extend_existing(tmp_path, toy_lexicon):
+    lex = toy_lexicon
+    out = tmp_path / "daily"
+    write_packs(lex, SETTINGS, [date(2026, 10, 1), date(2026, 10, 2)], out)
+    index_path = write_packs(lex, SETTINGS, [date(2026, 10, 3)], out)
+    index = json.loads(index_path.read_text(encoding="utf8"))
+    assert (index["first"], index["last"]) == ("2026-10-01", "2026-10-03")
+    pack = json.loads((out / "2026-10.json").read_text(encoding="utf8"))
+    assert list(pack["days"]) == ["2026-10-01", "2026-10-02", "2026-10-03"]
+
+
+def test_packs_draw_from_stored_catalog(tmp_path, toy_lexicon, catalog_writer):
+    settings = replace(SETTINGS, data_path=tmp_path / "data")
+    board = generate_board(toy_lexicon, settings, random.Random(1))
+    catalog_writer(toy_lexicon, settings, board)
+    days = [date(2026, 10, 30), date(2026, 10, 31)]
+    write_packs(toy_lexicon, settings, days, tmp_path / "daily", pack_by="day")
+    for day in days:
+        entry = json.loads((tmp_path / "daily" / f"{day.isoformat()}.json").read_text(encoding="utf8"))["days"][day.isoformat()]
+        assert entry["center"] == board.letters.required
+        assert entry["words"] == sorted(w.text for w in board.words)
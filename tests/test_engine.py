@@ -89,3 +89,33 @@ def test_engine_game_state():
     state.score += 5
     assert "abc" in state.found
     assert state.score == 5
+
+
+def test_guess_many_matches_sequential_guesses():
+    guesses = ["abc", "ABC", "zzz", "abz", "bcd", "Abcdefg", "abc'", "ade", "ab"]
+    eng = Engine(make_test_board())
+    expected = [eng.guess(w) for w in guesses]
+    assert expected[1] == (False, "duplicate", None)
+    assert expected[3] == (False, "contains invalid letter", None)
+    assert expected[6] == (False, "contains invalid letter", None)
+    assert expected[8] == (False, "not in solution", None)
+
+    eng2 = Engine(make_test_board())
+    assert eng2.guess_many(guesses) == expected
+    assert eng2.state.found == eng.state.found and eng2.state.score == eng.state.score
+
+
+def test_hint_index_tracks_guesses_and_restore():
+    eng = Engine(make_test_board())
+    assert eng.hint_grid() == {"grid": {"a": {3: 2, 7: 1}}, "two_letter": {"ab": 2, "ad": 1}}
+
+    eng.guess_many(["abc", "zzz"])
+    assert eng.hint_grid() == {"grid": {"a": {3: 1, 7: 1}}, "two_letter": {"ab": 1, "ad": 1}}
+    assert eng.get_board_data()["hint_grid"] == eng.hint_grid()
+    for _ in range(20):
+        hint, _ = eng.get_hint()
+        assert hint in ("Hint: ad_ (3 letters)", "Hint: ab_____ (7 letters)")
+
+    eng.restore_state({"found": ["abc", "ade", "abcdefg"], "score": 19})
+    assert eng.hint_grid() == {"grid": {}, "two_letter": {}}
+    assert eng.get_hint() == (None, 0)
@@ -0,0 +1,93 @@
+import hashlib
+import importlib.util
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "export_lexicon_to_json.py"
+spec = importlib.util.spec_from_file_location("export_lexicon_to_json", SCRIPT)
+export = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(export)
+
+WORDS = sorted(["abaco", "abbandonare", "abbandono", "abate", "cane", "canna", "cannone", "nacan", "zuzzurellone", "casa"])
+
+
+@pytest.mark.parametrize("fmt,with_masks", [("plain", False), ("masks", False), ("front", False), ("front", True)])
+def test_formats_round_trip(fmt, with_masks):
+    text = export.encode_words(WORDS, fmt, with_masks)
+    assert export.decode_words(text) == WORDS
+    if with_masks:
+        assert json.loads(text)["masks"] == [export.mask_of(w) for w in WORDS]
+
+
+def test_mask_of_matches_package():
+    from it_spelling_bee.letters import mask_of
+    assert [export.mask_of(w) for w in WORDS] == [mask_of(w) for w in WORDS]
+    # Characters outside a-z set no bit, rather than a wrong one or an error
+    assert export.mask_of("l'acqua") == mask_of("lacqua")
+    assert export.mask_of("perché") == mask_of("perch")
+
+
+@pytest.mark.parametrize("fmt", export.FORMATS)
+def test_empty_export_round_trips(fmt):
+    assert export.decode_words(export.encode_words([], fmt)) == []
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_web_decoder_matches():
+    with open("web/lexicon-loader.js", encoding="utf8") as fh:
+        source = fh.read()
+    func = source[source.index("function decodeLexicon"):source.index("// Fingerprint of a payload")]
+    for words in ([], WORDS):
+        for fmt in export.FORMATS:
+            text = export.encode_words(words, fmt)
+            script = func + f"console.log(JSON.stringify(decodeLexicon({json.dumps(text)})));"
+            out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+            assert json.loads(out.stdout) == words, fmt
+
+
+def test_front_coding_shares_prefixes():
+    payload = json.loads(export.encode_words(["abate", "abbandonare", "abbandono"], "front"))
+    assert payload["words"] == "0abate 2bandonare 8o"
+
+
+def test_export_writes_manifest_and_siblings(tmp_path, capsys):
+    src = tmp_path / "words.json"
+    src.write_text(json.dumps(WORDS), encoding="utf8")
+    out = tmp_path / "words.front.json"
+    export.export_lexicon_to_json(["--words", str(src), "--format", "front", "--out", str(out)])
+
+    data = out.read_bytes()
+    manifest = json.loads((tmp_path / "words.manifest.json").read_text(encoding="utf8"))
+    assert manifest["file"] == "words.front.json"
+    assert manifest["count"] == len(WORDS)
+    assert manifest["fingerprint"] == hashlib.sha256(data).hexdigest()[:16]
+    assert (tmp_path / "words.front.json.gz").exists()
+    assert manifest["encodings"]["gzip"] == (tmp_path / "words.front.json.gz").stat().st_size
+    assert "front" in capsys.readouterr().out
+
+
+def test_hashed_exports_write_deltas(tmp_path):
+    versions = [WORDS[:-2], [w for w in WORDS if w != "cane"], WORDS]
+    src = tmp_path / "src.json"
+    out = tmp_path / "web"
+    out.mkdir()
+    fingerprints = []
+    for words in versions:
+        src.write_text(json.dumps(words), encoding="utf8")
+        export.export_lexicon_to_json(["--words", str(src), "--format", "front", "--hashed", "--out", str(out / "words.json")])
+        manifest = json.loads((out / "words.manifest.json").read_text(encoding="utf8"))
+        fingerprints.append(manifest["fingerprint"])
+        assert manifest["file"] == f"words.{manifest['fingerprint']}.json"
+        assert export.decode_words((out / manifest["file"]).read_text(encoding="utf8")) == sorted(words)
+
+    assert [v["fingerprint"] for v in manifest["history"]] == fingerprints[::-1]
+    assert set(manifest["deltas"]) == set(fingerprints[:2])
+    for old_fp, name in manifest["deltas"].items():
+        delta = json.loads((out / name).read_text(encoding="utf8"))
+        old = versions[fingerprints.index(old_fp)]
+        patched = sorted((set(old) - set(delta["remove"])) | set(delta["add"]))
+        assert delta["to"] == fingerprints[-1] and patched == WORDS
@@ -99,4 +99,85 @@ def test_generate_board_scoring():
         assert 0 < board.scores[word.text] <= 50  # Score within bounds
     
     # Total points should match sum of scores
-    assert board.total_points == sum(board.scores.values())
\ No newline at end of file
+    assert board.total_points == sum(board.scores.values())
+
+CATALOG_SETTINGS = dict(min_valid_words=2, max_valid_words=10, min_total_points=5, max_total_points=50)
+
+
+@pytest.fixture(scope="module")
+def mock_catalog():
+    from it_spelling_bee.catalog import BoardCatalog
+    return BoardCatalog.build(MockLexicon(), Settings(**CATALOG_SETTINGS))
+
+
+def test_catalog_matches_evaluation(mock_catalog):
+    from it_spelling_bee.generator import evaluate_board, board_mask_of
+
+    settings = Settings(**CATALOG_SETTINGS)
+    lex = MockLexicon()
+    catalog = mock_catalog
+    assert catalog.entries
+    for e in catalog.entries[::97]:
+        others = [c for c in e.letters if c != e.required]
+        valid, scores, total = evaluate_board(lex, board_mask_of(e.required, others), e.required, settings)
+        assert (len(valid), total) == (e.words, e.points)
+
+
+def test_generate_board_from_catalog(tmp_path, mock_catalog):
+    from it_spelling_bee.catalog import BoardCatalog
+
+    settings = Settings(**CATALOG_SETTINGS)
+    lex = MockLexicon()
+    catalog = mock_catalog
+    path = tmp_path / "catalog.json"
+    catalog.save(path)
+    catalog = BoardCatalog.load(path)
+
+    board1 = generate_board(lex, settings, random.Random(3), catalog=catalog)
+    board2 = generate_board(lex, settings, random.Random(3), catalog=catalog)
+    assert board1.letters == board2.letters
+    assert settings.min_valid_words <= len(board1.words) <= settings.max_valid_words
+    assert settings.min_total_points <= board1.total_points <= settings.max_total_points
+
+    with pytest.raises(ValueError):
+        generate_board(lex, Settings(), random.Random(3), catalog=catalog)
+
+
+def test_generate_boards_parallel_matches_single(tmp_path):
+    import json
+    from it_spelling_bee.generator import generate_boards
+
+    path = tmp_path / "lex.jsonl"
+    with path.open("w", encoding="utf8") as fh:
+        for w in MockLexicon()._entries:
+            fh.write(json.dumps({"clean_form": w.text, "zipf": w.zipf, "mask": w.mask}) + "\n")
+    lex = Lexicon(db_path=path)
+    settings = Settings(min_valid_words=2, max_valid_words=10, min_total_points=5, max_total_points=50)
+    seeds = list(range(10, 22))
+
+    parallel = list(generate_boards(lex, settings, seeds, workers=3))
+    assert [seed for seed, _ in parallel] == seeds
+    for seed, board in parallel:
+        single = generate_board(lex, settings, random.Random(seed))
+        assert board.to_dict() == single.to_dict()
+
+
+def test_search_board_in_range_and_deterministic():
+    from it_spelling_bee.generator import search_board, evaluate_board, in_range
+    settings = Settings(min_valid_words=6, max_valid_words=7, min_total_points=20, max_total_points=60)
+    lex = MockLexicon()
+    for seed in range(5):
+        board, evaluations = search_board(lex, settings, random.Random(seed))
+        assert 1 <= evaluations <= 1000
+        assert in_range(len(board.words), board.total_points, settings)
+        assert (board, evaluations) == search_board(lex, settings, random.Random(seed))
+        valid, scores, total = evaluate_board(lex, board.mask, board.letters.required, settings)
+        assert board.scores == scores and board.total_points == total
+
+    # Impossible ranges: the budget is respected and the closest board returned
+    impossible = Settings(min_valid_words=500, max_valid_words=600)
+    board, evaluations = search_board(lex, impossible, random.Random(1), max_evaluations=50)
+    assert evaluations == 50 and board.words
+    assert search_board(lex, settings, random.Random(1), max_evaluations=1)[1] == 1
+    with pytest.raises(ValueError):
+        search_board(lex, settings, random.Random(1), max_evaluations=0)
@@ -4,6 +4,7 @@ from it_spelling_bee.letters import (
     mask_includes, 
     normalize_text,
     shuffle_letters,
+    submasks_with,
     LETTER_TO_BIT
 )
 import random
@@ -27,6 +28,16 @@ def test_mask_operations():
     assert not uses_only(mask_of("xyz"), board_mask)
     assert not uses_only(mask_of("abcz"), board_mask)
 
+def test_submasks_with():
+    board_mask = mask_of("abcdefg")
+    bit = LETTER_TO_BIT["a"]
+    subs = list(submasks_with(board_mask, bit))
+    assert len(subs) == 64
+    assert len(set(subs)) == 64
+    assert all(s & bit for s in subs)
+    assert all(uses_only(s, board_mask) for s in subs)
+    assert board_mask in subs and bit in subs
+
 def test_letter_bits():
     # Test each letter maps to unique bit
     seen_bits = set()
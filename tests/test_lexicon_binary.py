@@ -0,0 +1,49 @@
+import random
+
+from it_spelling_bee.lexicon.binary import BinaryLexicon, write_binary
+from it_spelling_bee.lexicon.store import Lexicon
+from it_spelling_bee.letters import mask_of
+
+
+WORDS = {"cane": 5.12, "cena": 4.8, "amico": 4.5, "casa": 5.97, "città": 5.3, "perché": 6.01, "mica": 3.0, "nece": 1.23}
+
+
+def make_lexicons(tmp_path, jsonl_writer):
+    jsonl = Lexicon(db_path=jsonl_writer(tmp_path / "lex.jsonl", WORDS, masks=False))
+    out = tmp_path / "lexicon.bin"
+    write_binary(out, jsonl.iter_all())
+    return jsonl, Lexicon(db_path=out)
+
+
+def test_binary_roundtrip(tmp_path, jsonl_writer):
+    jsonl, binary = make_lexicons(tmp_path, jsonl_writer)
+    assert binary._binary is not None
+    key = lambda e: e.text
+    assert sorted(binary.iter_all(), key=key) == sorted(jsonl.iter_all(), key=key)
+    assert sorted(e.text for e in binary.iter_by_required("a")) == sorted(e.text for e in jsonl.iter_by_required("a"))
+
+
+def test_binary_words_for_board(tmp_path, jsonl_writer):
+    jsonl, binary = make_lexicons(tmp_path, jsonl_writer)
+    rng = random.Random(3)
+    for _ in range(20):
+        board = rng.sample("acemnitpr", 7)
+        board_mask = mask_of("".join(board))
+        expected = sorted(e.text for e in jsonl.words_for_board(board_mask, board[0]))
+        assert sorted(e.text for e in binary.words_for_board(board_mask, board[0])) == expected
+
+
+def test_binary_empty(tmp_path):
+    out = tmp_path / "empty.bin"
+    write_binary(out, [])
+    b = BinaryLexicon(out)
+    assert len(b) == 0
+    assert b.group_range(mask_of("abc")) == (0, 0)
+
+
+def test_binary_exact_zipf(tmp_path, jsonl_writer):
+    jsonl, _ = make_lexicons(tmp_path, jsonl_writer)
+    out = tmp_path / "exact.bin"
+    write_binary(out, [e.__class__(text=e.text, zipf=e.zipf + 0.001, mask=e.mask) for e in jsonl.iter_all()], exact_zipf=True)
+    exact = Lexicon(db_path=out)
+    assert sorted((e.text, e.zipf) for e in exact.iter_all()) == sorted((e.text, e.zipf + 0.001) for e in jsonl.iter_all())
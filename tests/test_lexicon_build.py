@@ -1,12 +1,53 @@
 import sqlite3
 from pathlib import Path
-import os
+
+import tempfile
 
 import pytest
+from hypothesis import given, settings, strategies as st
 
+from it_spelling_bee.letters import normalize_text
 from it_spelling_bee.lexicon import build as build_module
 
 
+def _reference_parse(path, min_len, dic):
+    # The line-by-line text-mode parser the chunked one replaced
+    s = set()
+    with path.open(encoding="utf-8", errors="ignore") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            tok = line.split("/", 1)[0] if dic else line
+            text = normalize_text(tok)
+            if text.isalpha() and len(text) >= min_len:
+                s.add(text)
+    return s
+
+
+_pieces = st.sampled_from(["cane", "Perché", "città/FS", "#x", " ", "/", "è", "\xc3", "\xa8", "\xff", "\r", "\n", "\r\n", "L'amico", "\u2028", "\x85"])
+
+
+@settings(max_examples=200, deadline=None)
+@given(st.lists(_pieces, max_size=40), st.integers(1, 9), st.booleans())
+def test_chunked_parse_matches_line_parser(pieces, n_chunks, dic):
+    data = b"".join(p.encode("latin-1") if p in ("\xc3", "\xa8", "\xff") else p.encode("utf-8") for p in pieces)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "words.dic"
+        path.write_bytes(data)
+        chunked = set()
+        for start, end in build_module._chunk_ranges(path, n_chunks):
+            chunked |= build_module._parse_chunk(path, start, end, 1, dic)
+        assert chunked == _reference_parse(path, 1, dic)
+
+
+def test_parse_dic_in_process_pool(tmp_path, monkeypatch):
+    dic_file = tmp_path / "big.dic"
+    dic_file.write_bytes("".join(f"parola{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}/X\r\nCittà\n" for i in range(2000)).encode("utf-8"))
+    monkeypatch.setattr(build_module, "PARALLEL_MIN_BYTES", 0)
+    assert build_module._parse_dic(dic_file, min_len=2, workers=2) == _reference_parse(dic_file, 2, True)
+
+
 def test_parse_dic_and_lists(tmp_path):
     dic_file = tmp_path / "test.dic"
     dic_file.write_text("""
@@ -76,3 +117,98 @@ def test_build_small_end_to_end(tmp_path, monkeypatch):
     assert "mela" in forms and forms["mela"][1] == "dictionary"
     assert "speciale" in forms and forms["speciale"][1] == "whitelist"
     assert "facebook" not in forms
+
+
+def test_write_db_failure_keeps_previous_lexicon(tmp_path):
+    out_db = tmp_path / "lexicon.sqlite"
+    build_module._write_db(out_db, [("cane", 5.0, 1, "dictionary")], [("build_ts_utc", "old")])
+
+    def rows():
+        yield ("mela", 6.0, 2, "dictionary")
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        build_module._write_db(out_db, rows(), [("build_ts_utc", "new")])
+
+    conn = sqlite3.connect(str(out_db))
+    assert conn.execute("SELECT clean_form FROM words").fetchall() == [("cane",)]
+    assert conn.execute("SELECT value FROM meta WHERE key = 'build_ts_utc'").fetchone() == ("old",)
+    conn.close()
+    assert list(tmp_path.iterdir()) == [out_db]
+
+
+def _install_fake_wordfreq(monkeypatch, toks, zipf):
+    import types
+    fake_mod = types.ModuleType("wordfreq")
+    fake_mod.top_n_list = lambda lang, limit: list(toks)
+    fake_mod.zipf_frequency = lambda tok, lang: zipf.get(tok, 1.0)
+    monkeypatch.setitem(__import__("sys").modules, "wordfreq", fake_mod)
+
+
+def _rows(db):
+    conn = sqlite3.connect(str(db))
+    rows = sorted(conn.execute("SELECT clean_form, zipf, mask, source FROM words"))
+    conn.close()
+    return rows
+
+
+def test_incremental_build_matches_full_build(tmp_path, monkeypatch, capsys):
+    toks = ["cane", "mela", "speciale", "facebook", "gatto", "Gatto", "raro"]
+    zipf = {"cane": 5.0, "mela": 6.0, "speciale": 3.0, "facebook": 8.0, "gatto": 4.0, "Gatto": 4.5, "raro": 2.0}
+    _install_fake_wordfreq(monkeypatch, toks, zipf)
+
+    dict_file = tmp_path / "dict.dic"
+    dict_file.write_text("cane\nmela\ngatto\n")
+    wl_file = tmp_path / "wl.txt"
+    wl_file.write_text("speciale\n")
+    bl_file = tmp_path / "bl.txt"
+    bl_file.write_text("facebook\ngatto\n")
+    out_db = tmp_path / "lexicon.sqlite"
+    build_module.build(out_db, dict_file, wl_file, bl_file, limit=10, min_len=1, binary_path=out_db.with_suffix(".bin"))
+
+    # unblock a dictionary word, whitelist a non-dictionary one, block another
+    wl_file.write_text("raro\n")
+    bl_file.write_text("facebook\ncane\n")
+    build_module.build(out_db, dict_file, wl_file, bl_file, limit=10, min_len=1, binary_path=out_db.with_suffix(".bin"), incremental=True)
+    assert "Incremental build summary" in capsys.readouterr().out
+
+    full_db = tmp_path / "full.sqlite"
+    build_module.build(full_db, dict_file, wl_file, bl_file, limit=10, min_len=1)
+    assert _rows(out_db) == _rows(full_db)
+    assert [r[0] for r in _rows(out_db)] == ["gatto", "mela", "raro"]
+
+    from it_spelling_bee.lexicon.binary import BinaryLexicon
+    assert sorted(e.text for e in BinaryLexicon(out_db.with_suffix(".bin")).iter_entries()) == ["gatto", "mela", "raro"]
+
+    # nothing changed: no rewrite at all
+    before = out_db.stat().st_mtime_ns
+    build_module.build(out_db, dict_file, wl_file, bl_file, limit=10, min_len=1, incremental=True)
+    assert "up to date" in capsys.readouterr().out
+    assert out_db.stat().st_mtime_ns == before
+
+
+def test_no_binary_removes_stale_binary(tmp_path, monkeypatch, capsys):
+    _install_fake_wordfreq(monkeypatch, ["cane", "mela"], {"cane": 5.0, "mela": 6.0})
+    dict_file = tmp_path / "dict.dic"
+    dict_file.write_text("cane\n")
+    out_db = tmp_path / "lexicon.sqlite"
+    build_module.main(["--out", str(out_db), "--dict", str(dict_file), "--limit", "10"])
+    assert out_db.with_suffix(".bin").exists()
+
+    dict_file.write_text("cane\nmela\n")
+    build_module.main(["--out", str(out_db), "--dict", str(dict_file), "--limit", "10", "--no-binary"])
+    assert not out_db.with_suffix(".bin").exists()
+    assert "Removed stale binary lexicon" in capsys.readouterr().out
+
+
+def test_incremental_build_falls_back_when_dictionary_changes(tmp_path, monkeypatch, capsys):
+    _install_fake_wordfreq(monkeypatch, ["cane", "mela"], {"cane": 5.0, "mela": 6.0})
+    dict_file = tmp_path / "dict.dic"
+    dict_file.write_text("cane\n")
+    out_db = tmp_path / "lexicon.sqlite"
+    build_module.build(out_db, dict_file, None, None, limit=10, min_len=1)
+
+    dict_file.write_text("cane\nmela\n")
+    build_module.build(out_db, dict_file, None, None, limit=10, min_len=1, incremental=True)
+    assert "dict_sha256 changed; doing a full build" in capsys.readouterr().out
+    assert [r[0] for r in _rows(out_db)] == ["cane", "mela"]
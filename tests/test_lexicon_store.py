@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from it_spelling_bee.lexicon.store import Lexicon
+from it_spelling_bee.letters import mask_of
+
+
+WORDS = ["cane", "cena", "amico", "casa", "nece", "canna", "ancona", "mica", "mela", "enaca"]
+
+
+def make_jsonl(tmp_path, jsonl_writer):
+    return jsonl_writer(tmp_path / "lex.jsonl", {w: 3.0 + i / 10 for i, w in enumerate(WORDS)}, masks=False)
+
+
+def test_words_for_board_matches_scan(tmp_path, jsonl_writer):
+    lex = Lexicon(db_path=make_jsonl(tmp_path, jsonl_writer))
+    rng = random.Random(7)
+    letters = "acemnilo"
+    for _ in range(30):
+        board = rng.sample(letters, 7)
+        board_mask = mask_of("".join(board))
+        required = board[0]
+        expected = sorted(
+            e.text for e in lex.iter_by_required(required)
+            if (e.mask | board_mask) == board_mask
+        )
+        got = sorted(e.text for e in lex.words_for_board(board_mask, required))
+        assert got == expected
+
+
+def test_words_for_board_required_not_on_board(tmp_path, jsonl_writer):
+    lex = Lexicon(db_path=make_jsonl(tmp_path, jsonl_writer))
+    assert lex.words_for_board(mask_of("acemnio"), "z") == []
+
+
+def make_sqlite(tmp_path):
+    import sqlite3
+    path = tmp_path / "lexicon.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE words(clean_form TEXT PRIMARY KEY, zipf REAL, mask INTEGER, source TEXT)")
+    conn.executemany("INSERT INTO words VALUES (?, ?, ?, 'dictionary')",
+                     [(w, 3.0 + i / 10, mask_of(w)) for i, w in enumerate(WORDS)])
+    conn.execute("CREATE INDEX idx_mask ON words(mask)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_sqlite_board_queries_match_scan(tmp_path):
+    lex = Lexicon(db_path=make_sqlite(tmp_path))
+    all_entries = list(lex.iter_all())
+    rng = random.Random(11)
+    for _ in range(20):
+        board = rng.sample("acemnilo", 7)
+        board_mask = mask_of("".join(board))
+        expected = sorted(e.text for e in all_entries if board[0] in e.text and (e.mask | board_mask) == board_mask)
+        assert sorted(e.text for e in lex.words_for_board(board_mask, board[0])) == expected
+    for ch in "acez":
+        assert sorted(e.text for e in lex.iter_by_required(ch)) == sorted(e.text for e in all_entries if ch in e.text)
+
+
+def test_sqlite_board_query_uses_index(tmp_path):
+    import sqlite3
+    from it_spelling_bee.lexicon.store import SELECT_BY_MASKS
+
+    lex = Lexicon(db_path=make_sqlite(tmp_path))
+    plan = lex._conn.execute("EXPLAIN QUERY PLAN " + SELECT_BY_MASKS.format("?,?"), (1, 2)).fetchall()
+    assert any("USING INDEX idx_mask" in row[-1] for row in plan)
+    plan = lex._conn.execute("EXPLAIN QUERY PLAN SELECT DISTINCT mask FROM words").fetchall()
+    assert any("COVERING INDEX idx_mask" in row[-1] for row in plan)
+
+    # Letter queries read only their rows, through the index
+    statements = []
+    lex._conn.set_trace_callback(statements.append)
+    assert [e.text for e in lex.iter_by_required("z")] == []
+    assert statements and all("DISTINCT" in sql or "WHERE mask IN" in sql for sql in statements)
+
+    # Opened read-only
+    with pytest.raises(sqlite3.OperationalError):
+        lex._conn.execute("DELETE FROM words")
+
+
+@pytest.mark.parametrize("kind", ["jsonl", "sqlite", "binary"])
+def test_scored_words_match_score_word_across_settings(tmp_path, jsonl_writer, kind):
+    from it_spelling_bee.config import Settings
+    from it_spelling_bee.lexicon.binary import write_binary
+    from it_spelling_bee.scoring import score_word
+
+    path = make_sqlite(tmp_path) if kind != "jsonl" else make_jsonl(tmp_path, jsonl_writer)
+    if kind == "binary":
+        write_binary(tmp_path / "lexicon.bin", Lexicon(db_path=path).iter_all())
+        path = tmp_path / "lexicon.bin"
+    lex = Lexicon(db_path=path)
+    board_mask = mask_of("acemnio")
+    settings = Settings(min_len=4)
+    # Same lexicon, Settings mutated in place between calls: cached bases must follow
+    for alpha, min_len in [(2.0, 4), (1.5, 4), (1.5, 5), (2.0, 4)]:
+        settings.alpha, settings.min_len = alpha, min_len
+        words, bases = lex.scored_words_for_board(board_mask, "a", settings)
+        expected = sorted(
+            (e.text, score_word(e, 0, settings)) for e in lex.words_for_board(board_mask, "a")
+            if len(e.text) >= min_len
+        )
+        assert sorted((e.text, b) for e, b in zip(words, bases)) == expected
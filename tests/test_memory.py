@@ -0,0 +1,21 @@
+import tracemalloc
+
+from it_spelling_bee import bench
+from it_spelling_bee.memory import MEMORY_BUDGETS, check_budgets, memory_report
+
+
+def test_memory_report_breaks_down_structures(tmp_path):
+    report = memory_report(bench.synthetic_lexicon(tmp_path, 3000, 0, ".jsonl"),
+                           bench.synthetic_lexicon(tmp_path, 3000, 0, ".sqlite"), boards=5)
+    assert not tracemalloc.is_tracing()
+    assert report["words"] == 3000
+    structures = report["structures"]
+    assert set(structures) == set(MEMORY_BUDGETS)
+    assert all(row["bytes"] > 0 for row in structures.values())
+    # Loading retains the word store alone; the indexes are built on demand
+    assert 0.95 * report["total"] <= structures["entries"]["bytes"] <= 1.05 * report["total"]
+
+    for name in ("entries", "per_letter_index", "boards", "board_scores", "sqlite_cache"):
+        assert structures[name]["bytes_per"] <= MEMORY_BUDGETS[name], name
+    over = check_budgets(report, {**MEMORY_BUDGETS, "entries": 10})
+    assert len(over) == 1 and over[0].startswith("entries:")
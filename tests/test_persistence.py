@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import sys
+
+from it_spelling_bee.persistence import (
+    SessionJournal, delete_session, journal_path, load_session, save_session, session_found, word_order, words_digest,
+)
+
+WORDS = ["cane", "cena", "amico", "casa", "mica", "mela"]
+DIGEST = words_digest(word_order(WORDS))
+
+
+def write_journal(path, digest, records, tail=""):
+    with journal_path(path).open("w") as fh:
+        fh.write(json.dumps({"d": digest}) + "\n" + "".join(json.dumps(r) + "\n" for r in records) + tail)
+
+
+def test_journal_round_trip_and_compaction(tmp_path):
+    path = tmp_path / "session.json"
+    with SessionJournal(path, 7, WORDS, compact_every=3, flush_interval=0) as journal:
+        for i, w in enumerate(["cane", "casa", "mica", "mela"]):
+            journal.record_guess(w, (i + 1) * 5)
+        journal.record_hint(18)
+
+    data = load_session(path)
+    assert data["seed"] == 7 and data["score"] == 18 and data["seq"] == 5
+    assert session_found(data, WORDS) == {"cane", "casa", "mica", "mela"}
+    # Closed cleanly: everything is in the snapshot, as a bitset
+    assert journal_path(path).read_text() == json.dumps({"d": DIGEST}, separators=(",", ":")) + "\n"
+    assert "cane" not in path.read_text()
+
+    # Bits are ignored for a different word list
+    assert session_found(data, WORDS + ["nuova"]) == set()
+
+
+def test_replay_skips_compacted_and_stops_at_torn_record(tmp_path):
+    path = tmp_path / "session.json"
+    save_session(path, {"seed": 1, "found": ["cane"], "score": 5, "seq": 2, "words_digest": DIGEST})
+    records = [{"n": 1, "w": "old", "s": 1}, {"n": 2, "s": 5}, {"n": 3, "w": "casa", "s": 9}, {"n": 4, "s": 7}]
+    write_journal(path, DIGEST, records, '{"n": 5, "w": "mi')
+
+    data = load_session(path)
+    assert data["found"] == ["cane", "casa"]
+    assert data["score"] == 7 and data["seq"] == 4
+
+    # Resuming compacts first, so the torn tail never precedes new records
+    with SessionJournal(path, 1, WORDS, data["found"], data["score"], data["seq"], flush_interval=0) as journal:
+        journal.record_guess("mica", 12)
+    data = load_session(path)
+    assert session_found(data, WORDS) == {"cane", "casa", "mica"} and data["score"] == 12
+
+
+def test_journal_of_another_board_is_not_replayed(tmp_path):
+    path = tmp_path / "session.json"
+    # Crash after a new game's first snapshot, before its journal was truncated:
+    # the old game's records (numbered from 1 again) must not land on the new board
+    save_session(path, {"seed": 2, "found": [], "score": 0, "seq": 0, "words_digest": DIGEST})
+    other = ["bello", "cane"]
+    write_journal(path, words_digest(word_order(other)), [{"n": 1, "w": "bello", "s": 3}, {"n": 2, "w": "cane", "s": 8}])
+    data = load_session(path)
+    assert data["score"] == 0 and session_found(data, WORDS) == set()
+
+    # Found words that are not on the board are dropped
+    assert session_found({"found": ["cane", "bello"]}, WORDS) == {"cane"}
+
+
+def test_legacy_session_and_untouched_when_nothing_recorded(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"seed": 3, "found": ["cena"], "score": 4}, indent=2))
+    data = load_session(path)
+    assert data["seed"] == 3 and session_found(data, WORDS) == {"cena"}
+
+    # A new game that records nothing keeps the saved one
+    SessionJournal(path, 99, WORDS).close()
+    assert load_session(path)["seed"] == 3
+
+    delete_session(path)
+    assert load_session(path) is None
+
+
+def test_records_survive_abrupt_exit(tmp_path):
+    path = tmp_path / "session.json"
+    code = (
+        "import os, sys, time\n"
+        "from pathlib import Path\n"
+        "from it_spelling_bee.persistence import SessionJournal\n"
+        f"j = SessionJournal(Path({str(path)!r}), 5, {WORDS!r}, flush_interval=0.01)\n"
+        "j.record_guess('cane', 3)\n"
+        "j.record_guess('mela', 8)\n"
+        "time.sleep(0.5)\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": os.getcwd()})
+    data = load_session(path)
+    assert data["seed"] == 5 and data["score"] == 8
+    assert session_found(data, WORDS) == {"cane", "mela"}
@@ -69,3 +69,65 @@ def test_is_valid_invariants(word):
         assert valid
     else:
         assert not valid
+
+
+def _reference_normalize_text(s):
+    # normalize_text before the ASCII fast path and fold table
+    import unicodedata
+    s = s.lower()
+    s = unicodedata.normalize("NFD", s)
+    return "".join(c for c in s if unicodedata.category(c) != "Mn")
+
+
+def _reference_mask_of(text):
+    text = _reference_normalize_text(text)
+    m = 0
+    for ch in sorted(set(text)):
+        if ch in LETTER_TO_BIT:
+            m |= LETTER_TO_BIT[ch]
+    return m
+
+
+# ASCII, Latin-1/Extended letters, combining marks, Greek (final sigma) and
+# characters whose lowercase or NFD form changes length
+_text = st.text(alphabet=st.one_of(
+    st.characters(max_codepoint=0x24F),
+    st.characters(min_codepoint=0x300, max_codepoint=0x3FF),
+    st.sampled_from("İıßẞﬁÅΣΩĶ́\n"),
+))
+
+
+@given(_text)
+def test_normalize_and_mask_match_reference(s):
+    from it_spelling_bee.letters import normalize_text
+    assert normalize_text(s) == _reference_normalize_text(s)
+    assert mask_of(s) == _reference_mask_of(s)
+
+
+@given(st.lists(_text, max_size=8))
+def test_batch_normalize_and_masks_match_reference(texts):
+    from it_spelling_bee.letters import normalize_many, masks_of_many
+    assert normalize_many(texts) == [_reference_normalize_text(t) for t in texts]
+    assert masks_of_many(texts) == [_reference_mask_of(t) for t in texts]
+    assert masks_of_many(normalize_many(texts), normalized=True) == masks_of_many(texts)
+
+
+def _reference_guess_check(text, required, others):
+    # The letter checks Engine.guess made before BoardRules
+    allowed = {required} | set(others)
+    if required not in text:
+        return "missing required letter"
+    if any(ch not in allowed for ch in text):
+        return "contains invalid letter"
+    return None
+
+
+@given(
+    st.text(alphabet="abcdefgz'à- ", max_size=10),
+    st.lists(st.sampled_from("abcdefghijklmnopqrstuvwxyz"), min_size=7, max_size=7, unique=True),
+)
+def test_board_rules_match_reference(text, board_letters):
+    from it_spelling_bee.rules import BoardRules
+    required, others = board_letters[0], board_letters[1:]
+    rules = BoardRules.compile(required, board_letters)
+    assert rules.check(text) == _reference_guess_check(text, required, others)
@@ -80,4 +80,15 @@ def test_rule_required_letter():
         assert is_valid(entry, board, rules, "a"), f"Word {word} should be valid"
     # Test another valid word
     entry = WordEntry(text="cage", zipf=5.0, mask=mask_of("cage"))
-    assert is_valid(entry, board, rules, "a")
\ No newline at end of file
+    assert is_valid(entry, board, rules, "a")
+
+def test_compiled_rules_match_is_valid():
+    from it_spelling_bee.rules import compile_rules
+    rules = RuleSet(min_len=4, alphabet=frozenset("abcdefghijklmnopqrstuvwxyz"))
+    board = {"letters": {"required": "a", "others": ["b", "c", "d", "e", "f", "g"]}}
+    compiled = compile_rules(board, rules, "A")
+    for word in ["cade", "cat", "bird", "cakes", "deed", "a'b'c", "fade", "abcdefg"]:
+        entry = WordEntry(text=word, zipf=5.0, mask=mask_of(word))
+        assert compiled.accepts(word) == is_valid(entry, board, rules, "A")
+    assert compiled.check("bed") == "missing required letter"
+    assert compiled.check("bake") == "contains invalid letter"
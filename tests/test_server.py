@@ -0,0 +1,186 @@
+import asyncio
+import http.client
+import json
+import random
+import threading
+
+import pytest
+
+from it_spelling_bee.config import Settings
+from it_spelling_bee.engine import Engine
+from it_spelling_bee.generator import generate_board
+from it_spelling_bee.lexicon.store import Lexicon
+from it_spelling_bee.server import BoardCache, BoardServer, BoardService
+from it_spelling_bee.session_store import SessionStore
+
+SETTINGS = Settings(min_valid_words=2, max_valid_words=10, min_total_points=5, max_total_points=50)
+
+
+@pytest.fixture
+def server(toy_lexicon):
+    """A BoardServer on an ephemeral port, running in a background event loop."""
+    service = BoardService(toy_lexicon, SETTINGS, cache_size=2)
+    loop = asyncio.new_event_loop()
+    srv = loop.run_until_complete(BoardServer(service).start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield service, srv.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    srv.close()
+    service.close()
+
+
+def request(conn, method, path, body=None):
+    conn.request(method, path, body=None if body is None else json.dumps(body), headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_board_matches_generate_board(server, toy_lexicon):
+    service, port = server
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    status, data = request(conn, "GET", "/board/7?words=1")
+    board = generate_board(toy_lexicon, SETTINGS, random.Random(7))
+    assert status == 200
+    assert data["required"] == board.letters.required and data["others"] == list(board.letters.others)
+    assert data["words"] == board.scores and data["total_points"] == board.total_points
+
+    # Same keep-alive connection; the second request is a cache hit
+    assert request(conn, "GET", "/board/7")[1]["total_words"] == len(board.words)
+    assert service.cache.stats()["hits"] == 1 and service.cache.stats()["misses"] == 1
+
+    word = board.words[0].text
+    assert request(conn, "GET", f"/board/7/check?word={word.upper()}")[1] == {"ok": True, "message": "ok", "points": board.scores[word]}
+    assert request(conn, "GET", "/board/7/check?word=zzzz")[1]["ok"] is False
+    assert request(conn, "GET", "/nope")[0] == 404
+    assert request(conn, "POST", "/board/7")[0] == 405
+
+
+def test_server_on_sqlite_lexicon(tmp_path, toy_lexicon):
+    from it_spelling_bee.lexicon.build import _write_db
+    path = tmp_path / "lex.sqlite"
+    _write_db(path, ((e.text, e.zipf, e.mask, "dictionary") for e in toy_lexicon.iter_all()), [], [])
+    sqlite_lex = Lexicon(db_path=path)
+    assert sqlite_lex.thread_bound
+
+    async def fetch():
+        service = BoardService(sqlite_lex, SETTINGS)
+        srv = await BoardServer(service).start("127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            return await asyncio.get_running_loop().run_in_executor(None, request, conn, "GET", "/board/7?words=1")
+        finally:
+            srv.close()
+            service.close()
+
+    status, data = asyncio.run(fetch())
+    assert status == 200
+    assert data["words"] == generate_board(toy_lexicon, SETTINGS, random.Random(7)).scores
+
+
+def test_boards_drawn_from_stored_catalog(tmp_path, toy_lexicon, catalog_writer):
+    from dataclasses import replace
+    settings = replace(SETTINGS, data_path=tmp_path / "data")
+    board = generate_board(toy_lexicon, settings, random.Random(1))
+    catalog_writer(toy_lexicon, settings, board)
+    service = BoardService(toy_lexicon, settings)
+    try:
+        for seed in (2, 3):
+            drawn = asyncio.run(service.board(seed))
+            assert drawn.letters.required == board.letters.required and drawn.scores == board.scores
+    finally:
+        service.close()
+
+
+def test_session_flow_matches_engine(server, toy_lexicon):
+    _, port = server
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    status, created = request(conn, "POST", "/session", {"seed": 11})
+    assert status == 200
+    session = created["session"]
+
+    board = generate_board(toy_lexicon, SETTINGS, random.Random(11))
+    engine = Engine(board)
+    guesses = [board.words[0].text, board.words[0].text, "xxxx", board.words[-1].text]
+    status, data = request(conn, "POST", f"/session/{session}/guess", {"words": guesses})
+    assert [(r["ok"], r["message"], r["points"]) for r in data["results"]] == engine.guess_many(guesses)
+
+    _, progress = request(conn, "GET", f"/session/{session}")
+    assert progress["progress"]["score"] == engine.state.score
+    assert progress["progress"]["found_words"] == sorted(engine.state.found)
+
+    _, hint = request(conn, "POST", f"/session/{session}/hint")
+    assert hint["grid"] == json.loads(json.dumps(engine.hint_grid()))
+    assert request(conn, "GET", "/session/unknown")[0] == 404
+    assert request(conn, "POST", f"/session/{session}/guess", {"word": 3})[0] == 400
+
+
+def test_player_sessions_resume_from_store(toy_lexicon, tmp_path):
+    board = generate_board(toy_lexicon, SETTINGS, random.Random(5))
+    word = board.words[0].text
+
+    async def play(body, guess=None):
+        service = BoardService(toy_lexicon, SETTINGS, store=SessionStore(tmp_path / "sessions.sqlite"))
+        api = BoardServer(service)
+        try:
+            _, created = await api.dispatch("POST", "/session", json.dumps(body).encode())
+            if guess:
+                await api.dispatch("POST", f"/session/{created['session']}/guess", json.dumps({"word": guess}).encode())
+            return created["progress"]
+        finally:
+            service.close()
+
+    assert asyncio.run(play({"seed": 5, "player": "ada"}, word))["found_words"] == []
+    # A new server process resumes ada's game; other players and anonymous sessions start fresh
+    assert asyncio.run(play({"seed": 5, "player": "ada"}))["found_words"] == [word]
+    assert asyncio.run(play({"seed": 5, "player": "bob"}))["found_words"] == []
+    assert asyncio.run(play({"seed": 5}))["found_words"] == []
+
+
+def test_store_maintenance_survives_failed_flush(toy_lexicon, tmp_path, capsys):
+    import sqlite3
+    store = SessionStore(tmp_path / "sessions.sqlite")
+    store._conn.execute("PRAGMA busy_timeout=0")
+    service = BoardService(toy_lexicon, SETTINGS, store=store)
+    blocker = sqlite3.connect(str(tmp_path / "sessions.sqlite"), isolation_level=None)
+
+    async def scenario():
+        task = asyncio.ensure_future(service.maintain_store(flush_interval=0.01))
+        blocker.execute("BEGIN IMMEDIATE")
+        store.save("ada", 5, ["abal"], 1)
+        await asyncio.sleep(0.05)
+        assert not task.done() and store.rows_written == 0
+        blocker.execute("ROLLBACK")
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return store.rows_written
+
+    try:
+        assert asyncio.run(scenario()) == 1
+    finally:
+        blocker.close()
+        service.close()
+    assert "session store flush failed: OperationalError" in capsys.readouterr().err
+
+
+def test_board_cache_lru_and_dedup():
+    async def scenario():
+        cache = BoardCache(maxsize=2)
+        calls = []
+
+        async def make(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        # Concurrent requests for one key share a single creation
+        results = await asyncio.gather(*(cache.get_or_create("a", lambda: make("a")) for _ in range(5)))
+        assert results == ["a"] * 5 and calls == ["a"]
+        await cache.get_or_create("b", lambda: make("b"))
+        cache.get("a")
+        await cache.get_or_create("c", lambda: make("c"))
+        assert cache.get("b") is None and cache.get("a") == "a"
+
+    asyncio.run(scenario())
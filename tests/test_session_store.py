@@ -0,0 +1,134 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from it_spelling_bee.engine import Engine
+from it_spelling_bee.letters import mask_of
+from it_spelling_bee.session_store import SessionStore
+from it_spelling_bee.typing import GeneratedBoard, Letters, WordEntry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def count(path):
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_saves_are_batched_and_visible_before_flush(tmp_path):
+    path = tmp_path / "sessions.sqlite"
+    store = SessionStore(path, batch_size=3)
+    store.save("ada", 1, ["cane"], 1)
+    store.save("ada", 1, ["cane", "canto"], 6)
+    store.save("bob", 1, [], 0)
+    assert store.load("ada", 1) == {"score": 6, "found": ["cane", "canto"]}
+    assert count(path) == 0
+
+    # A third distinct game fills the batch: one transaction writes all three
+    store.save("ada", 2, ["nota"], 1)
+    assert count(path) == 3 and store.flushes == 1
+    assert store.load("bob", 1) == {"score": 0, "found": []}
+    assert store.load("bob", 2) is None
+    store.close()
+
+    reopened = SessionStore(path)
+    assert reopened.load("ada", 1) == {"score": 6, "found": ["cane", "canto"]}
+    reopened.close()
+
+
+def test_wal_reader_sees_flushed_games_only(tmp_path):
+    path = tmp_path / "sessions.sqlite"
+    writer = SessionStore(path)
+    reader = SessionStore(path)
+    writer.save("ada", 7, ["cane"], 1)
+    assert reader.load("ada", 7) is None
+    writer.flush()
+    assert reader.load("ada", 7) == {"score": 1, "found": ["cane"]}
+    conn = sqlite3.connect(str(path))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+    writer.close()
+    reader.close()
+
+
+def test_evict_drops_idle_games(tmp_path):
+    clock = Clock()
+    store = SessionStore(tmp_path / "sessions.sqlite", ttl=100, clock=clock)
+    store.save("old", 1, ["cane"], 1)
+    store.flush()
+    clock.now += 60
+    store.save("recent", 1, ["nota"], 1)
+    store.save("pending", 1, [], 0)
+    store.flush()
+    clock.now += 50
+    assert store.evict() == 1
+    assert store.load("old", 1) is None
+    assert store.load("recent", 1) is not None
+
+    clock.now += 200
+    store.save("unflushed", 1, [], 0)
+    clock.now += 200
+    assert store.evict() == 3
+    assert store.load("unflushed", 1) is None
+    store.close()
+
+
+def test_flush_async_leaves_loop_free_while_locked(tmp_path):
+    path = tmp_path / "sessions.sqlite"
+    store = SessionStore(path)
+    store._conn.execute("PRAGMA busy_timeout=300")
+    blocker = sqlite3.connect(str(path), isolation_level=None)
+
+    async def scenario():
+        blocker.execute("BEGIN IMMEDIATE")
+        store.save("ada", 1, ["cane"], 1)
+        flush = asyncio.ensure_future(store.flush_async())
+        ticks = 0
+        while not flush.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+            assert store.load("ada", 1) == {"score": 1, "found": ["cane"]}
+        with pytest.raises(sqlite3.OperationalError):
+            flush.result()
+        blocker.execute("ROLLBACK")
+        return ticks, await store.flush_async()
+
+    ticks, written = asyncio.run(scenario())
+    # The loop kept running through the busy timeout, and the failed batch was retried
+    assert ticks >= 10 and written == 1 and count(path) == 1
+
+    # close() closes the connections even when its final flush fails
+    blocker.execute("BEGIN IMMEDIATE")
+    store.save("bob", 1, [], 0)
+    with pytest.raises(sqlite3.OperationalError):
+        store.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        store._conn.execute("SELECT 1")
+    blocker.close()
+
+
+def test_restores_into_engine(tmp_path):
+    words = [WordEntry(text=t, zipf=4.0, mask=mask_of(t)) for t in ("cane", "canto", "nota")]
+    board = GeneratedBoard(letters=Letters(required="n", others=("a", "c", "e", "o", "t", "s")), words=words,
+                           scores={"cane": 1, "canto": 5, "nota": 1}, total_points=7, threshold=5,
+                           mask=mask_of("naceots"))
+    store = SessionStore(tmp_path / "sessions.sqlite")
+    engine = Engine(board)
+    engine.guess("canto")
+    store.save("ada", 3, engine.state.found, engine.state.score)
+    store.close()
+
+    restored = Engine(board)
+    restored.restore_state(SessionStore(tmp_path / "sessions.sqlite").load("ada", 3) or {})
+    assert restored.state.found == {"canto"} and restored.state.score == 5
+    assert restored.guess("canto")[0] is False
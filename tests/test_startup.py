@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import json
+import sqlite3
+
+from it_spelling_bee import bench
+from it_spelling_bee.lexicon.store import Lexicon
+from it_spelling_bee.letters import mask_of
+
+
+# Modules that paths not touching the lexicon (--rules, --help) must not import
+HEAVY_MODULES = ["sqlite3", "it_spelling_bee.lexicon.store", "it_spelling_bee.generator", "it_spelling_bee.engine", "concurrent.futures"]
+
+
+def test_cli_import_budget():
+    code = (
+        "import sys, json\n"
+        "from it_spelling_bee.cli import run\n"
+        "run(['--rules'])\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         env={**os.environ, "PYTHONPATH": os.getcwd()})
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+
+
+def test_startup_budget_gate(tmp_path, monkeypatch, capsys):
+    results = bench.run_suite([300], ["startup"], tmp_path, repeat=3, log=lambda line: None)
+    assert 0 < results["metrics"]["startup@300"]["value"]
+
+    # Over budget: listed, and the bench run fails
+    monkeypatch.setattr(bench, "STARTUP_BUDGET", 0.0)
+    assert bench.main(["--sizes", "300", "--only", "startup", "--repeat", "1", "--work-dir", str(tmp_path)]) == 1
+    assert "Over budget at 300 startup:" in capsys.readouterr().out
+
+
+def test_snapshot_warm_start(tmp_path, jsonl_writer):
+    src = tmp_path / "lex.jsonl"
+    cache = tmp_path / "cache"
+    jsonl_writer(src, ["cane", "cena", "amico"], zipf=4.25, masks=False)
+
+    cold = Lexicon(db_path=src, cache_dir=cache)
+    assert list(cache.glob("lexicon-*.bin"))
+    warm = Lexicon(db_path=src, cache_dir=cache)
+    assert warm._binary is not None  # served from the mmapped snapshot
+    assert sorted(warm.iter_all(), key=lambda e: e.text) == sorted(cold.iter_all(), key=lambda e: e.text)
+    assert warm.fingerprint() == cold.fingerprint()
+    assert sorted(e.text for e in warm.words_for_board(mask_of("acenmio"), "a")) == ["amico", "cane", "cena"]
+
+    # A touched but identical source is accepted by hash once, then restamped
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    touched = Lexicon(db_path=src, cache_dir=cache)
+    assert touched._binary is not None
+    stamp = json.loads(next(cache.glob("lexicon-*.json")).read_text(encoding="utf8"))
+    assert stamp["mtime_ns"] == os.stat(src).st_mtime_ns
+
+    # Changing the source invalidates the snapshot
+    jsonl_writer(src, ["cane", "casa"], zipf=4.25, masks=False)
+    changed = Lexicon(db_path=src, cache_dir=cache)
+    assert sorted(e.text for e in changed.iter_all()) == ["cane", "casa"]
+
+
+def test_snapshot_sqlite_build_ts(tmp_path):
+    db = tmp_path / "lexicon.sqlite"
+    cache = tmp_path / "cache"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE words (clean_form TEXT, zipf REAL, mask INTEGER)")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO words VALUES ('cane', 4.0, ?)", (mask_of("cane"),))
+    conn.execute("INSERT INTO meta VALUES ('build_ts_utc', 'one')")
+    conn.commit()
+
+    Lexicon(db_path=db, cache_dir=cache)
+    warm = Lexicon(db_path=db, cache_dir=cache)
+    assert [e.text for e in warm.iter_by_required("c")] == ["cane"]
+
+    # A rebuild (new build_ts_utc) must not be served from the old snapshot,
+    # even if the file's mtime and size happen to match
+    st = os.stat(db)
+    conn.execute("INSERT INTO words VALUES ('cena', 4.0, ?)", (mask_of("cena"),))
+    conn.execute("UPDATE meta SET value = 'two' WHERE key = 'build_ts_utc'")
+    conn.commit()
+    conn.close()
+    os.utime(db, ns=(st.st_atime_ns, st.st_mtime_ns))
+    rebuilt = Lexicon(db_path=db, cache_dir=cache)
+    assert sorted(e.text for e in rebuilt.iter_by_required("c")) == ["cane", "cena"]
+
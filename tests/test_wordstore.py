@@ -0,0 +1,71 @@
+import json
+import pickle
+import random
+
+import pytest
+
+from it_spelling_bee import bench
+from it_spelling_bee.config import Settings
+from it_spelling_bee.generator import WeightedLetterSampler, board_mask_of, board_totals, evaluate_board, generate_board
+from it_spelling_bee.letters import mask_of
+from it_spelling_bee.lexicon.store import Lexicon
+from it_spelling_bee.lexicon.wordstore import WordStore
+from it_spelling_bee.typing import BoardScores, BoardWords, GeneratedBoard, WordEntry
+
+
+def test_word_store_views_and_indexes():
+    words = [("cane", 5.12, mask_of("cane")), ("mela", 4.0, mask_of("mela")), ("cena", 3.5, mask_of("cena")), ("città", 2.0, 0)]
+    store = WordStore(words)
+    assert len(store) == 4 and store.quantised
+    assert [store.entry(i) for i in range(4)] == [WordEntry(text=t, zipf=z, mask=m) for t, z, m in words]
+    assert list(store.group(mask_of("cane"))) == [0, 2]
+    assert list(store.group(mask_of("zzz"))) == []
+    assert list(store.ids_with_bit(mask_of("m"))) == [1]
+
+    # A zipf that hundredths cannot hold switches the store to exact floats
+    assert store.add("nave", 4.005, mask_of("nave")) == 4
+    assert not store.quantised
+    assert store.entry(4) == WordEntry(text="nave", zipf=4.005, mask=mask_of("nave"))
+    assert store.zipf(0) == 5.12
+    assert list(store.group(mask_of("nave"))) == [4]
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".sqlite", ".bin"])
+def test_board_totals_match_evaluate_board(tmp_path, suffix):
+    lex = Lexicon(bench.synthetic_lexicon(tmp_path, 3000, 0, suffix))
+    settings = Settings()
+    sampler = WeightedLetterSampler()
+    rng = random.Random(5)
+    for _ in range(30):
+        required, others = sampler.sample_set(rng)
+        board_mask = board_mask_of(required, others)
+        valid, _, total = evaluate_board(lex, board_mask, required, settings)
+        assert board_totals(lex, board_mask, required, settings) == (len(valid), total)
+
+
+def test_jsonl_lexicon_keeps_file_order(tmp_path):
+    words = bench.synthetic_words(500, seed=2)
+    lex = Lexicon(bench.synthetic_lexicon(tmp_path, 500, 2, ".jsonl"))
+    assert [e.text for e in lex.iter_all()] == [w for w, _ in words]
+    assert [e.text for e in lex.iter_by_required("q")] == [w for w, _ in words if "q" in w]
+    board_mask = mask_of("aeiorst")
+    got = [e.text for e in lex.words_for_board(board_mask, "r")]
+    assert sorted(got) == sorted(w for w, _ in words if "r" in w and mask_of(w) | board_mask == board_mask)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".bin"])
+def test_generated_boards_hold_word_ids(tmp_path, suffix):
+    board = generate_board(Lexicon(bench.synthetic_lexicon(tmp_path, 3000, 0, suffix)), Settings(), random.Random(1))
+    sqlite_board = generate_board(Lexicon(bench.synthetic_lexicon(tmp_path, 3000, 0, ".sqlite")), Settings(), random.Random(1))
+    assert isinstance(board.words, BoardWords) and isinstance(board.scores, BoardScores)
+    assert sorted(board.words, key=lambda e: e.text) == sorted(sqlite_board.words, key=lambda e: e.text)
+    # No word text is held until the first score lookup
+    assert board.scores._scores is None
+    assert board.scores == sqlite_board.scores and board.scores._scores is not None
+    word = board.words[-1].text
+    assert board.scores[word] == board.scores.get(word) == sqlite_board.scores[word] and "zzzz" not in board.scores
+
+    # Pickled (to and from pool workers) and serialised as plain lists and dicts
+    copy = pickle.loads(pickle.dumps(board))
+    assert type(copy.words) is list and type(copy.scores) is dict and copy == board
+    assert GeneratedBoard.from_dict(json.loads(json.dumps(board.to_dict()))) == board
@@ -1,6 +1,6 @@
 // Start
 window.addEventListener('DOMContentLoaded', async () => {
-    console.log('DOM loaded, loading lexicon...');
+    console.log('DOM loaded, initializing game...');
 
     // Get loading screen elements
     const loadingScreen = document.getElementById('loading-screen');
@@ -14,27 +14,13 @@ window.addEventListener('DOMContentLoaded', async () => {
     const helpBtn = document.getElementById('btn-help');
     const settingsBtn = document.getElementById('btn-settings');
 
-    try {
-        // Load lexicon with progress
-        await lexiconLoader.load((received, total) => {
-            const percent = (received / total) * 100;
-            progressFill.style.width = percent + '%';
-            loadingBytes.textContent = Math.round(received / 1024);
-            loadingTotal.textContent = Math.round(total / 1024);
-        });
-
-        console.log('Lexicon loaded, initializing game...');
-
-        // Hide loading screen
-        setTimeout(() => {
-            loadingScreen.classList.remove('active');
-        }, 300);
-
-    } catch (error) {
-        console.error('Failed to load lexicon:', error);
-        alert('Failed to load word list. Please refresh the page.');
-        return;
-    }
+    // Lexicon download progress, shown only when a game has to be generated client-side
+    const showLoadingProgress = (received, total) => {
+        const percent = (received / total) * 100;
+        progressFill.style.width = percent + '%';
+        loadingBytes.textContent = Math.round(received / 1024);
+        loadingTotal.textContent = Math.round(total / 1024);
+    };
 
     const game = new Game();
 
@@ -46,14 +32,19 @@ window.addEventListener('DOMContentLoaded', async () => {
     if (savedState && savedState.seed) {
         // Restore the game with saved state
         console.log('Restoring saved game state');
-        await game.init(savedState.seed, game.gameType);
+        await game.init(savedState.seed, game.gameType, showLoadingProgress);
         game.restoreGameState(savedState);
     } else {
         // Start fresh daily puzzle
         console.log('Starting fresh daily puzzle');
-        await game.init(null, 'daily');
+        await game.init(null, 'daily', showLoadingProgress);
     }
 
+    // Hide loading screen
+    setTimeout(() => {
+        loadingScreen.classList.remove('active');
+    }, 300);
+
     // New game controls - prevent modal from closing
     const newGameBtn = document.getElementById('btn-new-game');
     const seedGameBtn = document.getElementById('btn-seed-game');
@@ -99,7 +90,7 @@ window.addEventListener('DOMContentLoaded', async () => {
                 }
                 // Start a random game with specific seed
                 setTimeout(() => {
-                    game.init(seed, 'random');
+                    game.init(seed, 'random', showLoadingProgress);
                 }, 100);
             }
         });
@@ -38,21 +38,11 @@ class Game {
         this.elTotalWords = document.getElementById('total-words');
         this.elMessage = document.getElementById('message-area');
         this.elSeedDisplay = document.getElementById('seed-display');
-
-        this.init();
     }
 
-    async init(seed = null, gameType = 'daily') {
-        // Generate game client-side using local lexicon
+    async init(seed = null, gameType = 'daily', onProgress = null) {
         let data;
         try {
-            // Ensure lexicon is loaded
-            if (!lexiconLoader.isLoaded()) {
-                throw new Error('Lexicon not loaded yet');
-            }
-
-            const wordList = await lexiconLoader.load();
-
             // Determine seed and game type
             this.gameType = gameType;
             if (gameType === 'daily' && seed === null) {
@@ -64,13 +54,25 @@ class Game {
                 console.log('Starting random game, seed:', seed);
             }
 
-            // Generate game
-            data = generateGame(seed, wordList);
-            console.log(`Generated ${gameType} game for seed ${seed}:`, {
-                letters: data.center + data.outer.join(''),
-                words: data.valid_words.length,
-                points: data.total_points
-            });
+            // Today's puzzle comes precomputed from a daily pack when one is published
+            if (gameType === 'daily' && seed === getDailySeed()) {
+                const day = await dailyPackLoader.getDay(getTodayDateString());
+                if (day && day.seed === seed) {
+                    data = boardFromSolution(seed, day.center, day.outer, day.words);
+                    console.log(`Loaded daily game for seed ${seed} from pack`);
+                }
+            }
+
+            // Otherwise generate the game client-side using the local lexicon
+            if (!data) {
+                const wordList = await lexiconLoader.load(onProgress);
+                data = generateGame(seed, wordList);
+                console.log(`Generated ${gameType} game for seed ${seed}:`, {
+                    letters: data.center + data.outer.join(''),
+                    words: data.valid_words.length,
+                    points: data.total_points
+                });
+            }
             this.currentSeed = seed;
         } catch (error) {
             console.error('Failed to generate game:', error);
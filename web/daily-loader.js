@@ -0,0 +1,51 @@
+// Daily Pack Loader - Fetch precomputed daily puzzles
+// Packs are written by `itbee daily` (it_spelling_bee/daily.py): index.json maps
+// each day ("2026-10-17") or month ("2026-10") to a small JSON file holding only
+// the letters and solution words, so the daily puzzle needs no lexicon download.
+class DailyPackLoader {
+    constructor(baseUrl = 'daily/') {
+        this.baseUrl = baseUrl;
+        this.index = null;
+        this.packs = new Map();
+    }
+
+    async fetchJson(path, cache) {
+        const response = await fetch(this.baseUrl + path, { cache });
+        if (!response.ok) {
+            throw new Error(`Failed to load ${path}: ${response.status}`);
+        }
+        return response.json();
+    }
+
+    async loadIndex() {
+        if (!this.index) {
+            // The index changes whenever packs are added, so always revalidate it
+            this.index = this.fetchJson('index.json', 'no-cache');
+        }
+        return this.index;
+    }
+
+    // Returns {seed, center, outer, words} for the given day, or null if no pack covers it
+    async getDay(dateString) {
+        try {
+            const index = await this.loadIndex();
+            const key = index.pack_by === 'day' ? dateString : dateString.slice(0, 7);
+            const file = index.packs[key];
+            if (!file) return null;
+
+            if (!this.packs.has(file)) {
+                this.packs.set(file, this.fetchJson(file, 'default'));
+            }
+            const pack = await this.packs.get(file);
+            return pack.days[dateString] || null;
+        } catch (error) {
+            console.warn('Daily pack unavailable:', error);
+            this.index = null;
+            this.packs.clear();
+            return null;
+        }
+    }
+}
+
+// Global daily pack loader instance
+const dailyPackLoader = new DailyPackLoader();
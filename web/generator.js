@@ -65,6 +65,30 @@ function wordOnlyUsesLetters(word, letters) {
     return true;
 }
 
+// Points for one solution word: 1 for four letters, else its length, +7 for a pangram
+function wordPoints(word) {
+    let pts = word.length === 4 ? 1 : word.length;
+    if (new Set(word).size === 7) {
+        pts += 7;
+    }
+    return pts;
+}
+
+// Build the game data for known letters and solution words (e.g. from a daily pack)
+function boardFromSolution(seed, center, outer, words) {
+    let totalPoints = 0;
+    for (const word of words) {
+        totalPoints += wordPoints(word);
+    }
+    return {
+        center,
+        outer: [...outer],
+        valid_words: words,
+        total_points: totalPoints,
+        seed
+    };
+}
+
 // Generate game board with given seed and word list
 function generateGame(seed, wordList, requirePangram = true) {
     const rng = new SeededRandom(seed);
@@ -112,29 +136,12 @@ function generateGame(seed, wordList, requirePangram = true) {
                     continue; // Try next board variation
                 }
 
-                // Calculate total points
-                let totalPoints = 0;
-                for (const word of validWords) {
-                    let pts = word.length === 4 ? 1 : word.length;
-                    // Pangram bonus (uses all 7 letters)
-                    const uniqueLetters = new Set(word);
-                    if (uniqueLetters.size === 7) {
-                        pts += 7;
-                    }
-                    totalPoints += pts;
-                }
-
                 if (requirePangram && pangramAttempt > 0) {
                     console.log(`Found pangram on attempt ${pangramAttempt + 1} (${pangrams.length} pangrams)`);
                 }
 
-                return {
-                    center,
-                    outer,
-                    valid_words: validWords,
-                    total_points: totalPoints,
-                    seed: attemptSeed // Return the actual seed used
-                };
+                // Return the actual seed used
+                return boardFromSolution(attemptSeed, center, outer, validWords);
             }
         }
     }
@@ -1,4 +1,42 @@
 // Lexicon Loader - Download and cache Italian word list
+
+// Word list from any export format of scripts/export_lexicon_to_json.py:
+// a plain array, words grouped by letter mask, or front-coded sorted words
+function decodeLexicon(text) {
+    const payload = JSON.parse(text);
+    if (Array.isArray(payload)) return payload;
+
+    if (payload.format === 'masks') {
+        const words = [];
+        for (const [, group] of payload.groups) {
+            for (const word of group.split(' ')) words.push(word);
+        }
+        return words.sort();
+    }
+    if (payload.format === 'front') {
+        if (!payload.words) return []; // ''.split(' ') would give ['']
+        const words = new Array(payload.count);
+        let prev = '';
+        let i = 0;
+        for (const item of payload.words.split(' ')) {
+            let digits = 0;
+            while (item.charCodeAt(digits) < 58) digits++;
+            prev = prev.slice(0, parseInt(item.slice(0, digits), 10)) + item.slice(digits);
+            words[i++] = prev;
+        }
+        return words;
+    }
+    throw new Error(`Unknown lexicon format: ${payload.format}`);
+}
+
+// Fingerprint of a payload: first 64 bits of its SHA-256, as hex
+async function sha256Fingerprint(text) {
+    const data = new TextEncoder().encode(text);
+    const hashBuffer = await crypto.subtle.digest('SHA-256', data);
+    const hashArray = Array.from(new Uint8Array(hashBuffer));
+    return hashArray.slice(0, 8).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
 class LexiconLoader {
     constructor() {
         this.words = null;
@@ -23,60 +61,40 @@ class LexiconLoader {
             const cachedText = localStorage.getItem('lexicon_data');
             const cachedFingerprint = localStorage.getItem('lexicon_fp');
 
-            // Download from network with force-cache to use Cloudflare edge cache
-            // The Cloudflare Cache Rule ensures edge TTL=120s, browser TTL=0s
-            console.log('📥 Downloading lexicon...');
-            const response = await fetch('words.json', { cache: 'force-cache' });
-
-            if (!response.ok) {
-                throw new Error(`Failed to load lexicon: ${response.status}`);
-            }
-
-            // Track download progress
-            const contentLength = response.headers.get('content-length');
-            const total = contentLength ? parseInt(contentLength) : 600000; // Approximate
-
-            const reader = response.body.getReader();
-            let received = 0;
-            const chunks = [];
-
-            while (true) {
-                const { done, value } = await reader.read();
-
-                if (done) break;
-
-                chunks.push(value);
-                received += value.length;
-
-                if (onProgress) {
-                    onProgress(received, total);
+            // The manifest (scripts/export_lexicon_to_json.py) names the current export
+            // and its fingerprint, so an unchanged lexicon needs neither download nor hashing
+            const manifest = await this.loadManifest();
+            this.words = null;
+            if (manifest && cachedText && cachedFingerprint === manifest.fingerprint) {
+                console.log('📖 Using cached lexicon (fingerprint matches manifest)');
+                this.words = decodeLexicon(cachedText);
+            } else if (manifest && cachedText && manifest.deltas && manifest.deltas[cachedFingerprint]) {
+                // A small delta from the cached version beats downloading the whole export
+                this.words = await this.patch(cachedText, manifest.deltas[cachedFingerprint], manifest);
+                if (this.words) {
+                    console.log(`🩹 Patched cached lexicon ${cachedFingerprint} → ${manifest.fingerprint}`);
                 }
             }
 
-            // Combine chunks
-            const blob = new Blob(chunks);
-            const text = await blob.text();
-
-            // Generate SHA-256 fingerprint using Web Crypto API
-            const encoder = new TextEncoder();
-            const data = encoder.encode(text);
-            const hashBuffer = await crypto.subtle.digest('SHA-256', data);
-            const hashArray = Array.from(new Uint8Array(hashBuffer));
-            // Convert to 16-character hex string (first 64 bits)
-            const fingerprint = hashArray.slice(0, 8).map(b => b.toString(16).padStart(2, '0')).join('');
-
-            // If cache matches, use it; otherwise update cache
-            if (cachedFingerprint === fingerprint && cachedText) {
-                console.log('📖 Using cached lexicon (content unchanged)');
-                this.words = JSON.parse(cachedText);
-            } else {
-                console.log('💾 Caching new lexicon version');
-                this.words = JSON.parse(text);
-                try {
-                    localStorage.setItem('lexicon_data', text);
-                    localStorage.setItem('lexicon_fp', fingerprint);
-                } catch (e) {
-                    console.warn('Failed to cache lexicon:', e);
+            if (!this.words) {
+                const file = manifest ? manifest.file : 'words.json';
+                const total = manifest ? manifest.bytes : 600000; // Approximate
+                const text = await this.download(file, total, onProgress);
+                const fingerprint = manifest ? manifest.fingerprint : await sha256Fingerprint(text);
+
+                // If cache matches, use it; otherwise update cache
+                if (cachedFingerprint === fingerprint && cachedText) {
+                    console.log('📖 Using cached lexicon (content unchanged)');
+                    this.words = decodeLexicon(cachedText);
+                } else {
+                    console.log('💾 Caching new lexicon version');
+                    this.words = decodeLexicon(text);
+                    try {
+                        localStorage.setItem('lexicon_data', text);
+                        localStorage.setItem('lexicon_fp', fingerprint);
+                    } catch (e) {
+                        console.warn('Failed to cache lexicon:', e);
+                    }
                 }
             }
 
@@ -91,6 +109,80 @@ class LexiconLoader {
         }
     }
 
+    async loadManifest() {
+        try {
+            const response = await fetch('words.manifest.json', { cache: 'no-cache' });
+            if (!response.ok) return null;
+            return await response.json();
+        } catch (e) {
+            console.warn('No lexicon manifest, falling back to words.json:', e);
+            return null;
+        }
+    }
+
+    async download(file, total, onProgress) {
+        // Download from network with force-cache to use Cloudflare edge cache
+        // The Cloudflare Cache Rule ensures edge TTL=120s, browser TTL=0s
+        console.log(`📥 Downloading lexicon (${file})...`);
+        const response = await fetch(file, { cache: 'force-cache' });
+
+        if (!response.ok) {
+            throw new Error(`Failed to load lexicon: ${response.status}`);
+        }
+
+        // Track download progress
+        const contentLength = response.headers.get('content-length');
+        if (contentLength) total = parseInt(contentLength);
+
+        const reader = response.body.getReader();
+        let received = 0;
+        const chunks = [];
+
+        while (true) {
+            const { done, value } = await reader.read();
+
+            if (done) break;
+
+            chunks.push(value);
+            received += value.length;
+
+            if (onProgress) {
+                onProgress(received, total);
+            }
+        }
+
+        // Combine chunks
+        const blob = new Blob(chunks);
+        return blob.text();
+    }
+
+    // Apply a delta file (additions and removals) to the cached word list.
+    // Returns the patched list, or null if the delta is unavailable or does not fit.
+    async patch(cachedText, file, manifest) {
+        try {
+            const response = await fetch(file, { cache: 'force-cache' });
+            if (!response.ok) return null;
+            const delta = await response.json();
+
+            const removed = new Set(delta.remove);
+            const words = decodeLexicon(cachedText).filter(word => !removed.has(word));
+            for (const word of delta.add) words.push(word);
+            words.sort();
+            if (delta.to !== manifest.fingerprint || words.length !== manifest.count) return null;
+
+            try {
+                localStorage.setItem('lexicon_data', JSON.stringify(words));
+                localStorage.setItem('lexicon_fp', manifest.fingerprint);
+            } catch (e) {
+                console.warn('Failed to cache lexicon:', e);
+            }
+            return words;
+        } catch (e) {
+            console.warn('Failed to apply lexicon delta:', e);
+            return null;
+        }
+    }
+
     isLoaded() {
         return this.loaded;
     }